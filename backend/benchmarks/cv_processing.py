@@ -0,0 +1,162 @@
+"""
+Throughput of CV processing on synthetic CVs of growing size
+
+Compares the single-pass CVProcessor.process_cv with the per-field
+extractors it replaced (one full scan of the CV per extractor), kept below as
+a frozen copy so the comparison does not drift with the service code.
+
+    python benchmarks/cv_processing.py [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.cv_processor import CVProcessor
+
+HEADER = [
+    'Jane Q Doe',
+    'jane.doe@example.com | +44 20 7946 0958 | linkedin.com/in/janedoe',
+    ''
+]
+
+BODY = [
+    'Led a team of 6 engineers delivering Python and AWS services for retail clients.',
+    'Improved API latency by 35% using Redis caching and PostgreSQL query tuning.',
+    'Worked with stakeholders to define requirements; ran agile ceremonies.',
+    'Software Engineer, Acme Corp, 2016 - 2019',
+    'Bachelor of Science in Computer Science, University of Leeds',
+    '',
+    'Skills: Docker, Kubernetes, React, TypeScript, Go, machine learning'
+]
+
+def make_cv(size: int, seed: int = 0) -> str:
+    """Build a CV of roughly size characters"""
+    rng = random.Random(seed)
+    lines = list(HEADER)
+    length = sum(len(line) + 1 for line in lines)
+    while length < size:
+        line = rng.choice(BODY)
+        lines.append(line)
+        length += len(line) + 1
+    lines.append('8 years of experience in backend development')
+    return '\n'.join(lines)
+
+LEGACY_SKILLS_KEYWORDS = [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+    'swift', 'kotlin', 'scala', 'r', 'matlab', 'sql', 'html', 'css',
+    'react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'node.js', 'laravel',
+    'rails', 'asp.net', 'jquery', 'bootstrap', 'tensorflow', 'pytorch', 'pandas', 'numpy',
+    'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'oracle', 'sqlite',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'gitlab', 'github',
+    'terraform', 'ansible', 'linux', 'unix',
+    'machine learning', 'artificial intelligence', 'data science', 'big data', 'blockchain',
+    'cybersecurity', 'network security', 'project management', 'agile', 'scrum', 'devops'
+]
+
+def legacy_extract_contact_info(cv_text: str) -> dict:
+    """CVProcessor.extract_contact_info before the single-pass scanner"""
+    contact_info = {'email': None, 'phone': None, 'linkedin': None}
+    email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', cv_text)
+    if email_match:
+        contact_info['email'] = email_match.group()
+    for pattern in [
+        r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
+        r'\+?([0-9]{1,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})',
+        r'\b\d{10}\b'
+    ]:
+        phone_match = re.search(pattern, cv_text)
+        if phone_match:
+            contact_info['phone'] = phone_match.group()
+            break
+    linkedin_match = re.search(r'linkedin\.com/in/([a-zA-Z0-9-]+)', cv_text, re.IGNORECASE)
+    if linkedin_match:
+        contact_info['linkedin'] = f"https://linkedin.com/in/{linkedin_match.group(1)}"
+    return contact_info
+
+def legacy_extract_skills(cv_text: str) -> list:
+    """CVProcessor.extract_skills before the skill taxonomy"""
+    cv_lower = cv_text.lower()
+    found_skills = [skill.title() for skill in LEGACY_SKILLS_KEYWORDS if skill.lower() in cv_lower]
+    return list(dict.fromkeys(found_skills))
+
+def legacy_extract_experience_years(cv_text: str):
+    """CVProcessor.extract_experience_years before the single-pass scanner"""
+    for pattern in [
+        r'(\d+)\+?\s*years?\s*of\s*experience',
+        r'(\d+)\+?\s*years?\s*experience',
+        r'experience:\s*(\d+)\+?\s*years?',
+        r'(\d+)\+?\s*yrs?\s*experience',
+        r'(\d+)\+?\s*year\s*experience'
+    ]:
+        match = re.search(pattern, cv_text, re.IGNORECASE)
+        if match:
+            return float(match.group(1))
+    years = re.findall(r'\b(19|20)\d{2}\b', cv_text)
+    if len(years) >= 2:
+        years = [int(year) for year in years]
+        if max(years) >= 2025 - 1:
+            return float(2025 - min(years))
+    return None
+
+def legacy_extract_education(cv_text: str):
+    """CVProcessor.extract_education before the single-pass scanner"""
+    education_keywords = [
+        'bachelor', 'master', 'phd', 'doctorate', 'mba', 'degree',
+        'university', 'college', 'institute', 'school',
+        'b.s.', 'b.a.', 'm.s.', 'm.a.', 'ph.d.'
+    ]
+    education_lines = [
+        line.strip() for line in cv_text.split('\n')
+        if any(keyword in line.lower() for keyword in education_keywords)
+    ]
+    return '\n'.join(education_lines) if education_lines else None
+
+def legacy_extract_name(cv_text: str) -> dict:
+    """CVProcessor.extract_name before the single-pass scanner"""
+    for line in cv_text.split('\n')[:5]:
+        line = line.strip()
+        if line and not any(char.isdigit() for char in line) and '@' not in line:
+            line = re.sub(r'^(mr\.?|ms\.?|mrs\.?|dr\.?)\s+', '', line, flags=re.IGNORECASE)
+            words = line.split()
+            if 2 <= len(words) <= 4:
+                return {'first_name': words[0], 'last_name': words[-1]}
+    return {'first_name': None, 'last_name': None}
+
+def per_field(cv_text: str) -> None:
+    """Field-by-field extraction as process_cv used to do it, each extractor scanning the whole CV"""
+    legacy_extract_contact_info(cv_text)
+    legacy_extract_name(cv_text)
+    legacy_extract_skills(cv_text)
+    legacy_extract_experience_years(cv_text)
+    legacy_extract_education(cv_text)
+
+def measure(function, cv_text: str, repeat: int) -> float:
+    """Best time of repeat runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(cv_text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is kept)')
+    args = parser.parse_args()
+
+    processor = CVProcessor()
+    print(f"{'CV size':>10} {'process_cv':>14} {'per field':>14} {'MB/s':>8} {'speedup':>8}")
+    for size in [2_000, 20_000, 200_000, 2_000_000]:
+        cv_text = make_cv(size)
+        fused = measure(processor.process_cv, cv_text, args.repeat)
+        separate = measure(per_field, cv_text, args.repeat)
+        print(f"{len(cv_text):>10,} {fused * 1000:>11.2f} ms {separate * 1000:>11.2f} ms "
+              f"{len(cv_text) / fused / 1e6:>8.2f} {separate / fused:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
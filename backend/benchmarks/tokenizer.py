@@ -0,0 +1,79 @@
+"""
+Throughput of keyword tokenization against the previous preprocess_text
+
+Tokenizes synthetic CV texts of growing size with the original implementation
+(stop-word set rebuilt per call, two re.sub passes, split and filter), the
+single-pass Tokenizer, and a job text repeatedly through tokenize_cached.
+
+    python benchmarks/tokenizer.py [--repeat N]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.tokenizer import Tokenizer
+from benchmarks.cv_processing import make_cv
+
+JOB_TEXT = (
+    'Senior Backend Engineer. We are looking for an engineer with 5+ years of experience '
+    'building Python and Go services on AWS. You will design APIs, own PostgreSQL schemas, '
+    'run Docker and Kubernetes deployments and mentor a small team. Bachelor degree in '
+    'Computer Science or equivalent. Experience with Redis, Kafka and machine learning is a plus.'
+) * 4
+
+def legacy_preprocess_text(text):
+    """AIMatchingEngine.preprocess_text before the Tokenizer"""
+    if not text:
+        return []
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    words = text.split()
+    stop_words = {
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+        'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before', 'after',
+        'above', 'below', 'between', 'among', 'is', 'are', 'was', 'were', 'be', 'been',
+        'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+        'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
+    }
+    return [word for word in words if word not in stop_words and len(word) > 2]
+
+def measure(function, text: str, repeat: int, number: int) -> float:
+    """Best time of repeat runs of number calls, in seconds per call"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function(text)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is kept)')
+    args = parser.parse_args()
+
+    tokenizer = Tokenizer()
+    interning = Tokenizer(intern_tokens=True)
+    print(f"{'text size':>10} {'legacy':>12} {'tokenize':>12} {'interned':>12} {'speedup':>8}")
+    for size in [2_000, 20_000, 200_000, 2_000_000]:
+        text = make_cv(size)
+        assert tokenizer.tokenize(text) == legacy_preprocess_text(text)
+        number = max(1, 200_000 // size)
+        legacy = measure(legacy_preprocess_text, text, args.repeat, number)
+        single = measure(tokenizer.tokenize, text, args.repeat, number)
+        interned = measure(interning.tokenize, text, args.repeat, number)
+        print(f"{len(text):>10,} {legacy * 1000:>9.3f} ms {single * 1000:>9.3f} ms "
+              f"{interned * 1000:>9.3f} ms {legacy / single:>7.1f}x")
+
+    legacy = measure(legacy_preprocess_text, JOB_TEXT, args.repeat, 1000)
+    cached = measure(tokenizer.tokenize_cached, JOB_TEXT, args.repeat, 1000)
+    print(f"\nRepeated job text ({len(JOB_TEXT):,} chars): legacy {legacy * 1e6:.1f} us, "
+          f"tokenize_cached {cached * 1e6:.1f} us ({legacy / cached:.1f}x)")
+
+if __name__ == '__main__':
+    main()
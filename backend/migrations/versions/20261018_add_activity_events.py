@@ -0,0 +1,104 @@
+"""Add activity_events
+
+Seeds the feed with one event per recently updated application and
+commission (the SEED_LIMIT latest of each, at their updated_at), so the
+dashboard is not empty until new activity is recorded. A table the app
+already created with db.create_all() is kept, and only seeded if empty.
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e5b8f0a3c714'
+down_revision = 'd93a6c1f5e27'
+
+SEED_LIMIT = 100
+
+def upgrade():
+    bind = op.get_bind()
+    events = sa.table(
+        'activity_events', sa.column('id', sa.Integer), sa.column('type', sa.String), sa.column('action', sa.String),
+        sa.column('entity_id', sa.Integer), sa.column('application_id', sa.Integer),
+        sa.column('status', sa.String), sa.column('details', sa.Text), sa.column('created_at', sa.DateTime)
+    )
+    if 'activity_events' in sa.inspect(bind).get_table_names():
+        if bind.execute(sa.select(events.c.id).limit(1)).first() is not None:
+            return
+    else:
+        op.create_table(
+            'activity_events',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('type', sa.String(length=20), nullable=False),
+            sa.Column('action', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=True),
+            sa.Column('application_id', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=50), nullable=True),
+            sa.Column('details', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(
+            'ix_activity_events_created_at_id', 'activity_events',
+            [sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+        )
+
+    applications = sa.table(
+        'applications', sa.column('id', sa.Integer), sa.column('job_id', sa.Integer),
+        sa.column('candidate_id', sa.Integer), sa.column('status', sa.String),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime)
+    )
+    candidate = sa.table('candidate', sa.column('id', sa.Integer), sa.column('first_name', sa.String), sa.column('last_name', sa.String))
+    job = sa.table('job', sa.column('id', sa.Integer), sa.column('title', sa.String))
+    commission = sa.table(
+        'commission', sa.column('id', sa.Integer), sa.column('application_id', sa.Integer),
+        sa.column('agency_id', sa.Integer), sa.column('amount', sa.Float), sa.column('status', sa.String),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime)
+    )
+    agency = sa.table('recruitment_agency', sa.column('id', sa.Integer), sa.column('name', sa.String))
+
+    rows = []
+    application_time = sa.func.coalesce(applications.c.updated_at, applications.c.created_at)
+    recent_applications = bind.execute(
+        sa.select(applications.c.id, applications.c.status, application_time,
+                  candidate.c.first_name, candidate.c.last_name, job.c.title)
+        .select_from(applications
+                     .outerjoin(candidate, candidate.c.id == applications.c.candidate_id)
+                     .outerjoin(job, job.c.id == applications.c.job_id))
+        .where(application_time.isnot(None))
+        .order_by(application_time.desc())
+        .limit(SEED_LIMIT)
+    )
+    for application_id, status, created_at, first_name, last_name, title in recent_applications:
+        rows.append({
+            'type': 'application', 'action': 'created', 'entity_id': application_id,
+            'application_id': application_id, 'status': status, 'created_at': created_at,
+            'details': json.dumps({
+                'candidate': f'{first_name} {last_name}' if first_name is not None else None,
+                'job': title
+            })
+        })
+
+    commission_time = sa.func.coalesce(commission.c.updated_at, commission.c.created_at)
+    recent_commissions = bind.execute(
+        sa.select(commission.c.id, commission.c.application_id, commission.c.amount,
+                  commission.c.status, commission_time, agency.c.name)
+        .select_from(commission.outerjoin(agency, agency.c.id == commission.c.agency_id))
+        .where(commission_time.isnot(None))
+        .order_by(commission_time.desc())
+        .limit(SEED_LIMIT)
+    )
+    for commission_id, application_id, amount, status, created_at, agency_name in recent_commissions:
+        rows.append({
+            'type': 'commission', 'action': 'created', 'entity_id': commission_id,
+            'application_id': application_id, 'status': status, 'created_at': created_at,
+            'details': json.dumps({'amount': amount, 'agency': agency_name})
+        })
+
+    # Ids follow time, like events appended later
+    rows.sort(key=lambda row: row['created_at'])
+    if rows:
+        op.bulk_insert(events, rows)
+
+def downgrade():
+    op.drop_index('ix_activity_events_created_at_id', table_name='activity_events')
+    op.drop_table('activity_events')
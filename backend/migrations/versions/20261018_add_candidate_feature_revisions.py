@@ -0,0 +1,32 @@
+"""Add candidate_features.revision and candidate_feature_revision
+
+Stored features get the revision of the write that stored them, counted by
+the single-row candidate_feature_revision table, so the batch scorer can
+reload only what changed. Existing rows start at revision 0. A column or
+table the app already created with db.create_all() is kept.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f2a9c4d71b38'
+down_revision = 'e5b8f0a3c714'
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if 'candidate_features' in tables and 'revision' not in {column['name'] for column in inspector.get_columns('candidate_features')}:
+        op.add_column('candidate_features', sa.Column('revision', sa.BigInteger(), nullable=False, server_default='0'))
+        op.create_index('ix_candidate_features_revision', 'candidate_features', ['revision'], unique=False)
+
+    if 'candidate_feature_revision' not in tables:
+        op.create_table(
+            'candidate_feature_revision',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('revision', sa.BigInteger(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+def downgrade():
+    op.drop_table('candidate_feature_revision')
+    op.drop_index('ix_candidate_features_revision', table_name='candidate_features')
+    op.drop_column('candidate_features', 'revision')
@@ -0,0 +1,71 @@
+"""Add metric_counters
+
+Seeds the counters from the current rows, as the reconcile-metrics command
+does, so totals are correct as soon as writes start applying deltas. A table
+the app already created with db.create_all() is kept and reseeded.
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b41f7d2e9a60'
+down_revision = '7c3e5a91d2b4'
+
+# Counter prefix, table, status column and summed amount column, as in
+# src.services.metric_counters.TRACKED_MODELS
+TRACKED_TABLES = [
+    ('jobs', 'job', 'status', None),
+    ('candidates', 'candidate', None, None),
+    ('applications', 'applications', 'status', None),
+    ('commissions', 'commission', 'status', 'amount')
+]
+
+def upgrade():
+    bind = op.get_bind()
+    counters = sa.table(
+        'metric_counters',
+        sa.column('name', sa.String), sa.column('count', sa.BigInteger),
+        sa.column('amount', sa.Float), sa.column('updated_at', sa.DateTime)
+    )
+    if 'metric_counters' in sa.inspect(bind).get_table_names():
+        bind.execute(counters.delete())
+    else:
+        op.create_table(
+            'metric_counters',
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('count', sa.BigInteger(), nullable=False),
+            sa.Column('amount', sa.Float(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('name')
+        )
+
+    now = datetime.utcnow()
+    rows = []
+    for prefix, table_name, status_column, amount_column in TRACKED_TABLES:
+        columns = [sa.column(name) for name in (status_column, amount_column) if name]
+        table = sa.table(table_name, *columns)
+        amount = sa.func.coalesce(sa.func.sum(table.c[amount_column]), 0) if amount_column else sa.literal(0)
+        if status_column:
+            groups = bind.execute(
+                sa.select(table.c[status_column], sa.func.count(), amount)
+                .select_from(table)
+                .group_by(table.c[status_column])
+            ).all()
+        else:
+            groups = [(None, *bind.execute(sa.select(sa.func.count(), amount).select_from(table)).one())]
+
+        for status, count, total in groups:
+            if status_column:
+                name = f'{prefix}.status.{status if status is not None else "none"}'
+                rows.append({'name': name, 'count': count, 'amount': float(total), 'updated_at': now})
+        rows.append({
+            'name': f'{prefix}.total',
+            'count': sum(group[1] for group in groups),
+            'amount': float(sum(group[2] for group in groups)),
+            'updated_at': now
+        })
+
+    op.bulk_insert(counters, rows)
+
+def downgrade():
+    op.drop_table('metric_counters')
@@ -0,0 +1,97 @@
+"""Add application_status_events and daily_metrics
+
+Applications already hired get one 'hired' event at their updated_at, the
+best estimate of the hire date available. daily_metrics is then seeded as
+the rebuild-metric-rollups command does. Tables the app already created with
+db.create_all() are kept: hired applications that already have a 'hired'
+event get no other, and daily_metrics is rebuilt.
+"""
+from collections import defaultdict
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd93a6c1f5e27'
+down_revision = 'b41f7d2e9a60'
+
+# Daily metric and the table whose rows created per day it counts
+CREATED_METRICS = [
+    ('applications', 'applications'),
+    ('candidates', 'candidate'),
+    ('jobs', 'job')
+]
+
+def as_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def upgrade():
+    bind = op.get_bind()
+    tables = sa.inspect(bind).get_table_names()
+    if 'application_status_events' not in tables:
+        op.create_table(
+            'application_status_events',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('application_id', sa.Integer(), nullable=False),
+            sa.Column('from_status', sa.String(length=50), nullable=True),
+            sa.Column('to_status', sa.String(length=50), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_application_status_events_application_id', 'application_status_events', ['application_id'], unique=False)
+        op.create_index('ix_application_status_events_created_at', 'application_status_events', ['created_at'], unique=False)
+    daily_metrics = sa.table(
+        'daily_metrics', sa.column('metric', sa.String), sa.column('day', sa.Date), sa.column('count', sa.Integer)
+    )
+    if 'daily_metrics' in tables:
+        bind.execute(daily_metrics.delete())
+    else:
+        op.create_table(
+            'daily_metrics',
+            sa.Column('metric', sa.String(length=50), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('metric', 'day')
+        )
+
+    applications = sa.table(
+        'applications', sa.column('id', sa.Integer), sa.column('status', sa.String),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime)
+    )
+    events = sa.table(
+        'application_status_events', sa.column('application_id', sa.Integer), sa.column('from_status', sa.String),
+        sa.column('to_status', sa.String), sa.column('created_at', sa.DateTime)
+    )
+    bind.execute(events.insert().from_select(
+        ['application_id', 'from_status', 'to_status', 'created_at'],
+        sa.select(
+            applications.c.id, sa.null(), applications.c.status,
+            sa.func.coalesce(applications.c.updated_at, applications.c.created_at, sa.func.current_timestamp())
+        ).where(
+            applications.c.status == 'hired',
+            ~sa.exists().where(events.c.application_id == applications.c.id, events.c.to_status == 'hired')
+        )
+    ))
+
+    counts = defaultdict(int)
+    for metric, table_name in CREATED_METRICS:
+        table = sa.table(table_name, sa.column('created_at', sa.DateTime))
+        day = sa.func.date(table.c.created_at)
+        for value, count in bind.execute(sa.select(day, sa.func.count()).select_from(table).group_by(day)):
+            if value is not None:
+                counts[(metric, as_date(value))] += count
+    day = sa.func.date(events.c.created_at)
+    for value, count in bind.execute(sa.select(day, sa.func.count()).where(events.c.to_status == 'hired').group_by(day)):
+        counts[('hires', as_date(value))] += count
+
+    op.bulk_insert(daily_metrics, [
+        {'metric': metric, 'day': day, 'count': count}
+        for (metric, day), count in counts.items()
+    ])
+
+def downgrade():
+    op.drop_table('daily_metrics')
+    op.drop_index('ix_application_status_events_created_at', table_name='application_status_events')
+    op.drop_index('ix_application_status_events_application_id', table_name='application_status_events')
+    op.drop_table('application_status_events')
@@ -0,0 +1,104 @@
+"""Normalize candidate skills into skills and candidate_skills
+
+Backfills both tables from the JSON in candidate.skills. A candidate_skills
+table keyed on the skill text (the earlier skill filter index) is replaced.
+Tables the app already created with db.create_all() are kept, and only
+candidates without skill links are backfilled.
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+revision = '7c3e5a91d2b4'
+down_revision = None
+
+BATCH_SIZE = 1000
+MAX_NAME_LENGTH = 255
+
+def canonical_names(skills):
+    """Same rule as Skill.canonical_names"""
+    names = (' '.join(skill.split()).lower() for skill in skills if isinstance(skill, str))
+    return [name for name in dict.fromkeys(names) if name and len(name) <= MAX_NAME_LENGTH]
+
+def parse_skills(value):
+    try:
+        skills = json.loads(value) if value else []
+    except ValueError:
+        return []
+    return skills if isinstance(skills, list) else []
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+    if 'candidate_skills' in tables and 'skill_id' not in {column['name'] for column in inspector.get_columns('candidate_skills')}:
+        op.drop_table('candidate_skills')
+        tables.remove('candidate_skills')
+
+    if 'skills' not in tables:
+        op.create_table(
+            'skills',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=MAX_NAME_LENGTH), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name')
+        )
+    if 'candidate_skills' not in tables:
+        op.create_table(
+            'candidate_skills',
+            sa.Column('candidate_id', sa.Integer(), nullable=False),
+            sa.Column('skill_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['candidate_id'], ['candidate.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('candidate_id', 'skill_id')
+        )
+        op.create_index('ix_candidate_skills_skill_candidate', 'candidate_skills', ['skill_id', 'candidate_id'], unique=False)
+
+    candidate = sa.table('candidate', sa.column('id', sa.Integer), sa.column('skills', sa.Text))
+    skills = sa.table('skills', sa.column('id', sa.Integer), sa.column('name', sa.String))
+    candidate_skills = sa.table('candidate_skills', sa.column('candidate_id', sa.Integer), sa.column('skill_id', sa.Integer))
+
+    skill_ids = {}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(candidate.c.id, candidate.c.skills)
+            .where(candidate.c.id > last_id)
+            .order_by(candidate.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        # Candidates the app already linked keep their links
+        linked = {row[0] for row in bind.execute(
+            sa.select(candidate_skills.c.candidate_id).distinct()
+            .where(candidate_skills.c.candidate_id.in_([row[0] for row in rows]))
+        )}
+        links = [(candidate_id, canonical_names(parse_skills(value))) for candidate_id, value in rows
+                 if candidate_id not in linked]
+        new_names = sorted({name for _, names in links for name in names} - skill_ids.keys())
+        if new_names:
+            skill_ids.update(bind.execute(
+                sa.select(skills.c.name, skills.c.id).where(skills.c.name.in_(new_names))
+            ).fetchall())
+            new_names = [name for name in new_names if name not in skill_ids]
+        if new_names:
+            bind.execute(skills.insert(), [{'name': name} for name in new_names])
+            skill_ids.update(bind.execute(
+                sa.select(skills.c.name, skills.c.id).where(skills.c.name.in_(new_names))
+            ).fetchall())
+
+        associations = [
+            {'candidate_id': candidate_id, 'skill_id': skill_ids[name]}
+            for candidate_id, names in links
+            for name in names
+        ]
+        if associations:
+            bind.execute(candidate_skills.insert(), associations)
+
+def downgrade():
+    op.drop_index('ix_candidate_skills_skill_candidate', table_name='candidate_skills')
+    op.drop_table('candidate_skills')
+    op.drop_table('skills')
@@ -108,7 +108,13 @@ def register_error_handlers(app):
 # Import all models for Flask-Migrate to detect
 from src.models.user import User
 from src.models.job import Job
-from src.models.candidate import Candidate
+from src.models.candidate import Candidate, CandidateTerm, Skill, CandidateSkill, CandidateFeatures, CandidateFeatureRevision
 from src.models.application import Application
 from src.models.communication import CommunicationLog
 from src.models.agency import RecruitmentAgency, Commission
+from src.models.corpus import TermStatistic, CorpusStatistic
+from src.models.match_job import MatchJob, MatchJobResult
+from src.models.cv_cache import CVParseResult
+from src.models.match_score import MatchScore, MatchScoreRefresh
+from src.models.metrics import MetricCounter, ApplicationStatusEvent, DailyMetric
+from src.models.activity import ActivityEvent
@@ -3,6 +3,7 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+import click
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
@@ -38,13 +39,120 @@ db.init_app(app)
 
 # Import all models to ensure they are registered with SQLAlchemy
 from src.models.job import Job
-from src.models.candidate import Candidate
+from src.models.candidate import Candidate, CandidateTerm, Skill, CandidateSkill, CandidateFeatures, CandidateFeatureRevision
 from src.models.application import Application
 from src.models.agency import RecruitmentAgency, Commission
 from src.models.communication import CommunicationLog
+from src.models.corpus import TermStatistic, CorpusStatistic
+from src.models.match_job import MatchJob, MatchJobResult
+from src.models.cv_cache import CVParseResult
+from src.models.match_score import MatchScore, MatchScoreRefresh
+from src.models.metrics import MetricCounter, ApplicationStatusEvent, DailyMetric
+from src.models.activity import ActivityEvent
 
 with app.app_context():
     db.create_all()
+    # create_all() adds new tables to an existing database empty; fill them from the current rows
+    Skill.backfill_if_empty()
+    from src.services.candidate_features import CandidateFeatureStore
+    CandidateFeatureStore().rebuild_if_empty()
+    from src.services.candidate_index import CandidateIndex
+    CandidateIndex().rebuild_if_empty()
+    from src.services.metric_counters import MetricCounters
+    MetricCounters().seed()
+    from src.services.metric_rollups import MetricRollups
+    MetricRollups().seed()
+
+@app.cli.command('rebuild-candidate-index')
+def rebuild_candidate_index():
+    """Rebuild the candidate term index used by job matching"""
+    from src.services.candidate_index import CandidateIndex
+    indexed = CandidateIndex().rebuild()
+    click.echo(f"Indexed {indexed} candidates")
+
+@app.cli.command('backfill-candidate-skills')
+@click.option('--batch-size', default=500, type=int, help='Candidates committed together')
+def backfill_candidate_skills(batch_size):
+    """Link every candidate to the Skill rows of its skills JSON"""
+    from src.models.candidate import Skill
+    linked = Skill.backfill(batch_size)
+    click.echo(f"Linked skills of {linked} candidates")
+
+@app.cli.command('rebuild-candidate-features')
+def rebuild_candidate_features():
+    """Recompute the stored matching features of every candidate"""
+    from src.services.candidate_features import CandidateFeatureStore
+    profiled = CandidateFeatureStore().rebuild()
+    click.echo(f"Profiled {profiled} candidates")
+
+@app.cli.command('rebuild-corpus-statistics')
+def rebuild_corpus_statistics():
+    """Recount term document frequencies over all candidate CVs and jobs"""
+    from src.services.candidate_features import CandidateFeatureStore
+    from src.services.corpus_stats import CorpusStatistics
+    corpus_stats = CorpusStatistics()
+    profiles = CandidateFeatureStore(corpus_stats.matcher).load_all()
+    documents = [corpus_stats.candidate_terms(profile) for profile in profiles.values()]
+    documents.extend(corpus_stats.job_terms(job.to_dict()) for job in Job.query.all())
+    total = corpus_stats.rebuild(documents)
+    click.echo(f"Counted {total} documents")
+
+@app.cli.command('prune-cv-cache')
+def prune_cv_cache():
+    """Delete cached CV parse results of older extraction rules"""
+    from src.services.cv_cache import CVParseCache
+    pruned = CVParseCache().prune()
+    db.session.commit()
+    click.echo(f"Pruned {pruned} cached CV results")
+
+@app.cli.command('rebuild-match-scores')
+def rebuild_match_scores():
+    """Queue every open job for match score recomputation (run match-score-worker to process)"""
+    from src.services.match_scores import MatchScoreStore
+    queued = MatchScoreStore().refresh_all()
+    db.session.commit()
+    click.echo(f"Queued {queued} jobs for match score recomputation")
+
+@app.cli.command('match-score-worker')
+@click.option('--max-idle', default=None, type=float, help='Exit after this many idle seconds')
+def match_score_worker(max_idle):
+    """Recompute stored match scores of changed jobs and candidates"""
+    from src.services.match_scores import MatchScoreStore
+    store = MatchScoreStore()
+    requeued = store.requeue_stale()
+    if requeued:
+        click.echo(f"Requeued {requeued} stale match score refreshes")
+    processed = store.run_worker(max_idle=max_idle)
+    click.echo(f"Processed {processed} match score refreshes")
+
+@app.cli.command('reconcile-metrics')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting the counters')
+def reconcile_metrics(dry_run):
+    """Recount the metric counters from the tables and report drift"""
+    from src.services.metric_counters import MetricCounters
+    drift = MetricCounters().reconcile(fix=not dry_run)
+    for name, (stored_count, stored_amount), (actual_count, actual_amount) in drift:
+        click.echo(f"{name}: count {stored_count} -> {actual_count}, amount {stored_amount:.2f} -> {actual_amount:.2f}")
+    action = 'Found' if dry_run else 'Corrected'
+    click.echo(f"{action} drift in {len(drift)} counters")
+
+@app.cli.command('rebuild-metric-rollups')
+def rebuild_metric_rollups():
+    """Recount the daily metric rollups from the tables and status events"""
+    from src.services.metric_rollups import MetricRollups
+    rows = MetricRollups().rebuild()
+    click.echo(f"Rebuilt {rows} daily metric rows")
+
+@app.cli.command('match-worker')
+@click.option('--processes', default=1, type=int, help='Number of worker processes')
+def match_worker(processes):
+    """Process queued batch matching jobs"""
+    from src.services.match_queue import MatchJobQueue
+    queue = MatchJobQueue()
+    requeued = queue.requeue_stale()
+    if requeued:
+        click.echo(f"Requeued {requeued} stale match jobs")
+    queue.run_pool(app, processes)
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
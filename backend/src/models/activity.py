@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from src.models.user import db
+
+class ActivityEvent(db.Model):
+    """
+    One entry of the activity feed; append-only
+    details holds the display fields (candidate and job names, agency,
+    recipient...) copied at write time as JSON, so the feed is read from this
+    table alone.
+    """
+    __tablename__ = 'activity_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    type = db.Column(db.String(20), nullable=False)  # application, commission, communication
+    action = db.Column(db.String(20), nullable=False)  # created, status_changed, deleted, sent
+    entity_id = db.Column(db.Integer)
+    application_id = db.Column(db.Integer)
+    status = db.Column(db.String(50))
+    details = db.Column(db.Text)  # JSON object
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ActivityEvent {self.id}: {self.type} {self.action}>'
+
+    def get_details(self):
+        """Return the display fields as a dict"""
+        return json.loads(self.details) if self.details else {}
+
+    def to_dict(self):
+        return {
+            'event_id': self.id,
+            'type': self.type,
+            'action': self.action,
+            'id': self.entity_id,
+            'application_id': self.application_id,
+            'status': self.status,
+            'time': self.created_at.isoformat() if self.created_at else None,
+            **self.get_details()
+        }
+
+# The feed reads newest first
+db.Index('ix_activity_events_created_at_id', ActivityEvent.created_at.desc(), ActivityEvent.id.desc())
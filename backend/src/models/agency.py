@@ -31,7 +31,7 @@ class RecruitmentAgency(db.Model):
 
 class Commission(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
     agency_id = db.Column(db.Integer, db.ForeignKey('recruitment_agency.id'), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), default='pending')  # pending, paid, failed
@@ -41,7 +41,7 @@ class Commission(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    application = db.relationship('Application', backref=db.backref('commissions', lazy=True))
+    # application: backref of Application.commissions
     agency = db.relationship('RecruitmentAgency', backref=db.backref('commissions', lazy=True))
     
     def __repr__(self):
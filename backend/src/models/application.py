@@ -3,6 +3,9 @@ from datetime import datetime
 from src.models.user import db
 from sqlalchemy.dialects.postgresql import JSONB  # For PostgreSQL users
 
+# JSONB on PostgreSQL, plain JSON on the SQLite development database
+JSON_DOCUMENT = db.JSON().with_variant(JSONB(), 'postgresql')
+
 class Application(db.Model):
     __tablename__ = 'applications'
     
@@ -14,7 +17,7 @@ class Application(db.Model):
     matching_score = db.Column(db.Float, nullable=True)
     
     # Enhanced right to represent fields
-    right_to_represent = db.Column(JSONB, default={
+    right_to_represent = db.Column(JSON_DOCUMENT, default={
         'status': 'pending',  # pending, sent, signed, declined
         'sent_at': None,
         'signed_at': None,
@@ -23,7 +26,7 @@ class Application(db.Model):
     })
     
     # CV/Resume tracking
-    cv_data = db.Column(JSONB, default={
+    cv_data = db.Column(JSON_DOCUMENT, default={
         'original_filename': None,
         'storage_path': None,
         'text_content': None,
@@ -31,7 +34,7 @@ class Application(db.Model):
     })
     
     # AI matching details
-    matching_details = db.Column(JSONB, default={
+    matching_details = db.Column(JSON_DOCUMENT, default={
         'skills_match': None,
         'experience_match': None,
         'education_match': None,
@@ -40,7 +43,7 @@ class Application(db.Model):
     })
     
     # Communication history
-    communication_history = db.Column(JSONB, default=[])
+    communication_history = db.Column(JSON_DOCUMENT, default=[])
     
     notes = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -54,33 +57,40 @@ class Application(db.Model):
     def __repr__(self):
         return f'<Application {self.id}: Job {self.job_id} - Candidate {self.candidate_id}>'
     
-    def to_dict(self):
-        """Basic serialization with core fields"""
-        return {
-            'id': self.id,
-            'job_id': self.job_id,
-            'candidate_id': self.candidate_id,
-            'application_date': self.application_date.isoformat() if self.application_date else None,
-            'status': self.status,
-            'matching_score': self.matching_score,
-            'right_to_represent': self.right_to_represent,
-            'cv_data': self.cv_data,
-            'notes': self.notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    # Keys of to_dict, and those to_dict_with_details adds, each the name of a column
+    FIELDS = (
+        'id', 'job_id', 'candidate_id', 'application_date', 'status', 'matching_score',
+        'right_to_represent', 'cv_data', 'notes', 'created_at', 'updated_at'
+    )
+    DETAIL_FIELDS = FIELDS + ('matching_details', 'communication_history')
+    
+    # Related rows to_dict_with_details can include
+    RELATIONS = ('job', 'candidate', 'commissions')
+    
+    def to_dict(self, fields=None):
+        """Basic serialization with core fields, or only the given DETAIL_FIELDS"""
+        return {field: self._serialize(field) for field in (fields or self.FIELDS)}
+    
+    def _serialize(self, field):
+        value = getattr(self, field)
+        return value.isoformat() if isinstance(value, datetime) else value
     
-    def to_dict_with_details(self):
-        """Comprehensive serialization with related objects and AI details"""
-        result = self.to_dict()
-        result['matching_details'] = self.matching_details
-        result['communication_history'] = self.communication_history
+    def to_dict_with_details(self, fields=None, expand=RELATIONS, related_fields=None):
+        """
+        Comprehensive serialization with related objects and AI details
+        Args:
+            fields: Application keys to include (all DETAIL_FIELDS if None)
+            expand: Related objects to include, among RELATIONS
+            related_fields: Keys to include per related object, e.g. {'candidate': ['first_name']}
+        """
+        result = self.to_dict(fields or self.DETAIL_FIELDS)
+        related_fields = related_fields or {}
         
-        if self.job:
-            result['job'] = self.job.to_dict()
-        if self.candidate:
-            result['candidate'] = self.candidate.to_dict()
-        if self.commissions:
+        if 'job' in expand and self.job:
+            result['job'] = self.job.to_dict(related_fields.get('job'))
+        if 'candidate' in expand and self.candidate:
+            result['candidate'] = self.candidate.to_dict(related_fields.get('candidate'))
+        if 'commissions' in expand and self.commissions:
             result['commissions'] = [c.to_dict() for c in self.commissions]
         
         return result
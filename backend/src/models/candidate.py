@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from src.models.user import db
 import json
 
@@ -18,6 +19,9 @@ class Candidate(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # The listed skills as canonical Skill rows, kept in step by set_skills_list
+    canonical_skills = db.relationship('Skill', secondary='candidate_skills', lazy='select')
+    
     def __repr__(self):
         return f'<Candidate {self.first_name} {self.last_name}>'
     
@@ -30,24 +34,155 @@ class Candidate(db.Model):
                 return []
         return []
     
-    def set_skills_list(self, skills_list):
-        """Convert skills list to JSON string"""
+    def set_skills_list(self, skills_list, resolved=None):
+        """
+        Convert skills list to JSON string and link the matching Skill rows
+        resolved may map canonical names to Skill rows already looked up with
+        Skill.resolve, to link the candidates of a batch without a query each.
+        """
         self.skills = json.dumps(skills_list) if skills_list else None
+        self.link_skills(resolved)
+    
+    def link_skills(self, resolved=None):
+        """Point canonical_skills at the Skill rows of the skills JSON"""
+        names = Skill.canonical_names(self.get_skills_list())
+        if resolved is None or any(name not in resolved for name in names):
+            resolved = Skill.resolve(names)
+        self.canonical_skills = [resolved[name] for name in names]
+    
+    # Keys of to_dict, each the name of a column
+    FIELDS = (
+        'id', 'first_name', 'last_name', 'email', 'phone', 'linkedin_profile',
+        'total_experience_years', 'education', 'skills', 'parsed_cv_text',
+        'cv_file_path', 'created_at', 'updated_at'
+    )
+    
+    def to_dict(self, fields=None):
+        """Serialize the candidate, or only the given FIELDS"""
+        return {field: self._serialize(field) for field in (fields or self.FIELDS)}
+    
+    def _serialize(self, field):
+        if field == 'skills':
+            return self.get_skills_list()
+        value = getattr(self, field)
+        return value.isoformat() if isinstance(value, datetime) else value
+
+
+class CandidateTerm(db.Model):
+    """Inverted index entry mapping a normalized skill/keyword term to a candidate"""
+    __tablename__ = 'candidate_terms'
+    
+    term = db.Column(db.String(255), primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id', ondelete='CASCADE'), primary_key=True, index=True)
+    
+    def __repr__(self):
+        return f'<CandidateTerm {self.term} -> {self.candidate_id}>'
+
+class Skill(db.Model):
+    """A skill under its canonical name (trimmed, lowercased, single-spaced)"""
+    __tablename__ = 'skills'
+    
+    # Longest canonical name stored; longer skills are kept in the JSON only
+    MAX_NAME_LENGTH = 255
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(MAX_NAME_LENGTH), unique=True, nullable=False)
+    
+    def __repr__(self):
+        return f'<Skill {self.name}>'
+    
+    @classmethod
+    def canonical_names(cls, skills):
+        """Distinct canonical names of skills, in order"""
+        names = (' '.join(skill.split()).lower() for skill in skills if isinstance(skill, str))
+        return [name for name in dict.fromkeys(names) if name and len(name) <= cls.MAX_NAME_LENGTH]
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'phone': self.phone,
-            'linkedin_profile': self.linkedin_profile,
-            'total_experience_years': self.total_experience_years,
-            'education': self.education,
-            'skills': self.get_skills_list(),
-            'parsed_cv_text': self.parsed_cv_text,
-            'cv_file_path': self.cv_file_path,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    @classmethod
+    def resolve(cls, names):
+        """Map canonical names to Skill rows, creating the missing ones (caller commits)"""
+        names = list(dict.fromkeys(names))
+        resolved = {skill.name: skill for skill in cls.query.filter(cls.name.in_(names))} if names else {}
+        for name in names:
+            if name in resolved:
+                continue
+            # A concurrent request may insert the same skill first
+            try:
+                with db.session.begin_nested():
+                    skill = cls(name=name)
+                    db.session.add(skill)
+            except IntegrityError:
+                skill = cls.query.filter_by(name=name).one()
+            resolved[name] = skill
+        return resolved
+
+    @classmethod
+    def backfill(cls, batch_size=500):
+        """
+        Link every candidate to the Skill rows of its skills JSON, committing each batch
+        Returns the number of candidates linked.
+        """
+        candidate_ids = [row[0] for row in db.session.query(Candidate.id).order_by(Candidate.id)]
+        for start in range(0, len(candidate_ids), batch_size):
+            candidates = Candidate.query.filter(Candidate.id.in_(candidate_ids[start:start + batch_size])).all()
+            resolved = cls.resolve(cls.canonical_names(
+                skill for candidate in candidates for skill in candidate.get_skills_list()
+            ))
+            for candidate in candidates:
+                candidate.link_skills(resolved)
+            # Another process running the same backfill linked this batch first
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+        return len(candidate_ids)
+    
+    @classmethod
+    def backfill_if_empty(cls):
+        """Backfill when candidates exist but no skill is linked yet, e.g. right after create_all() added the table"""
+        if db.session.query(CandidateSkill.query.exists()).scalar():
+            return 0
+        if not db.session.query(Candidate.query.exists()).scalar():
+            return 0
+        return cls.backfill()
+
+class CandidateSkill(db.Model):
+    """Association of a candidate with a listed skill, indexed from both sides"""
+    __tablename__ = 'candidate_skills'
+    
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id', ondelete='CASCADE'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True)
+    
+    __table_args__ = (
+        db.Index('ix_candidate_skills_skill_candidate', 'skill_id', 'candidate_id'),
+    )
+    
+    def __repr__(self):
+        return f'<CandidateSkill {self.skill_id} -> {self.candidate_id}>'
 
+class CandidateFeatures(db.Model):
+    """Precomputed matching features of a candidate, stored as compact JSON"""
+    __tablename__ = 'candidate_features'
+    
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.Text, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # CandidateFeatureRevision.revision taken by the write that stored these features
+    revision = db.Column(db.BigInteger, nullable=False, default=0, index=True)
+    
+    def __repr__(self):
+        return f'<CandidateFeatures {self.candidate_id} v{self.version}>'
+
+class CandidateFeatureRevision(db.Model):
+    """
+    Single-row counter bumped by every write to candidate_features
+    The bump row-locks the counter until the writer commits, so revisions
+    become visible in increasing order, unlike computed_at timestamps.
+    """
+    __tablename__ = 'candidate_feature_revision'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    revision = db.Column(db.BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<CandidateFeatureRevision {self.revision}>'
@@ -0,0 +1,24 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+from src.models.user import db
+
+class TermStatistic(db.Model):
+    """Number of documents (candidate CVs and job texts) containing a term"""
+    __tablename__ = 'term_statistics'
+    
+    term = db.Column(db.String(255), primary_key=True)
+    document_frequency = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<TermStatistic {self.term}: {self.document_frequency}>'
+
+class CorpusStatistic(db.Model):
+    """Corpus-wide totals, e.g. the number of documents term frequencies are counted over"""
+    __tablename__ = 'corpus_statistics'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<CorpusStatistic {self.name}: {self.value}>'
@@ -0,0 +1,15 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+from src.models.user import db
+
+class CVParseResult(db.Model):
+    """Structured data extracted from a CV, keyed by the hash of its normalized text"""
+    __tablename__ = 'cv_parse_results'
+    
+    content_hash = db.Column(db.String(64), primary_key=True)
+    rules_version = db.Column(db.Integer, nullable=False, index=True)
+    data = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<CVParseResult {self.content_hash[:12]} v{self.rules_version}>'
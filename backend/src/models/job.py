@@ -21,18 +21,16 @@ class Job(db.Model):
     def __repr__(self):
         return f'<Job {self.title}>'
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'requirements': self.requirements,
-            'responsibilities': self.responsibilities,
-            'location': self.location,
-            'salary_range': self.salary_range,
-            'status': self.status,
-            'hiring_manager_id': self.hiring_manager_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
-
+    # Keys of to_dict, each the name of a column
+    FIELDS = (
+        'id', 'title', 'description', 'requirements', 'responsibilities', 'location',
+        'salary_range', 'status', 'hiring_manager_id', 'created_at', 'updated_at'
+    )
+    
+    def to_dict(self, fields=None):
+        """Serialize the job, or only the given FIELDS"""
+        return {field: self._serialize(field) for field in (fields or self.FIELDS)}
+    
+    def _serialize(self, field):
+        value = getattr(self, field)
+        return value.isoformat() if isinstance(value, datetime) else value
@@ -0,0 +1,76 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+from src.models.user import db
+import json
+
+class MatchJob(db.Model):
+    """Queued batch matching request processed by background workers"""
+    __tablename__ = 'match_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, completed, failed
+    application_ids = db.Column(db.Text, nullable=False)  # JSON array of application ids
+    total = db.Column(db.Integer, nullable=False, default=0)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    worker = db.Column(db.String(100), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<MatchJob {self.id}: {self.status} {self.processed}/{self.total}>'
+    
+    def get_application_ids(self):
+        """Convert application ids JSON string to list"""
+        return json.loads(self.application_ids) if self.application_ids else []
+    
+    def set_application_ids(self, application_ids):
+        """Convert application ids list to JSON string"""
+        self.application_ids = json.dumps(application_ids)
+        self.total = len(application_ids)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'processed': self.processed,
+            'progress': round(self.processed / self.total, 3) if self.total else 1.0,
+            'worker': self.worker,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class MatchJobResult(db.Model):
+    """Score (or error) of one application in a batch matching job"""
+    __tablename__ = 'match_job_results'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    match_job_id = db.Column(db.Integer, db.ForeignKey('match_jobs.id', ondelete='CASCADE'), nullable=False, index=True)
+    application_id = db.Column(db.Integer, nullable=False)
+    candidate_id = db.Column(db.Integer, nullable=True)
+    job_id = db.Column(db.Integer, nullable=True)
+    matching_score = db.Column(db.Float, nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    
+    def __repr__(self):
+        return f'<MatchJobResult {self.match_job_id}: Application {self.application_id}>'
+    
+    def to_dict(self):
+        """Same shape as the synchronous /match/batch results"""
+        if self.error:
+            return {
+                'application_id': self.application_id,
+                'error': self.error
+            }
+        return {
+            'application_id': self.application_id,
+            'matching_score': self.matching_score,
+            'candidate_id': self.candidate_id,
+            'job_id': self.job_id
+        }
@@ -0,0 +1,53 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+from src.models.user import db
+import json
+
+class MatchScore(db.Model):
+    """Stored matching score of a candidate for an open job, kept current by the match score worker"""
+    __tablename__ = 'match_scores'
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    breakdown = db.Column(db.Text, nullable=True)  # JSON object of criterion scores
+    engine_version = db.Column(db.Integer, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<MatchScore Job {self.job_id} - Candidate {self.candidate_id}: {self.score}>'
+    
+    def get_breakdown(self):
+        """Convert breakdown JSON string to dict"""
+        return json.loads(self.breakdown) if self.breakdown else None
+    
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'candidate_id': self.candidate_id,
+            'score': self.score,
+            'breakdown': self.get_breakdown(),
+            'engine_version': self.engine_version,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None
+        }
+
+# Rankings read the best scores of a job, or of a candidate, straight off these
+db.Index('ix_match_scores_job_score', MatchScore.job_id, MatchScore.score.desc())
+db.Index('ix_match_scores_candidate_score', MatchScore.candidate_id, MatchScore.score.desc())
+
+class MatchScoreRefresh(db.Model):
+    """Whether the stored match scores of a job or candidate are current or waiting to be recomputed"""
+    __tablename__ = 'match_score_refreshes'
+    
+    entity = db.Column(db.String(20), primary_key=True)  # job, candidate
+    entity_id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)  # pending, running, done, failed
+    engine_version = db.Column(db.Integer, nullable=True)  # Version the stored scores were computed with
+    worker = db.Column(db.String(100), nullable=True)
+    requested_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    computed_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    
+    def __repr__(self):
+        return f'<MatchScoreRefresh {self.entity} {self.entity_id}: {self.status}>'
@@ -0,0 +1,75 @@
+from datetime import datetime
+from src.models.user import db
+
+class MetricCounter(db.Model):
+    """
+    A running total kept up to date by the writes it counts
+    name is '<entity>.total' or '<entity>.status.<status>', e.g.
+    'applications.status.hired'; amount sums money columns (commission
+    amounts) and stays 0 for plain counts.
+    """
+    __tablename__ = 'metric_counters'
+
+    name = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.BigInteger, nullable=False, default=0)
+    amount = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<MetricCounter {self.name}: {self.count}>'
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'count': self.count,
+            'amount': self.amount,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class ApplicationStatusEvent(db.Model):
+    """
+    An application entering a status; append-only
+    from_status is None when the application was created. Events are kept
+    when their application is deleted, so application_id has no foreign key.
+    """
+    __tablename__ = 'application_status_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, nullable=False, index=True)
+    from_status = db.Column(db.String(50))
+    to_status = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<ApplicationStatusEvent {self.application_id}: {self.from_status} -> {self.to_status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'application_id': self.application_id,
+            'from_status': self.from_status,
+            'to_status': self.to_status,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class DailyMetric(db.Model):
+    """
+    Count of a metric on one UTC day, e.g. ('hires', 2026-10-18)
+    Metrics: applications, candidates and jobs created, and hires
+    (applications entering the 'hired' status).
+    """
+    __tablename__ = 'daily_metrics'
+
+    metric = db.Column(db.String(50), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DailyMetric {self.metric} {self.day}: {self.count}>'
+
+    def to_dict(self):
+        return {
+            'metric': self.metric,
+            'day': self.day.isoformat() if self.day else None,
+            'count': self.count
+        }
@@ -1,3 +1,4 @@
+from datetime import datetime
 from flask import Blueprint, jsonify, request
 from src.models.agency import RecruitmentAgency, Commission, db
 from src.models.application import Application
@@ -126,16 +127,15 @@ def update_commission(commission_id):
     commission = Commission.query.get_or_404(commission_id)
     data = request.json
     
+    # Update payment_date if status is being set to 'paid'
+    if data.get('status') == 'paid' and commission.status != 'paid':
+        commission.payment_date = datetime.utcnow()
+    
     # Update fields if provided
     commission.amount = data.get('amount', commission.amount)
     commission.status = data.get('status', commission.status)
     commission.transaction_id = data.get('transaction_id', commission.transaction_id)
     
-    # Update payment_date if status is being set to 'paid'
-    if data.get('status') == 'paid' and commission.status != 'paid':
-        from datetime import datetime
-        commission.payment_date = datetime.utcnow()
-    
     db.session.commit()
     return jsonify(commission.to_dict())
 
@@ -149,12 +149,11 @@ def pay_commission(commission_id):
     
     # In a real implementation, this would integrate with a payment gateway
     # For now, we'll simulate the payment process
-    data = request.json
+    data = request.json or {}
     transaction_id = data.get('transaction_id', f'TXN_{commission_id}_{int(datetime.utcnow().timestamp())}')
     
     commission.status = 'paid'
     commission.transaction_id = transaction_id
-    from datetime import datetime
     commission.payment_date = datetime.utcnow()
     
     db.session.commit()
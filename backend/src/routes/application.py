@@ -1,13 +1,30 @@
+import os
+import uuid
 from flask import Blueprint, jsonify, request
+from werkzeug.utils import secure_filename
 from src.models.application import Application, db
 from src.models.job import Job
 from src.models.candidate import Candidate
+from src.services.cv_cache import CVParseCache
+from src.services.cv_files import CVFileError, CVFileExtractor
+from src.services.application_listing import ApplicationListing
+from src.services.pagination import add_next_page_headers
 
 application_bp = Blueprint('application', __name__)
 
+# Initialize services
+cv_cache = CVParseCache()
+cv_files = CVFileExtractor()
+application_listing = ApplicationListing()
+
+CV_UPLOAD_DIR = os.getenv('CV_UPLOAD_DIR', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads', 'cvs'))
+
 @application_bp.route('/applications', methods=['GET'])
 def get_applications():
-    """Get all applications with optional filtering"""
+    """
+    Get applications with optional filtering
+    Supports fields=, expand= and after_id/limit paging (see ApplicationListing).
+    """
     job_id = request.args.get('job_id')
     candidate_id = request.args.get('candidate_id')
     status = request.args.get('status')
@@ -21,8 +38,12 @@ def get_applications():
     if status:
         query = query.filter(Application.status == status)
     
-    applications = query.all()
-    return jsonify([app.to_dict_with_details() for app in applications])
+    try:
+        applications, next_after_id = application_listing.list(query, request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = jsonify(applications)
+    return add_next_page_headers(response, next_after_id, 'application.get_applications', request.args)
 
 @application_bp.route('/applications', methods=['POST'])
 def create_application():
@@ -103,6 +124,53 @@ def update_application_status(application_id):
     
     return jsonify(application.to_dict_with_details())
 
+@application_bp.route('/applications/<int:application_id>/cv', methods=['POST'])
+def upload_application_cv(application_id):
+    """Upload the CV file (PDF, DOCX or text) of an application and parse it"""
+    application = Application.query.get_or_404(application_id)
+    
+    upload = request.files.get('cv')
+    if upload is None:
+        return jsonify({'error': 'Missing required file: cv'}), 400
+    
+    # Text extraction runs in a separate, time-limited process
+    try:
+        data = cv_files.read_upload(upload)
+        cv_text, file_format = cv_files.extract(upload.filename, data)
+    except CVFileError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    
+    processed_data = cv_cache.process_cv(cv_text)
+    
+    # Keep the original file next to the extracted data; a fresh name never
+    # overwrites the previous file, which stays in use until the commit
+    os.makedirs(CV_UPLOAD_DIR, exist_ok=True)
+    storage_path = os.path.join(
+        CV_UPLOAD_DIR, f"application-{application.id}-{uuid.uuid4().hex[:8]}-{secure_filename(upload.filename) or 'cv'}"
+    )
+    with open(storage_path, 'wb') as cv_file:
+        cv_file.write(data)
+    previous_path = (application.cv_data or {}).get('storage_path')
+    
+    application.cv_data = {
+        'original_filename': upload.filename,
+        'storage_path': storage_path,
+        'format': file_format,
+        'text_content': cv_text,
+        'parsed_data': {field: value for field, value in processed_data.items() if field != 'parsed_cv_text'}
+    }
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        os.remove(storage_path)
+        raise
+    
+    if previous_path and previous_path != storage_path and os.path.exists(previous_path):
+        os.remove(previous_path)
+    
+    return jsonify(application.to_dict_with_details())
+
 @application_bp.route('/applications/<int:application_id>', methods=['DELETE'])
 def delete_application(application_id):
     """Delete an application"""
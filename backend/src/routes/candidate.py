@@ -1,33 +1,54 @@
 from flask import Blueprint, jsonify, request
+from sqlalchemy.orm import load_only
 from src.models.candidate import Candidate, db
+from src.services.candidate_sync import CandidateSync
+from src.services.application_listing import ApplicationListing
+from src.services.pagination import add_next_page_headers, fetch_page, read_names, read_page_args
 import json
 
 candidate_bp = Blueprint('candidate', __name__)
 
+# Initialize services
+candidate_sync = CandidateSync()
+candidate_index = candidate_sync.index
+application_listing = ApplicationListing()
+
+SKILL_MATCH_MODES = ['any', 'all']
+
 @candidate_bp.route('/candidates', methods=['GET'])
 def get_candidates():
-    """Get all candidates with optional filtering"""
+    """
+    Get candidates with optional filtering
+    Pages by id when after_id or limit is given: pass the X-Next-After-Id
+    response header back as after_id for the next page. fields selects the
+    keys returned (and the columns loaded), e.g. fields=id,first_name,skills.
+    """
     email = request.args.get('email')
     skills = request.args.get('skills')  # Comma-separated skills
+    skills_match = request.args.get('skills_match', 'any')  # any or all of the skills
+    
+    if skills_match not in SKILL_MATCH_MODES:
+        return jsonify({'error': f'Invalid skills_match. Must be one of: {SKILL_MATCH_MODES}'}), 400
+    try:
+        after_id, limit = read_page_args(request.args)
+        fields = read_names(request.args, 'fields', Candidate.FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     query = Candidate.query
+    if fields:
+        query = query.options(load_only(*[getattr(Candidate, field) for field in fields]))
     
     if email:
         query = query.filter(Candidate.email.ilike(f'%{email}%'))
     
-    candidates = query.all()
-    
     # Filter by skills if provided
     if skills:
-        skill_list = [skill.strip().lower() for skill in skills.split(',')]
-        filtered_candidates = []
-        for candidate in candidates:
-            candidate_skills = [skill.lower() for skill in candidate.get_skills_list()]
-            if any(skill in candidate_skills for skill in skill_list):
-                filtered_candidates.append(candidate)
-        candidates = filtered_candidates
+        query = query.filter(candidate_index.skill_filter(skills.split(','), match_all=skills_match == 'all'))
     
-    return jsonify([candidate.to_dict() for candidate in candidates])
+    candidates, next_after_id = fetch_page(query, Candidate.id, after_id, limit)
+    response = jsonify([candidate.to_dict(fields) for candidate in candidates])
+    return add_next_page_headers(response, next_after_id, 'candidate.get_candidates', request.args)
 
 @candidate_bp.route('/candidates', methods=['POST'])
 def create_candidate():
@@ -62,6 +83,8 @@ def create_candidate():
         candidate.set_skills_list(data['skills'])
     
     db.session.add(candidate)
+    db.session.flush()
+    candidate_sync.candidate_saved(candidate, created=True)
     db.session.commit()
     return jsonify(candidate.to_dict()), 201
 
@@ -92,6 +115,7 @@ def update_candidate(candidate_id):
     if 'skills' in data and isinstance(data['skills'], list):
         candidate.set_skills_list(data['skills'])
     
+    candidate_sync.candidate_saved(candidate)
     db.session.commit()
     return jsonify(candidate.to_dict())
 
@@ -99,6 +123,7 @@ def update_candidate(candidate_id):
 def delete_candidate(candidate_id):
     """Delete a candidate"""
     candidate = Candidate.query.get_or_404(candidate_id)
+    candidate_sync.candidate_deleted(candidate)
     db.session.delete(candidate)
     db.session.commit()
     return '', 204
@@ -106,7 +131,14 @@ def delete_candidate(candidate_id):
 @candidate_bp.route('/candidates/<int:candidate_id>/applications', methods=['GET'])
 def get_candidate_applications(candidate_id):
     """Get all applications for a specific candidate"""
-    candidate = Candidate.query.get_or_404(candidate_id)
-    applications = [app.to_dict_with_details() for app in candidate.applications]
-    return jsonify(applications)
+    candidate = Candidate.query.options(load_only(Candidate.id)).get_or_404(candidate_id)
+    try:
+        applications, next_after_id = application_listing.list(
+            application_listing.for_candidate(candidate.id), request.args
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = jsonify(applications)
+    return add_next_page_headers(response, next_after_id, 'candidate.get_candidate_applications', request.args,
+                                 candidate_id=candidate.id)
 
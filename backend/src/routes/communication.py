@@ -4,6 +4,7 @@ from src.models.communication import CommunicationLog
 from src.models.agency import RecruitmentAgency
 from src.services.communication import CommunicationService, DocumentGenerator
 from src.services.ai_matcher import AIMatchingEngine
+from src.services.activity_log import ActivityLog
 from datetime import datetime
 
 communication_bp = Blueprint('communication', __name__)
@@ -12,6 +13,7 @@ communication_bp = Blueprint('communication', __name__)
 comm_service = CommunicationService()
 doc_generator = DocumentGenerator()
 ai_matcher = AIMatchingEngine()
+activity_log = ActivityLog()
 
 @communication_bp.route('/communications/email', methods=['POST'])
 def send_email():
@@ -42,6 +44,7 @@ def send_email():
             provider_response=result.get('provider_response')
         )
         db.session.add(log)
+        activity_log.record_communication(log)
         db.session.commit()
     
     return jsonify(result)
@@ -82,6 +85,7 @@ def send_template_email():
                 provider_response=result.get('provider_response')
             )
             db.session.add(log)
+            activity_log.record_communication(log)
             db.session.commit()
     
     return jsonify(result)
@@ -113,6 +117,7 @@ def send_sms():
             provider_response=result.get('provider_response')
         )
         db.session.add(log)
+        activity_log.record_communication(log)
         db.session.commit()
     
     return jsonify(result)
@@ -150,6 +155,7 @@ def send_template_sms():
                 provider_response=result.get('provider_response')
             )
             db.session.add(log)
+            activity_log.record_communication(log)
             db.session.commit()
     
     return jsonify(result)
@@ -206,6 +212,7 @@ def send_application_received():
             provider_response=email_result.get('provider_response')
         )
         db.session.add(email_log)
+        activity_log.record_communication(email_log)
     
     if sms_result and application.candidate.phone:
         sms_template = comm_service.get_sms_template('application_confirmation')
@@ -221,6 +228,7 @@ def send_application_received():
                 provider_response=sms_result.get('provider_response')
             )
             db.session.add(sms_log)
+            activity_log.record_communication(sms_log)
     
     db.session.commit()
     
@@ -280,6 +288,7 @@ def send_information_request():
             provider_response=result.get('provider_response')
         )
         db.session.add(log)
+        activity_log.record_communication(log)
         db.session.commit()
     
     return jsonify({
@@ -1,9 +1,19 @@
 from flask import Blueprint, jsonify, request
+from sqlalchemy.orm import load_only
 from src.models.job import Job, db
 from src.models.user import User
+from src.services.application_listing import ApplicationListing
+from src.services.corpus_stats import CorpusStatistics
+from src.services.match_scores import MatchScoreStore
+from src.services.pagination import add_next_page_headers
 
 job_bp = Blueprint('job', __name__)
 
+# Initialize services
+corpus_stats = CorpusStatistics()
+match_scores = MatchScoreStore(corpus_stats.matcher)
+application_listing = ApplicationListing()
+
 @job_bp.route('/jobs', methods=['GET'])
 def get_jobs():
     """Get all jobs with optional filtering"""
@@ -47,6 +57,9 @@ def create_job():
     )
     
     db.session.add(job)
+    db.session.flush()
+    corpus_stats.add_document(corpus_stats.job_terms(job.to_dict()))
+    match_scores.job_changed(job.id)
     db.session.commit()
     return jsonify(job.to_dict()), 201
 
@@ -61,6 +74,9 @@ def update_job(job_id):
     """Update an existing job"""
     job = Job.query.get_or_404(job_id)
     data = request.json
+    old_terms = corpus_stats.job_terms(job.to_dict())
+    old_job_text = match_scores.matcher.build_job_text(job.to_dict())
+    old_status = job.status
     
     # Update fields if provided
     job.title = data.get('title', job.title)
@@ -71,6 +87,10 @@ def update_job(job_id):
     job.salary_range = data.get('salary_range', job.salary_range)
     job.status = data.get('status', job.status)
     
+    corpus_stats.update_document(old_terms, corpus_stats.job_terms(job.to_dict()))
+    # Stored scores depend on the matched text and on the job being open
+    if match_scores.matcher.build_job_text(job.to_dict()) != old_job_text or job.status != old_status:
+        match_scores.job_changed(job.id)
     db.session.commit()
     return jsonify(job.to_dict())
 
@@ -78,6 +98,8 @@ def update_job(job_id):
 def delete_job(job_id):
     """Delete a job posting"""
     job = Job.query.get_or_404(job_id)
+    corpus_stats.remove_document(corpus_stats.job_terms(job.to_dict()))
+    match_scores.job_deleted(job.id)
     db.session.delete(job)
     db.session.commit()
     return '', 204
@@ -85,7 +107,11 @@ def delete_job(job_id):
 @job_bp.route('/jobs/<int:job_id>/applications', methods=['GET'])
 def get_job_applications(job_id):
     """Get all applications for a specific job"""
-    job = Job.query.get_or_404(job_id)
-    applications = [app.to_dict_with_details() for app in job.applications]
-    return jsonify(applications)
+    job = Job.query.options(load_only(Job.id)).get_or_404(job_id)
+    try:
+        applications, next_after_id = application_listing.list(application_listing.for_job(job.id), request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = jsonify(applications)
+    return add_next_page_headers(response, next_after_id, 'job.get_job_applications', request.args, job_id=job.id)
 
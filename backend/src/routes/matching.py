@@ -1,15 +1,109 @@
-from flask import Blueprint, jsonify, request
+import io
+import json
+from flask import Blueprint, Response, jsonify, request, stream_with_context, url_for
 from src.models.application import Application, db
 from src.models.job import Job
 from src.models.candidate import Candidate
+from src.models.match_job import MatchJob
 from src.services.ai_matcher import AIMatchingEngine
 from src.services.cv_processor import CVProcessor
+from src.services.cv_cache import CVParseCache
+from src.services.candidate_index import CandidateIndex
+from src.services.candidate_features import CandidateFeatureStore
+from src.services.batch_scorer import BatchScorer
+from src.services.candidate_sync import CandidateSync
+from src.services.application_scoring import ApplicationScorer
+from src.services.scoring_pool import ScoringPool
+from src.services.match_queue import MatchJobQueue
+from src.services.cv_ingestion import CVIngestion, read_ndjson
 
 matching_bp = Blueprint('matching', __name__)
 
 # Initialize services
 ai_matcher = AIMatchingEngine()
 cv_processor = CVProcessor()
+cv_cache = CVParseCache(cv_processor)
+candidate_index = CandidateIndex(ai_matcher)
+candidate_features = CandidateFeatureStore(ai_matcher)
+batch_scorer = BatchScorer(ai_matcher, candidate_features)
+candidate_sync = CandidateSync(ai_matcher)
+corpus_stats = candidate_sync.corpus
+match_scores = candidate_sync.match_scores
+open_job_profiles = match_scores.job_profiles
+scoring_pool = ScoringPool(ai_matcher)
+match_queue = MatchJobQueue(ApplicationScorer(ai_matcher, candidate_features, scoring_pool))
+cv_ingestion = CVIngestion(cv_cache, candidate_sync)
+
+KEYWORD_WEIGHTINGS = ['frequency', 'idf']
+
+def apply_keyword_weighting(job_profile, weighting):
+    """Switch a job profile to IDF keyword weighting if requested"""
+    if weighting == 'idf':
+        return ai_matcher.with_idf_weights(job_profile, corpus_stats.idf_weights(job_profile.token_set))
+    return job_profile
+
+def rank_candidates_for_job(job_profile, candidate_ids, limit=None, threshold=0.0):
+    """
+    Rank the given candidates for a job on their stored features
+    Uses the vectorized BatchScorer when NumPy/SciPy are installed and the
+    scalar AIMatchingEngine otherwise, optionally across the scoring pool.
+    Returns (ranked pairs, candidates scored).
+    """
+    if BatchScorer.is_available():
+        # One matrix for the whole ranking, even if another request swaps in a newer one
+        matrix = batch_scorer.refresh()
+        missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in matrix.positions]
+        if missing:
+            candidate_features.load(missing)
+            db.session.commit()  # Persist features profiled on the fly
+            matrix = batch_scorer.refresh()
+        
+        scored_ids = [candidate_id for candidate_id in candidate_ids if candidate_id in matrix.positions]
+        ranked = batch_scorer.rank(job_profile, scored_ids, limit=limit, threshold=threshold, matrix=matrix)
+        return ranked, len(scored_ids)
+    
+    profiles = candidate_features.load(candidate_ids)
+    db.session.commit()  # Persist features profiled on the fly
+    candidates = [(candidate_id, profiles[candidate_id]) for candidate_id in candidate_ids if candidate_id in profiles]
+    
+    # Spread large rankings over the scoring processes
+    if scoring_pool.should_use(len(candidates)):
+        ranked = scoring_pool.rank(job_profile, candidates, limit=limit, threshold=threshold)
+    else:
+        ranked = ai_matcher.rank_candidates(candidates, job_profile, limit=limit, threshold=threshold)
+    return ranked, len(profiles)
+
+def rank_jobs_for_candidate(candidate_profile, candidate_id, limit=None, threshold=0.0):
+    """
+    Rank the open jobs for a candidate
+    When the candidate's stored scores are current, jobs with current stored
+    scores are read from them; the other jobs sharing a term with the
+    candidate are scored on their cached profiles.
+    Returns (ranked pairs, jobs scored, jobs read from stored scores).
+    """
+    job_profiles = open_job_profiles.load()
+    
+    stored = []
+    current_jobs = set()
+    if match_scores.candidate_current(candidate_id):
+        # Other candidates' refreshes do not affect this candidate's stored scores
+        current_jobs = match_scores.current_jobs((job_profile.job_id for job_profile in job_profiles), check_candidates=False)
+        if current_jobs:
+            stored = match_scores.top_jobs(candidate_id, limit, threshold)
+    
+    # Only jobs sharing at least one indexed term with the candidate can be relevant
+    terms = match_scores.candidate_terms(candidate_id)
+    jobs = [
+        (job_profile.job_id, job_profile)
+        for job_profile in job_profiles
+        if job_profile.job_id not in current_jobs
+        and not (terms.isdisjoint(job_profile.token_set) and terms.isdisjoint(job_profile.technical_keywords))
+    ]
+    ranked = ai_matcher.rank_jobs(candidate_profile, jobs, limit=limit, threshold=threshold)
+    
+    if stored:
+        ranked = sorted(stored + ranked, key=lambda pair: (-pair[1], pair[0]))[:limit]
+    return ranked, len(jobs), len(current_jobs)
 
 @matching_bp.route('/match', methods=['POST'])
 def calculate_match():
@@ -21,12 +115,12 @@ def calculate_match():
     
     application = Application.query.get_or_404(data['application_id'])
     
-    # Get candidate and job data
-    candidate_data = application.candidate.to_dict()
+    # Get candidate features and job data
+    candidate_profile = candidate_features.load([application.candidate_id])[application.candidate_id]
     job_data = application.job.to_dict()
     
     # Calculate matching score
-    matching_score = ai_matcher.calculate_matching_score(candidate_data, job_data)
+    matching_score = ai_matcher.calculate_matching_score(candidate_profile, job_data)
     
     # Update application with matching score
     application.matching_score = matching_score
@@ -49,12 +143,12 @@ def calculate_detailed_match():
     
     application = Application.query.get_or_404(data['application_id'])
     
-    # Get candidate and job data
-    candidate_data = application.candidate.to_dict()
+    # Get candidate features and job data
+    candidate_profile = candidate_features.load([application.candidate_id])[application.candidate_id]
     job_data = application.job.to_dict()
     
     # Calculate detailed matching scores
-    match_details = ai_matcher.get_match_details(candidate_data, job_data)
+    match_details = ai_matcher.get_match_details(candidate_profile, job_data)
     
     # Update application with matching score
     application.matching_score = match_details['overall_score']
@@ -69,73 +163,76 @@ def calculate_detailed_match():
 
 @matching_bp.route('/match/batch', methods=['POST'])
 def calculate_batch_match():
-    """Calculate matching scores for multiple applications"""
+    """Queue matching score calculation for multiple applications"""
     data = request.json
     
     if 'application_ids' not in data or not isinstance(data['application_ids'], list):
         return jsonify({'error': 'Missing or invalid field: application_ids (must be a list)'}), 400
+    # Ids are stored as MatchJobResult.application_id, so anything but integers is refused up front
+    if any(isinstance(application_id, bool) or not isinstance(application_id, int)
+           for application_id in data['application_ids']):
+        return jsonify({'error': 'Invalid field: application_ids (must be a list of integers)'}), 400
     
-    results = []
+    # Scoring happens in the match workers; the client polls the job for progress
+    match_job = match_queue.enqueue(data['application_ids'])
     
-    for app_id in data['application_ids']:
-        try:
-            application = Application.query.get(app_id)
-            if not application:
-                results.append({
-                    'application_id': app_id,
-                    'error': 'Application not found'
-                })
-                continue
-            
-            # Get candidate and job data
-            candidate_data = application.candidate.to_dict()
-            job_data = application.job.to_dict()
-            
-            # Calculate matching score
-            matching_score = ai_matcher.calculate_matching_score(candidate_data, job_data)
-            
-            # Update application with matching score
-            application.matching_score = matching_score
-            
-            results.append({
-                'application_id': application.id,
-                'matching_score': matching_score,
-                'candidate_id': application.candidate_id,
-                'job_id': application.job_id
-            })
-            
-        except Exception as e:
-            results.append({
-                'application_id': app_id,
-                'error': str(e)
-            })
-    
-    # Commit all updates
-    db.session.commit()
+    return jsonify({
+        'job_id': match_job.id,
+        'status': match_job.status,
+        'total': match_job.total,
+        'status_url': url_for('matching.get_batch_match', job_id=match_job.id)
+    }), 202
+
+@matching_bp.route('/match/batch/<int:job_id>', methods=['GET'])
+def get_batch_match(job_id):
+    """Get progress and the results scored so far of a batch matching job"""
+    match_job = MatchJob.query.get_or_404(job_id)
+    
+    # Pass next_after back as after to fetch only new results
+    after = request.args.get('after', 0, type=int)
     
-    return jsonify({'results': results})
+    return jsonify(match_queue.job_status(match_job, after=after))
 
 @matching_bp.route('/match/job/<int:job_id>', methods=['POST'])
 def match_candidates_to_job(job_id):
     """Find and rank all candidates for a specific job"""
     job = Job.query.get_or_404(job_id)
     
-    # Get all candidates
-    candidates = Candidate.query.all()
-    
-    if not candidates:
-        return jsonify({'message': 'No candidates found', 'matches': []})
-    
-    job_data = job.to_dict()
-    matches = []
-    
-    for candidate in candidates:
-        candidate_data = candidate.to_dict()
+    # Get threshold, optional result limit and keyword weighting from request
+    threshold = request.args.get('threshold', 0.6, type=float)
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    weighting = request.args.get('weighting', 'frequency')
+    if weighting not in KEYWORD_WEIGHTINGS:
+        return jsonify({'error': f'Invalid weighting. Must be one of: {KEYWORD_WEIGHTINGS}'}), 400
+    total_candidates = Candidate.query.count()
+    
+    # Read the materialized scores when they are up to date (IDF weighting is always computed)
+    stored_scores = weighting == 'frequency' and job.id in match_scores.current_jobs([job.id])
+    if stored_scores:
+        ranked = match_scores.top_candidates(job.id, limit, threshold)
+        candidates_scored = match_scores.count_for_job(job.id)
+    else:
+        job_profile = ai_matcher.get_job_profile(job.to_dict())
         
-        # Calculate matching score
-        matching_score = ai_matcher.calculate_matching_score(candidate_data, job_data)
+        # Only candidates sharing at least one term with the job can be relevant
+        candidate_ids = candidate_index.find_candidates_for_job(job_profile)
+        if not candidate_ids:
+            return jsonify({'message': 'No candidates found', 'matches': []})
+        job_profile = apply_keyword_weighting(job_profile, weighting)
         
-        matches.append({
+        # Rank on stored features; CV text is never loaded
+        ranked, candidates_scored = rank_candidates_for_job(job_profile, candidate_ids, limit, threshold)
+    
+    candidates = {
+        candidate.id: candidate
+        for candidate in candidate_index.load_candidates([candidate_id for candidate_id, _ in ranked], with_cv_text=False)
+    }
+    qualified_matches = []
+    for candidate_id, matching_score in ranked:
+        candidate = candidates[candidate_id]
+        qualified_matches.append({
             'candidate_id': candidate.id,
             'candidate_name': f"{candidate.first_name} {candidate.last_name}",
             'candidate_email': candidate.email,
@@ -144,19 +241,121 @@ def match_candidates_to_job(job_id):
             'candidate_experience': candidate.total_experience_years
         })
     
-    # Sort by matching score (highest first)
-    matches.sort(key=lambda x: x['matching_score'], reverse=True)
-    
-    # Get threshold from request or use default
-    threshold = request.args.get('threshold', 0.6, type=float)
-    qualified_matches = [match for match in matches if match['matching_score'] >= threshold]
-    
     return jsonify({
         'job_id': job_id,
         'job_title': job.title,
-        'total_candidates': len(candidates),
+        'total_candidates': total_candidates,
+        'candidates_scored': candidates_scored,
         'qualified_candidates': len(qualified_matches),
         'threshold': threshold,
+        'limit': limit,
+        'weighting': weighting,
+        'stored_scores': stored_scores,
+        'matches': qualified_matches
+    })
+
+@matching_bp.route('/match/jobs/open', methods=['POST'])
+def match_candidates_to_open_jobs():
+    """Rank candidates for every open job"""
+    threshold = request.args.get('threshold', 0.6, type=float)
+    limit = request.args.get('limit', 10, type=int)
+    if limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    weighting = request.args.get('weighting', 'frequency')
+    if weighting not in KEYWORD_WEIGHTINGS:
+        return jsonify({'error': f'Invalid weighting. Must be one of: {KEYWORD_WEIGHTINGS}'}), 400
+    
+    jobs = Job.query.filter_by(status='open').order_by(Job.id).all()
+    current_jobs = match_scores.current_jobs(job.id for job in jobs) if weighting == 'frequency' else set()
+    
+    rankings = []
+    for job in jobs:
+        if job.id in current_jobs:
+            ranked = match_scores.top_candidates(job.id, limit, threshold)
+            rankings.append((job, ranked, match_scores.count_for_job(job.id)))
+            continue
+        job_profile = apply_keyword_weighting(ai_matcher.get_job_profile(job.to_dict()), weighting)
+        candidate_ids = candidate_index.find_candidates_for_job(job_profile)
+        ranked, candidates_scored = rank_candidates_for_job(job_profile, candidate_ids, limit, threshold)
+        rankings.append((job, ranked, candidates_scored))
+    
+    # Load display fields once for every candidate that made any shortlist
+    shortlisted_ids = sorted({candidate_id for _, ranked, _ in rankings for candidate_id, _ in ranked})
+    candidates = {
+        candidate.id: candidate
+        for candidate in candidate_index.load_candidates(shortlisted_ids, with_cv_text=False)
+    }
+    
+    results = []
+    for job, ranked, candidates_scored in rankings:
+        results.append({
+            'job_id': job.id,
+            'job_title': job.title,
+            'candidates_scored': candidates_scored,
+            'stored_scores': job.id in current_jobs,
+            'matches': [{
+                'candidate_id': candidate_id,
+                'candidate_name': f"{candidates[candidate_id].first_name} {candidates[candidate_id].last_name}",
+                'matching_score': matching_score
+            } for candidate_id, matching_score in ranked]
+        })
+    
+    return jsonify({
+        'total_jobs': len(jobs),
+        'threshold': threshold,
+        'limit': limit,
+        'weighting': weighting,
+        'jobs': results
+    })
+
+@matching_bp.route('/match/candidate/<int:candidate_id>', methods=['POST'])
+def match_jobs_to_candidate(candidate_id):
+    """Find and rank the open jobs for a specific candidate"""
+    candidates = candidate_index.load_candidates([candidate_id], with_cv_text=False)
+    if not candidates:
+        return jsonify({'error': 'Candidate not found'}), 404
+    candidate = candidates[0]
+    
+    threshold = request.args.get('threshold', 0.6, type=float)
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    
+    candidate_profile = candidate_features.load([candidate_id])[candidate_id]
+    db.session.commit()  # Persist features profiled on the fly
+    
+    ranked, jobs_scored, stored_jobs = rank_jobs_for_candidate(candidate_profile, candidate_id, limit, threshold)
+    
+    # Display fields only; the job text is not needed
+    ranked_ids = [job_id for job_id, _ in ranked]
+    jobs = {}
+    for start in range(0, len(ranked_ids), open_job_profiles.CHUNK_SIZE):
+        jobs.update(
+            (job.id, job)
+            for job in db.session.query(Job.id, Job.title, Job.location, Job.salary_range).filter(
+                Job.id.in_(ranked_ids[start:start + open_job_profiles.CHUNK_SIZE])
+            )
+        )
+    qualified_matches = []
+    for job_id, matching_score in ranked:
+        job = jobs[job_id]
+        qualified_matches.append({
+            'job_id': job.id,
+            'job_title': job.title,
+            'job_location': job.location,
+            'salary_range': job.salary_range,
+            'matching_score': matching_score
+        })
+    
+    return jsonify({
+        'candidate_id': candidate.id,
+        'candidate_name': f"{candidate.first_name} {candidate.last_name}",
+        'total_jobs': Job.query.filter_by(status='open').count(),
+        'jobs_scored': jobs_scored,
+        'stored_score_jobs': stored_jobs,
+        'qualified_jobs': len(qualified_matches),
+        'threshold': threshold,
+        'limit': limit,
         'matches': qualified_matches
     })
 
@@ -170,8 +369,9 @@ def process_cv_text():
     
     cv_text = data['cv_text']
     
-    # Process CV and extract information
-    processed_data = cv_processor.process_cv(cv_text)
+    # Process CV and extract information (reusing the result for a CV seen before)
+    processed_data = cv_cache.process_cv(cv_text)
+    db.session.commit()
     
     return jsonify({
         'processed_data': processed_data,
@@ -188,8 +388,8 @@ def process_cv_and_create_candidate():
     
     cv_text = data['cv_text']
     
-    # Process CV and extract information
-    processed_data = cv_processor.process_cv(cv_text)
+    # Process CV and extract information (reusing the result for a CV seen before)
+    processed_data = cv_cache.process_cv(cv_text)
     
     # Check if required fields are present
     if not processed_data.get('email'):
@@ -221,6 +421,8 @@ def process_cv_and_create_candidate():
         candidate.set_skills_list(processed_data['skills'])
     
     db.session.add(candidate)
+    db.session.flush()
+    candidate_sync.candidate_saved(candidate, created=True)
     db.session.commit()
     
     return jsonify({
@@ -229,3 +431,50 @@ def process_cv_and_create_candidate():
         'processed_data': processed_data
     }), 201
 
+NDJSON_MIMETYPES = ['application/x-ndjson', 'application/ndjson', 'application/jsonl']
+
+def read_uploaded_cvs(files):
+    """Turn uploaded files into ingestion records: NDJSON files hold many CVs, other files one CV each"""
+    number = 0
+    for upload in files:
+        filename = upload.filename or ''
+        if filename.endswith(('.ndjson', '.jsonl')):
+            for record in read_ndjson(upload.stream, start=number):
+                record.setdefault('file', filename)
+                number += 1
+                yield record
+            continue
+        
+        try:
+            cv_text = upload.read().decode('utf-8')
+            record = {'cv_text': cv_text, 'cv_file_path': filename or None}
+        except UnicodeDecodeError:
+            record = {'error': 'File is not UTF-8 text'}
+        record.update(record=number, file=filename)
+        number += 1
+        yield record
+
+@matching_bp.route('/process-cv-and-create-candidate/bulk', methods=['POST'])
+def bulk_process_cvs_and_create_candidates():
+    """
+    Create candidates from many CVs, streaming one NDJSON result per CV
+    Accepts an NDJSON body (one {"cv_text": ..., "cv_file_path": ...} object
+    per line) or a multipart upload of CV text files and NDJSON files.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        records = read_ndjson(io.BufferedReader(request.stream))
+    elif request.mimetype == 'multipart/form-data':
+        records = read_uploaded_cvs(
+            upload for field in request.files for upload in request.files.getlist(field)
+        )
+    else:
+        return jsonify({'error': 'Send CVs as application/x-ndjson or multipart/form-data'}), 415
+    
+    def generate():
+        summary = {'created': 0, 'duplicate': 0, 'error': 0}
+        for result in cv_ingestion.ingest(records):
+            summary[result['status']] += 1
+            yield json.dumps(result) + '\n'
+        yield json.dumps({'summary': summary}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -1,104 +1,49 @@
-from flask import Blueprint, jsonify
-from src.models.application import Application
-from src.models.job import Job
-from src.models.candidate import Candidate
-from src.models.agency import RecruitmentAgency, RecruitmentAgencyCommission
-from datetime import datetime, timedelta
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from src.services.activity_log import ActivityLog
+from src.services.metric_counters import MetricCounters
+from src.services.metric_rollups import MetricRollups
+from src.services.overview_stats import OverviewStats
+from src.services.pagination import MAX_PAGE_SIZE, add_next_page_headers, read_names
 
 overview_bp = Blueprint('overview', __name__)
 
+# Initialize services
+metric_counters = MetricCounters()
+metric_rollups = MetricRollups()
+overview_stats = OverviewStats(metric_counters, metric_rollups)
+activity_log = ActivityLog()
+
 @overview_bp.route('/stats', methods=['GET'])
 def get_overview_stats():
-    """Endpoint for dashboard summary statistics"""
-    now = datetime.utcnow()
-    time_ranges = {
-        'week': now - timedelta(days=7),
-        'month': now - timedelta(days=30),
-        'quarter': now - timedelta(days=90)
-    }
-
-    stats = {
-        'jobs': {
-            'total': Job.query.count(),
-            'active': Job.query.filter_by(status='open').count(),
-            'new_last_week': Job.query.filter(
-                Job.created_at >= time_ranges['week']
-            ).count()
-        },
-        'candidates': {
-            'total': Candidate.query.count(),
-            'new_last_week': Candidate.query.filter(
-                Candidate.created_at >= time_ranges['week']
-            ).count(),
-            'active': Application.query.distinct(
-                Application.candidate_id
-            ).count()
-        },
-        'applications': {
-            'total': Application.query.count(),
-            'by_status': {
-                status: Application.query.filter_by(
-                    status=status
-                ).count() 
-                for status in ['applied', 'reviewed', 'interviewed', 'hired', 'rejected']
-            },
-            'hires': {
-                'week': Application.query.filter(
-                    Application.status == 'hired',
-                    Application.updated_at >= time_ranges['week']
-                ).count(),
-                'month': Application.query.filter(
-                    Application.status == 'hired',
-                    Application.updated_at >= time_ranges['month']
-                ).count()
-            }
-        },
-        'financials': {
-            'pending_commissions': RecruitmentAgencyCommission.query.filter_by(
-                status='pending'
-            ).count(),
-            'total_payouts': sum(
-                c.amount for c in RecruitmentAgencyCommission.query.filter_by(
-                    status='paid'
-                ).all()
-            ) or 0
-        }
-    }
-    return jsonify(stats)
+    """Endpoint for dashboard summary statistics (cached for up to OVERVIEW_STATS_TTL seconds)"""
+    return jsonify(overview_stats.get())
 
 @overview_bp.route('/activity', methods=['GET'])
 def get_recent_activity():
-    """Endpoint for recent system activity"""
-    activities = []
-    
-    # Recent applications
-    recent_apps = Application.query.order_by(
-        Application.updated_at.desc()
-    ).limit(5).all()
-    
-    for app in recent_apps:
-        activities.append({
-            'type': 'application',
-            'id': app.id,
-            'candidate': app.candidate.name,
-            'job': app.job.title,
-            'status': app.status,
-            'time': app.updated_at.isoformat()
-        })
-    
-    # Recent commissions
-    recent_commissions = RecruitmentAgencyCommission.query.order_by(
-        RecruitmentAgencyCommission.updated_at.desc()
-    ).limit(3).all()
-    
-    for comm in recent_commissions:
-        activities.append({
-            'type': 'commission',
-            'id': comm.id,
-            'amount': comm.amount,
-            'agency': comm.agency.name,
-            'status': comm.status,
-            'time': comm.updated_at.isoformat()
-        })
-    
-    return jsonify({'activities': activities})
+    """Endpoint for recent system activity, newest first (page with the before cursor)"""
+    limit = request.args.get('limit', ActivityLog.FEED_SIZE, type=int)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    try:
+        types = read_names(request.args, 'type', ActivityLog.TYPES)
+        events, next_before = activity_log.feed(request.args.get('before'), limit, types)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = jsonify({
+        'activities': [activity.to_dict() for activity in events],
+        'next_before': next_before
+    })
+    return add_next_page_headers(response, next_before, 'overview.get_recent_activity', request.args, cursor='before')
+
+@overview_bp.route('/activity/stream', methods=['GET'])
+def stream_activity():
+    """Server-sent event stream of new activity (resumes after the Last-Event-ID header)"""
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is None:
+        last_event_id = request.args.get('after_id', type=int)
+    return Response(
+        stream_with_context(activity_log.stream(last_event_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -0,0 +1,183 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, event, func, or_
+from sqlalchemy.orm import load_only
+from src.models.activity import ActivityEvent
+from src.models.agency import Commission, RecruitmentAgency
+from src.models.application import Application, db
+from src.models.candidate import Candidate
+from src.models.job import Job
+from src.services.metric_counters import UNKNOWN, column_change
+from src.services.pagination import MAX_PAGE_SIZE
+
+class ActivityLog:
+    """
+    Activity feed of application, commission and communication events
+    Applications and commissions append an event whenever one is created,
+    changes status or is deleted, from the same after_flush hook as the metric
+    counters, so every write path is covered. Communication routes append
+    theirs with record_communication. The feed is a single query on the
+    (created_at DESC, id DESC) index, paged with an opaque before cursor, and
+    stream() tails new events as server-sent events.
+    """
+
+    TYPES = ['application', 'commission', 'communication']
+
+    # Events per feed page when no limit is given
+    FEED_SIZE = 20
+
+    # Seconds between checks for new events while streaming
+    POLL_INTERVAL = float(os.getenv('ACTIVITY_STREAM_POLL_INTERVAL', '1'))
+
+    # Seconds a stream stays open, below gunicorn's default 30 s worker
+    # timeout; EventSource clients reconnect with Last-Event-ID
+    STREAM_SECONDS = float(os.getenv('ACTIVITY_STREAM_SECONDS', '25'))
+
+    # Seconds of silence before a keep-alive comment is sent
+    KEEPALIVE_SECONDS = 15
+
+    def __init__(self, session=None):
+        session = session or db.session
+        # Registered once per process however many instances exist
+        if not event.contains(session, 'after_flush', record_flush):
+            event.listen(session, 'after_flush', record_flush)
+
+    def record_communication(self, log) -> None:
+        """Append the event of a communication log added to the session (caller commits)"""
+        # Assigns log.id
+        db.session.flush()
+        db.session.add(ActivityEvent(
+            type='communication',
+            action='sent',
+            entity_id=log.id,
+            application_id=log.application_id,
+            status=log.status,
+            details=json.dumps({'channel': log.type, 'recipient': log.recipient, 'subject': log.subject})
+        ))
+
+    def feed(self, before: Optional[str] = None, limit: Optional[int] = None,
+             types: Optional[List[str]] = None) -> Tuple[List[ActivityEvent], Optional[str]]:
+        """
+        Events newest first, starting after the before cursor
+        Returns the events and the cursor of the next page (None on the last
+        page); raises ValueError for a malformed cursor.
+        """
+        limit = limit or self.FEED_SIZE
+        query = ActivityEvent.query
+        if types:
+            query = query.filter(ActivityEvent.type.in_(types))
+        if before:
+            created_at, event_id = self.parse_cursor(before)
+            query = query.filter(or_(
+                ActivityEvent.created_at < created_at,
+                and_(ActivityEvent.created_at == created_at, ActivityEvent.id < event_id)
+            ))
+
+        # One extra event tells whether there is a next page
+        events = query.order_by(ActivityEvent.created_at.desc(), ActivityEvent.id.desc()).limit(limit + 1).all()
+        if len(events) > limit:
+            return events[:limit], self.cursor(events[limit - 1])
+        return events, None
+
+    def cursor(self, activity: ActivityEvent) -> str:
+        """Cursor of the events older than activity"""
+        return f'{activity.created_at.isoformat()}_{activity.id}'
+
+    def parse_cursor(self, value: str) -> Tuple[datetime, int]:
+        """created_at and id of a cursor; raises ValueError"""
+        created_at, _, event_id = value.rpartition('_')
+        try:
+            return datetime.fromisoformat(created_at), int(event_id)
+        except ValueError:
+            raise ValueError('Invalid before cursor')
+
+    def stream(self, last_event_id: Optional[int] = None) -> Iterator[str]:
+        """
+        Server-sent events of the activity appended after last_event_id
+        Without last_event_id only events appended from now on are sent. The
+        stream ends after STREAM_SECONDS; the session is released between
+        checks so an open stream holds no database connection while idle, but
+        it holds its worker thread throughout (see the deployment guide).
+        """
+        if last_event_id is None:
+            last_event_id = db.session.query(func.max(ActivityEvent.id)).scalar() or 0
+            db.session.remove()
+
+        deadline = time.monotonic() + self.STREAM_SECONDS
+        last_sent = time.monotonic()
+        yield f'retry: {int(self.POLL_INTERVAL * 1000) + 1000}\n\n'
+        while time.monotonic() < deadline:
+            events = [
+                activity.to_dict()
+                for activity in ActivityEvent.query.filter(ActivityEvent.id > last_event_id)
+                .order_by(ActivityEvent.id).limit(MAX_PAGE_SIZE)
+            ]
+            db.session.remove()
+
+            for activity in events:
+                last_event_id = activity['event_id']
+                yield f'id: {last_event_id}\nevent: activity\ndata: {json.dumps(activity)}\n\n'
+            if events:
+                last_sent = time.monotonic()
+                continue
+
+            if time.monotonic() - last_sent >= self.KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield ': keep-alive\n\n'
+            time.sleep(self.POLL_INTERVAL)
+
+def _details(session, instance, old_status) -> Dict:
+    """Display fields of an application or commission event"""
+    details = {}
+    if type(instance) is Application:
+        candidate = session.get(Candidate, instance.candidate_id,
+                                options=[load_only(Candidate.first_name, Candidate.last_name)])
+        job = session.get(Job, instance.job_id, options=[load_only(Job.title)])
+        details['candidate'] = f'{candidate.first_name} {candidate.last_name}' if candidate else None
+        details['job'] = job.title if job else None
+    else:
+        agency = session.get(RecruitmentAgency, instance.agency_id, options=[load_only(RecruitmentAgency.name)])
+        details['amount'] = instance.amount
+        details['agency'] = agency.name if agency else None
+    if old_status is not None:
+        details['from_status'] = old_status
+    return details
+
+def record_flush(session, flush_context) -> None:
+    """Append the activity events of a flush"""
+    now = datetime.utcnow()
+    changes = []
+
+    for instance in session.new:
+        if type(instance) in (Application, Commission):
+            changes.append((instance, 'created', None, instance.status))
+
+    for instance in session.dirty:
+        if type(instance) not in (Application, Commission) or instance in session.deleted:
+            continue
+        old_status, new_status = column_change(instance, 'status')
+        if UNKNOWN not in (old_status, new_status) and old_status != new_status:
+            changes.append((instance, 'status_changed', old_status, new_status))
+
+    for instance in session.deleted:
+        if type(instance) in (Application, Commission):
+            status = column_change(instance, 'status')[0]
+            changes.append((instance, 'deleted', None, status if status is not UNKNOWN else None))
+
+    if not changes:
+        return
+    session.connection().execute(ActivityEvent.__table__.insert(), [
+        {
+            'type': 'application' if type(instance) is Application else 'commission',
+            'action': action,
+            'entity_id': instance.id,
+            'application_id': instance.id if type(instance) is Application else instance.application_id,
+            'status': status,
+            'details': json.dumps(_details(session, instance, old_status)),
+            'created_at': now
+        }
+        for instance, action, old_status, status in changes
+    ])
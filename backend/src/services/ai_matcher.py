@@ -1,12 +1,93 @@
+import os
 import re
 import math
-from typing import Dict, List, Tuple, Optional
-from collections import Counter
+import copy
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
+from collections import Counter, OrderedDict
 import json
+import threading
+from src.services.skill_taxonomy import SKILL_KEYWORDS, skill_matcher
+from src.services.text_stream import TEXT_CHUNK_SIZE, iter_text_chunks
+from src.services.tokenizer import tokenizer
+
+class JobProfile:
+    """Matching features of a job, computed once and reused for every candidate"""
+    
+    def __init__(self, job_id: Optional[int], updated_at: Optional[str], tokens: List[str],
+                 required_experience: Optional[float], required_education_level: int,
+                 technical_keywords: List[str]):
+        self.job_id = job_id
+        self.updated_at = updated_at
+        self.tokens = tokens
+        self.token_counts = Counter(tokens)
+        self.token_set = frozenset(self.token_counts)
+        self.required_experience = required_experience  # None if the job states no requirement
+        self.required_education_level = required_education_level  # 0 if the job states no requirement
+        self.technical_keywords = technical_keywords
+        self.idf_weights = None  # Set by AIMatchingEngine.with_idf_weights
+        self.idf_total = 0.0
+    
+    def __repr__(self):
+        return f'<JobProfile {self.job_id}: {len(self.tokens)} tokens>'
+
+class CandidateProfile:
+    """Matching features of a candidate, computed once when the candidate changes"""
+    
+    # Bump when the stored feature format or its derivation changes
+    VERSION = 2
+    
+    def __init__(self, token_counts: Counter, skills: List[str], education_level: Optional[int],
+                 experience: Optional[float], skill_keywords: frozenset = frozenset()):
+        self.token_counts = token_counts
+        self.skills = skills  # Lowercased, in the candidate's order
+        self.skill_keywords = skill_keywords  # Technical keywords found in the skills
+        self.education_level = education_level  # None if no education is recorded
+        self.experience = experience
+    
+    def __repr__(self):
+        return f'<CandidateProfile {len(self.token_counts)} terms, {len(self.skills)} skills>'
+    
+    def same_features(self, other: 'CandidateProfile') -> bool:
+        """Whether another profile scores identically against every job"""
+        return (
+            self.token_counts == other.token_counts and
+            self.skills == other.skills and
+            self.skill_keywords == other.skill_keywords and
+            self.education_level == other.education_level and
+            self.experience == other.experience
+        )
+    
+    def to_json(self) -> str:
+        """Serialize to compact JSON for storage"""
+        return json.dumps({
+            'v': self.VERSION,
+            't': self.token_counts,
+            's': self.skills,
+            'e': self.education_level,
+            'x': self.experience,
+            'k': sorted(self.skill_keywords)
+        }, separators=(',', ':'))
+    
+    @classmethod
+    def from_json(cls, data: str) -> Optional['CandidateProfile']:
+        """Deserialize stored features (None if stored by another version)"""
+        values = json.loads(data)
+        if values.get('v') != cls.VERSION:
+            return None
+        return cls(Counter(values['t']), values['s'], values['e'], values['x'], frozenset(values['k']))
 
 class AIMatchingEngine:
     """AI-powered matching engine for scoring CV-to-job compatibility"""
     
+    # Number of job profiles kept by get_job_profile; ranking jobs for a
+    # candidate only rebuilds profiles when this is below the open job count
+    JOB_PROFILE_CACHE_SIZE = int(os.getenv('JOB_PROFILE_CACHE_SIZE', '8192'))
+    
+    # Bump whenever a change to scoring changes the scores it produces, so that
+    # stored match scores computed by the old rules are recomputed
+    SCORING_VERSION = 1
+    
     def __init__(self):
         # Weights for different matching criteria
         self.weights = {
@@ -25,63 +106,200 @@ class AIMatchingEngine:
             'lead': (10, float('inf')),
             'principal': (12, float('inf'))
         }
-    
-    def preprocess_text(self, text: str) -> List[str]:
-        """Preprocess text by cleaning and tokenizing"""
-        # Handle None or empty text
-        if not text:
-            return []
         
-        # Convert to lowercase
-        text = text.lower()
+        # Technical skills looked for in job requirements, shared with CVProcessor
+        self.technical_keywords = list(SKILL_KEYWORDS)
+        self.skill_matcher = skill_matcher
+        
+        # Shared tokenizer; job texts are memoized as they are tokenized repeatedly
+        self.tokenizer = tokenizer
+        
+        # Patterns stating a required number of years of experience, in priority order
+        self.experience_patterns = [
+            re.compile(pattern, re.IGNORECASE) for pattern in [
+                r'(\d+)\+?\s*years?\s*of\s*experience',
+                r'(\d+)\+?\s*years?\s*experience',
+                r'minimum\s*(\d+)\s*years?',
+                r'at\s*least\s*(\d+)\s*years?',
+                r'(\d+)\+?\s*yrs?\s*experience'
+            ]
+        ]
         
-        # Remove special characters and extra whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+        # Education level hierarchy
+        self.education_levels = {
+            'phd': 5, 'doctorate': 5, 'ph.d.': 5,
+            'master': 4, 'mba': 4, 'm.s.': 4, 'm.a.': 4,
+            'bachelor': 3, 'b.s.': 3, 'b.a.': 3,
+            'associate': 2,
+            'diploma': 1, 'certificate': 1
+        }
         
-        # Split into words
-        words = text.split()
+        # Job profiles keyed by (job id, updated_at), most recently used last
+        self._job_profiles = OrderedDict()
+        self._job_profiles_lock = threading.Lock()
+    
+    def preprocess_text(self, text: str) -> List[str]:
+        """Preprocess text by cleaning and tokenizing (lowercase words of 3+ characters, no stop words)"""
+        return self.tokenizer.tokenize(text)
+    
+    def preprocess_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        preprocess_text for a text given in chunks, with memory bounded by the chunk size
+        Each chunk is only tokenized up to its last whitespace; the rest is
+        carried over, so words cut between chunks are rejoined.
+        """
+        carried = []
+        for chunk in chunks:
+            end = len(chunk)
+            while end > 0 and not chunk[end - 1].isspace():
+                end -= 1
+            if end == 0:
+                carried.append(chunk)  # Still inside one word
+                continue
+            
+            carried.append(chunk[:end])
+            yield from self.preprocess_text(''.join(carried))
+            carried = [chunk[end:]]
         
-        # Remove common stop words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-            'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before', 'after',
-            'above', 'below', 'between', 'among', 'is', 'are', 'was', 'were', 'be', 'been',
-            'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
-        }
+        yield from self.preprocess_text(''.join(carried))
+    
+    def count_tokens(self, text: Optional[str]) -> Counter:
+        """Token frequencies of a text; large texts are tokenized in chunks"""
+        if text and len(text) > TEXT_CHUNK_SIZE:
+            return Counter(self.preprocess_chunks(iter_text_chunks(text)))
+        return Counter(self.preprocess_text(text))
+    
+    def build_job_text(self, job_data: Dict) -> str:
+        """Combine the job fields that matching is performed against"""
+        job_requirements = job_data.get('requirements', '')
+        job_description = job_data.get('description', '')
+        return f"{job_requirements} {job_description}"
+    
+    def build_job_profile(self, job_data: Dict) -> JobProfile:
+        """Parse a job once into the features every criterion is scored against"""
+        return self.build_job_profile_from_text(
+            self.build_job_text(job_data),
+            job_id=job_data.get('id'),
+            updated_at=job_data.get('updated_at')
+        )
+    
+    def build_job_profile_from_text(self, job_text: str, job_id: Optional[int] = None,
+                                    updated_at: Optional[str] = None) -> JobProfile:
+        """Parse raw job text into a JobProfile"""
+        tokens = self.tokenizer.tokenize_cached(job_text)
+        
+        return JobProfile(
+            job_id=job_id,
+            updated_at=updated_at,
+            tokens=tokens,
+            required_experience=self.extract_required_experience(job_text),
+            required_education_level=self.extract_education_level(job_text),
+            technical_keywords=self.skill_matcher.find(job_text)
+        )
+    
+    def get_job_profile(self, job_data) -> JobProfile:
+        """Return the profile of a job, reusing it while the job is unchanged"""
+        if isinstance(job_data, JobProfile):
+            return job_data
+        
+        if job_data.get('id') is None:
+            return self.build_job_profile(job_data)
+        
+        profile = self.cached_job_profile(job_data['id'], job_data.get('updated_at'))
+        if profile is not None:
+            return profile
+        
+        key = (job_data['id'], job_data.get('updated_at'))
+        profile = self.build_job_profile(job_data)
+        with self._job_profiles_lock:
+            self._job_profiles[key] = profile
+            while len(self._job_profiles) > self.JOB_PROFILE_CACHE_SIZE:
+                self._job_profiles.popitem(last=False)
+        return profile
+    
+    def cached_job_profile(self, job_id: int, updated_at: Optional[str]) -> Optional[JobProfile]:
+        """The kept profile of a job version (updated_at in ISO format), or None"""
+        key = (job_id, updated_at)
+        with self._job_profiles_lock:
+            profile = self._job_profiles.get(key)
+            if profile is not None:
+                self._job_profiles.move_to_end(key)
+            return profile
+    
+    def _as_job_profile(self, job_requirements) -> JobProfile:
+        """Accept either raw job text or a precomputed JobProfile"""
+        if isinstance(job_requirements, JobProfile):
+            return job_requirements
+        return self.build_job_profile_from_text(job_requirements)
+    
+    def build_candidate_profile(self, candidate_data: Dict) -> CandidateProfile:
+        """Parse a candidate once into the features every criterion is scored against"""
+        candidate_education = candidate_data.get('education')
+        skills = [skill.lower() for skill in candidate_data.get('skills') or []]
+        return CandidateProfile(
+            token_counts=self.count_tokens(candidate_data.get('parsed_cv_text', '')),
+            skills=skills,
+            education_level=self.extract_education_level(candidate_education) if candidate_education else None,
+            experience=candidate_data.get('total_experience_years'),
+            skill_keywords=frozenset(self.skill_matcher.find_in_skills(skills))
+        )
+    
+    def extract_required_experience(self, job_text: str) -> Optional[float]:
+        """Find the years of experience a job asks for, or None if it states none"""
+        for pattern in self.experience_patterns:
+            match = pattern.search(job_text)
+            if match:
+                return float(match.group(1))
         
-        return [word for word in words if word not in stop_words and len(word) > 2]
+        # Check for experience level keywords
+        job_lower = job_text.lower()
+        if any(level in job_lower for level in ['entry', 'junior', 'graduate']):
+            return 1.0
+        elif any(level in job_lower for level in ['mid', 'intermediate']):
+            return 4.0
+        elif any(level in job_lower for level in ['senior', 'lead']):
+            return 8.0
+        elif any(level in job_lower for level in ['principal', 'architect']):
+            return 12.0
+        return None
+    
+    def extract_education_level(self, text: str) -> int:
+        """Find the highest education level mentioned in text (0 if none)"""
+        text_lower = text.lower()
+        education_level = 0
+        for edu_type, level in self.education_levels.items():
+            if edu_type in text_lower:
+                education_level = max(education_level, level)
+        return education_level
     
-    def calculate_skills_match(self, candidate_skills: List[str], job_requirements: str) -> float:
-        """Calculate skills matching score"""
+    def calculate_skills_match(self, candidate_skills: List[str], job_requirements,
+                               skill_keywords: Optional[frozenset] = None) -> float:
+        """
+        Calculate skills matching score against job text or a JobProfile
+        skill_keywords are the technical keywords found in the candidate's
+        skills, when already known (e.g. from a CandidateProfile).
+        """
         if not candidate_skills:
             return 0.0
         
-        job_words = self.preprocess_text(job_requirements)
-        job_skills_lower = [skill.lower() for skill in job_words]
+        job_profile = self._as_job_profile(job_requirements)
         candidate_skills_lower = [skill.lower() for skill in candidate_skills]
+        if skill_keywords is None:
+            skill_keywords = frozenset(self.skill_matcher.find_in_skills(candidate_skills_lower))
         
         # Count matching skills
         matches = 0
         total_job_skills = 0
         
-        # Extract technical skills from job requirements
-        technical_keywords = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'django', 'flask',
-            'spring', 'node.js', 'mysql', 'postgresql', 'mongodb', 'aws', 'azure', 'docker',
-            'kubernetes', 'git', 'machine learning', 'data science', 'ai', 'sql', 'html', 'css'
-        ]
-        
-        for keyword in technical_keywords:
-            if keyword in job_skills_lower:
-                total_job_skills += 1
-                if any(keyword in candidate_skill for candidate_skill in candidate_skills_lower):
-                    matches += 1
+        # Technical skills found in job requirements
+        for keyword in job_profile.technical_keywords:
+            total_job_skills += 1
+            if keyword in skill_keywords:
+                matches += 1
         
         # Also check for direct skill matches
         for candidate_skill in candidate_skills_lower:
-            if candidate_skill in job_skills_lower:
+            if candidate_skill in job_profile.token_set:
                 matches += 1
                 total_job_skills += 1
         
@@ -90,40 +308,17 @@ class AIMatchingEngine:
         
         return min(matches / total_job_skills, 1.0)
     
-    def calculate_experience_match(self, candidate_experience: Optional[float], job_requirements: str) -> float:
-        """Calculate experience matching score"""
+    def calculate_experience_match(self, candidate_experience: Optional[float], job_requirements) -> float:
+        """Calculate experience matching score against job text or a JobProfile"""
         if candidate_experience is None:
             return 0.5  # Neutral score if experience not specified
         
-        # Extract experience requirements from job description
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*of\s*experience',
-            r'(\d+)\+?\s*years?\s*experience',
-            r'minimum\s*(\d+)\s*years?',
-            r'at\s*least\s*(\d+)\s*years?',
-            r'(\d+)\+?\s*yrs?\s*experience'
-        ]
-        
-        required_experience = None
-        for pattern in experience_patterns:
-            match = re.search(pattern, job_requirements, re.IGNORECASE)
-            if match:
-                required_experience = float(match.group(1))
-                break
-        
-        # Check for experience level keywords
-        job_lower = job_requirements.lower()
+        required_experience = self._as_job_profile(job_requirements).required_experience
         if required_experience is None:
-            if any(level in job_lower for level in ['entry', 'junior', 'graduate']):
-                required_experience = 1.0
-            elif any(level in job_lower for level in ['mid', 'intermediate']):
-                required_experience = 4.0
-            elif any(level in job_lower for level in ['senior', 'lead']):
-                required_experience = 8.0
-            elif any(level in job_lower for level in ['principal', 'architect']):
-                required_experience = 12.0
-            else:
-                return 0.7  # Default good score if no experience requirement found
+            return 0.7  # Default good score if no experience requirement found
+        
+        if required_experience == 0:
+            return 1.0  # Any experience meets a requirement of zero years
         
         # Calculate score based on how well candidate experience matches requirement
         if candidate_experience >= required_experience:
@@ -137,35 +332,21 @@ class AIMatchingEngine:
             penalty = deficit / required_experience
             return max(1.0 - penalty, 0.0)
     
-    def calculate_education_match(self, candidate_education: Optional[str], job_requirements: str) -> float:
-        """Calculate education matching score"""
+    def calculate_education_match(self, candidate_education: Optional[str], job_requirements) -> float:
+        """Calculate education matching score against job text or a JobProfile"""
         if not candidate_education:
             return 0.5  # Neutral score if education not specified
         
-        candidate_edu_lower = candidate_education.lower()
-        job_lower = job_requirements.lower()
-        
-        # Education level hierarchy
-        education_levels = {
-            'phd': 5, 'doctorate': 5, 'ph.d.': 5,
-            'master': 4, 'mba': 4, 'm.s.': 4, 'm.a.': 4,
-            'bachelor': 3, 'b.s.': 3, 'b.a.': 3,
-            'associate': 2,
-            'diploma': 1, 'certificate': 1
-        }
-        
         # Find candidate's highest education level
-        candidate_level = 0
-        for edu_type, level in education_levels.items():
-            if edu_type in candidate_edu_lower:
-                candidate_level = max(candidate_level, level)
-        
-        # Find required education level
-        required_level = 0
-        for edu_type, level in education_levels.items():
-            if edu_type in job_lower:
-                required_level = max(required_level, level)
+        candidate_level = self.extract_education_level(candidate_education)
+        return self.score_education_level(candidate_level, self._as_job_profile(job_requirements))
+    
+    def score_education_level(self, candidate_level: Optional[int], job_profile: JobProfile) -> float:
+        """Score a candidate's education level against the level a job requires"""
+        if candidate_level is None:
+            return 0.5  # Neutral score if education not specified
         
+        required_level = job_profile.required_education_level
         if required_level == 0:
             return 0.7  # Good default score if no education requirement specified
         
@@ -176,20 +357,20 @@ class AIMatchingEngine:
         else:
             return 0.4  # Significant gap
     
-    def calculate_keyword_match(self, candidate_text: str, job_requirements: str) -> float:
+    def calculate_keyword_match(self, candidate_text: str, job_requirements) -> float:
         """Calculate general keyword matching score using TF-IDF-like approach"""
-        candidate_words = self.preprocess_text(candidate_text)
-        job_words = self.preprocess_text(job_requirements)
-        
-        if not candidate_words or not job_words:
+        # Count word frequencies
+        return self.score_keyword_counts(self.count_tokens(candidate_text), self._as_job_profile(job_requirements))
+    
+    def score_keyword_counts(self, candidate_freq: Counter, job_profile: JobProfile) -> float:
+        """Keyword matching score from precomputed candidate word frequencies"""
+        if not candidate_freq or not job_profile.tokens:
             return 0.0
         
-        # Count word frequencies
-        candidate_freq = Counter(candidate_words)
-        job_freq = Counter(job_words)
+        job_freq = job_profile.token_counts
         
         # Calculate intersection
-        common_words = set(candidate_words) & set(job_words)
+        common_words = candidate_freq.keys() & job_profile.token_set
         
         if not common_words:
             return 0.0
@@ -210,25 +391,83 @@ class AIMatchingEngine:
         
         return score / total_weight if total_weight > 0 else 0.0
     
-    def calculate_matching_score(self, candidate_data: Dict, job_data: Dict) -> float:
-        """Calculate overall matching score between candidate and job"""
+    def with_idf_weights(self, job_profile: JobProfile, idf_weights: Dict[str, float]) -> JobProfile:
+        """Copy of a job profile whose keyword criterion is IDF-weighted"""
+        weighted = copy.copy(job_profile)
+        weighted.idf_weights = idf_weights
+        weighted.idf_total = sum(
+            count * idf_weights.get(word, 1.0) for word, count in job_profile.token_counts.items()
+        )
+        return weighted
+    
+    def calculate_idf_keyword_match(self, candidate_text: str, job_requirements,
+                                    idf_weights: Dict[str, float]) -> float:
+        """Calculate keyword matching score with words weighted by inverse document frequency"""
+        job_profile = self.with_idf_weights(self._as_job_profile(job_requirements), idf_weights)
+        return self.score_idf_keyword_counts(self.count_tokens(candidate_text), job_profile)
+    
+    def score_idf_keyword_counts(self, candidate_freq: Counter, job_profile: JobProfile) -> float:
+        """
+        IDF-weighted keyword score from precomputed candidate word frequencies
+        Each job word contributes min(candidate count, job count) * idf out of a
+        possible job count * idf, summed over all job words, so rare terms
+        ("kubernetes") dominate and common ones ("team", "work") barely count.
+        """
+        if not candidate_freq or not job_profile.tokens or job_profile.idf_total <= 0:
+            return 0.0
         
-        # Extract relevant data
-        candidate_skills = candidate_data.get('skills', [])
-        candidate_experience = candidate_data.get('total_experience_years')
-        candidate_education = candidate_data.get('education')
-        candidate_text = candidate_data.get('parsed_cv_text', '')
+        job_freq = job_profile.token_counts
+        idf_weights = job_profile.idf_weights
         
-        job_requirements = job_data.get('requirements', '')
-        job_description = job_data.get('description', '')
-        job_text = f"{job_requirements} {job_description}"
+        score = 0.0
+        for word in candidate_freq.keys() & job_profile.token_set:
+            score += min(candidate_freq[word], job_freq[word]) * idf_weights.get(word, 1.0)
+        
+        return score / job_profile.idf_total
+    
+    def calculate_matching_score(self, candidate_data, job_data) -> float:
+        """
+        Calculate overall matching score between candidate and job
+        Args:
+            candidate_data: Candidate data or CandidateProfile
+            job_data: Job data or JobProfile
+        """
+        job_profile = self.get_job_profile(job_data)
         
         # Calculate individual scores
-        skills_score = self.calculate_skills_match(candidate_skills, job_text)
-        experience_score = self.calculate_experience_match(candidate_experience, job_text)
-        education_score = self.calculate_education_match(candidate_education, job_text)
-        keyword_score = self.calculate_keyword_match(candidate_text, job_text)
+        skills_score, experience_score, education_score = self._base_scores(candidate_data, job_profile)
+        keyword_score = self._keyword_score(candidate_data, job_profile)
         
+        return self.combine_scores(skills_score, experience_score, education_score, keyword_score)
+    
+    def _base_scores(self, candidate_data, job_profile: JobProfile) -> Tuple[float, float, float]:
+        """Skills, experience and education scores of a candidate"""
+        if isinstance(candidate_data, CandidateProfile):
+            return (
+                self.calculate_skills_match(candidate_data.skills, job_profile, candidate_data.skill_keywords),
+                self.calculate_experience_match(candidate_data.experience, job_profile),
+                self.score_education_level(candidate_data.education_level, job_profile)
+            )
+        return (
+            self.calculate_skills_match(candidate_data.get('skills', []), job_profile),
+            self.calculate_experience_match(candidate_data.get('total_experience_years'), job_profile),
+            self.calculate_education_match(candidate_data.get('education'), job_profile)
+        )
+    
+    def _keyword_score(self, candidate_data, job_profile: JobProfile) -> float:
+        """Keyword score of a candidate, the most expensive criterion on raw CV text"""
+        if isinstance(candidate_data, CandidateProfile):
+            candidate_freq = candidate_data.token_counts
+        else:
+            candidate_freq = self.count_tokens(candidate_data.get('parsed_cv_text', ''))
+        
+        if job_profile.idf_weights is not None:
+            return self.score_idf_keyword_counts(candidate_freq, job_profile)
+        return self.score_keyword_counts(candidate_freq, job_profile)
+    
+    def combine_scores(self, skills_score: float, experience_score: float,
+                       education_score: float, keyword_score: float) -> float:
+        """Combine individual criterion scores into the overall matching score"""
         # Calculate weighted overall score
         overall_score = (
             skills_score * self.weights['skills_match'] +
@@ -242,22 +481,80 @@ class AIMatchingEngine:
         
         return round(overall_score, 3)
     
-    def get_match_details(self, candidate_data: Dict, job_data: Dict) -> Dict:
-        """Get detailed breakdown of matching scores"""
-        candidate_skills = candidate_data.get('skills', [])
-        candidate_experience = candidate_data.get('total_experience_years')
-        candidate_education = candidate_data.get('education')
-        candidate_text = candidate_data.get('parsed_cv_text', '')
+    def rank_candidates(self, candidates: Iterable[Tuple[Any, Any]], job_data,
+                        limit: Optional[int] = None, threshold: float = 0.0) -> List[Tuple[Any, float]]:
+        """
+        Rank candidates for a job, best first
+        Args:
+            candidates: Iterable of (key, candidate data or CandidateProfile) pairs
+            job_data: Job data or JobProfile being matched against
+            limit: Only return the top `limit` candidates (all qualifying if None)
+            threshold: Minimum matching score to include a candidate
+        Returns the same (key, score) pairs and order as scoring every candidate
+        with calculate_matching_score and sorting by score, with ties kept in
+        input order. The keyword match is the expensive criterion, so it is
+        skipped for candidates whose score cannot reach the threshold or the
+        current top `limit` even with a perfect keyword match.
+        """
+        job_profile = self.get_job_profile(job_data)
+        return self._rank(((key, candidate_data, job_profile) for key, candidate_data in candidates), limit, threshold)
+    
+    def rank_jobs(self, candidate_data, jobs: Iterable[Tuple[Any, Any]],
+                  limit: Optional[int] = None, threshold: float = 0.0) -> List[Tuple[Any, float]]:
+        """
+        Rank jobs for a candidate, best first
+        Args:
+            candidate_data: Candidate data or CandidateProfile
+            jobs: Iterable of (key, job data or JobProfile) pairs
+            limit: Only return the top `limit` jobs (all qualifying if None)
+            threshold: Minimum matching score to include a job
+        Returns (key, score) pairs with ties kept in input order, skipping the
+        keyword match where it cannot matter, like rank_candidates.
+        """
+        return self._rank(((key, candidate_data, self.get_job_profile(job_data)) for key, job_data in jobs),
+                          limit, threshold)
+    
+    def _rank(self, pairs: Iterable[Tuple[Any, Any, JobProfile]], limit: Optional[int],
+              threshold: float) -> List[Tuple[Any, float]]:
+        """Top (key, score) of (key, candidate data, job profile) pairs"""
+        if limit is not None and limit <= 0:
+            return []
         
-        job_requirements = job_data.get('requirements', '')
-        job_description = job_data.get('description', '')
-        job_text = f"{job_requirements} {job_description}"
+        # Min-heap of (score, -position, key): the root is the weakest entry kept
+        heap = []
         
-        skills_score = self.calculate_skills_match(candidate_skills, job_text)
-        experience_score = self.calculate_experience_match(candidate_experience, job_text)
-        education_score = self.calculate_education_match(candidate_education, job_text)
-        keyword_score = self.calculate_keyword_match(candidate_text, job_text)
-        overall_score = self.calculate_matching_score(candidate_data, job_data)
+        for position, (key, candidate_data, job_profile) in enumerate(pairs):
+            skills_score, experience_score, education_score = self._base_scores(candidate_data, job_profile)
+            
+            upper_bound = self.combine_scores(skills_score, experience_score, education_score, 1.0)
+            if upper_bound < threshold:
+                continue
+            # Ties are resolved in favour of earlier pairs, so a later pair
+            # must strictly beat the weakest entry to get in
+            if limit is not None and len(heap) >= limit and upper_bound <= heap[0][0]:
+                continue
+            
+            keyword_score = self._keyword_score(candidate_data, job_profile)
+            score = self.combine_scores(skills_score, experience_score, education_score, keyword_score)
+            if score < threshold:
+                continue
+            
+            entry = (score, -position, key)
+            if limit is None or len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+        
+        heap.sort(key=lambda entry: (-entry[0], -entry[1]))
+        return [(key, score) for score, _, key in heap]
+    
+    def get_match_details(self, candidate_data, job_data) -> Dict:
+        """Get detailed breakdown of matching scores (candidate data or CandidateProfile, job data or JobProfile)"""
+        job_profile = self.get_job_profile(job_data)
+        
+        skills_score, experience_score, education_score = self._base_scores(candidate_data, job_profile)
+        keyword_score = self._keyword_score(candidate_data, job_profile)
+        overall_score = self.combine_scores(skills_score, experience_score, education_score, keyword_score)
         
         return {
             'overall_score': overall_score,
@@ -269,4 +566,3 @@ class AIMatchingEngine:
             },
             'weights': self.weights
         }
-
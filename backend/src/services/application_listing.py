@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import load_only, selectinload
+from src.models.application import Application
+from src.models.candidate import Candidate
+from src.models.job import Job
+from src.services.pagination import fetch_page, read_names, read_page_args
+
+class ApplicationListing:
+    """
+    Application lists of the API, with their related rows
+    The jobs, candidates and commissions of a page are loaded in one batched
+    IN query each instead of lazily per application, and only the columns of
+    the requested fields are read.
+
+    Request arguments:
+        fields: application keys, and job.<key> / candidate.<key> for the
+            keys of a related object (e.g. fields=id,status,candidate.first_name)
+        expand: related objects to include (job, candidate, commissions); by
+            default all of them, or those named in fields when fields is given
+        after_id, limit: keyset paging, see src.services.pagination
+    """
+
+    # Related objects whose keys can be selected with <relation>.<key>
+    RELATED_MODELS = {'job': Job, 'candidate': Candidate}
+
+    def for_job(self, job_id: int):
+        """Query of the applications to a job"""
+        return Application.query.filter(Application.job_id == job_id)
+
+    def for_candidate(self, candidate_id: int):
+        """Query of the applications of a candidate"""
+        return Application.query.filter(Application.candidate_id == candidate_id)
+
+    def read_projection(self, args) -> Tuple[Optional[List[str]], Dict[str, List[str]], List[str]]:
+        """Application fields, fields per related object and expanded relations; raises ValueError"""
+        allowed = list(Application.DETAIL_FIELDS)
+        for relation, model in self.RELATED_MODELS.items():
+            allowed.extend(f'{relation}.{field}' for field in model.FIELDS)
+        names = read_names(args, 'fields', allowed)
+
+        fields, related_fields = None, {}
+        if names:
+            fields = [name for name in names if '.' not in name]
+            for name in names:
+                if '.' in name:
+                    relation, field = name.split('.', 1)
+                    related_fields.setdefault(relation, []).append(field)
+            # The id always identifies the application
+            if 'id' not in fields:
+                fields.insert(0, 'id')
+
+        expand = read_names(args, 'expand', Application.RELATIONS)
+        if expand is None:
+            expand = list(related_fields) if names else list(Application.RELATIONS)
+        return fields, related_fields, expand
+
+    def options(self, fields: Optional[List[str]], related_fields: Dict[str, List[str]], expand: List[str]) -> list:
+        """Loader options reading only what the projection serializes"""
+        options = []
+        if fields:
+            # Foreign keys are needed to load the related rows
+            columns = set(fields) | {'id', 'job_id', 'candidate_id'}
+            options.append(load_only(*[getattr(Application, column) for column in sorted(columns)]))
+
+        for relation, model in self.RELATED_MODELS.items():
+            if relation not in expand:
+                continue
+            loader = selectinload(getattr(Application, relation))
+            if related_fields.get(relation):
+                columns = set(related_fields[relation]) | {'id'}
+                loader = loader.load_only(*[getattr(model, column) for column in sorted(columns)])
+            options.append(loader)
+
+        if 'commissions' in expand:
+            options.append(selectinload(Application.commissions))
+        return options
+
+    def list(self, query, args) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Serialize the applications of a query as requested by args
+        Returns the serialized applications and the after_id of the next page
+        (None on the last page or when not paging); raises ValueError.
+        """
+        after_id, limit = read_page_args(args)
+        fields, related_fields, expand = self.read_projection(args)
+
+        applications, next_after_id = fetch_page(
+            query.options(*self.options(fields, related_fields, expand)), Application.id, after_id, limit
+        )
+        return [
+            application.to_dict_with_details(fields, expand, related_fields)
+            for application in applications
+        ], next_after_id
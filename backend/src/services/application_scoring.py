@@ -0,0 +1,126 @@
+from typing import Dict, List
+from sqlalchemy import update
+from sqlalchemy.orm import load_only, selectinload
+from src.models.application import Application, db
+from src.services.ai_matcher import AIMatchingEngine
+from src.services.candidate_features import CandidateFeatureStore
+from src.services.scoring_pool import ScoringPool
+
+class ApplicationScorer:
+    """Scores applications against their job and stores the matching score"""
+
+    # Keeps IN (...) clauses well below database parameter limits
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, matcher: AIMatchingEngine = None, feature_store: CandidateFeatureStore = None,
+                 pool: ScoringPool = None):
+        self.matcher = matcher or AIMatchingEngine()
+        self.feature_store = feature_store or CandidateFeatureStore(self.matcher)
+        self.pool = pool or ScoringPool(self.matcher)
+
+    def load_applications(self, application_ids: List[int]) -> Dict[int, Application]:
+        """Fetch applications by id with their jobs, skipping the large JSON columns"""
+        application_ids = list({app_id for app_id in application_ids if isinstance(app_id, int)})
+        query = Application.query.options(
+            load_only(Application.id, Application.candidate_id, Application.job_id),
+            selectinload(Application.job)
+        )
+
+        applications = {}
+        for start in range(0, len(application_ids), self.QUERY_CHUNK_SIZE):
+            chunk = application_ids[start:start + self.QUERY_CHUNK_SIZE]
+            applications.update((application.id, application)
+                                for application in query.filter(Application.id.in_(chunk)))
+        return applications
+
+    def score(self, application_ids: List[int]) -> List[Dict]:
+        """
+        Score a list of applications (caller commits)
+        Returns one result per id, in order, with either the matching score
+        or an error message.
+        """
+        applications = self.load_applications(application_ids)
+        candidate_profiles = self.feature_store.load(
+            sorted({application.candidate_id for application in applications.values()})
+        )
+
+        # Each job is parsed once, however many applications reference it; a
+        # missing or unparsable job fails only its own applications
+        job_profiles = {}
+        job_errors = {}
+        for application in applications.values():
+            if application.job_id in job_profiles or application.job_id in job_errors:
+                continue
+            if application.job is None:
+                job_errors[application.job_id] = 'Job not found'
+                continue
+            try:
+                job_profiles[application.job_id] = self.matcher.get_job_profile(application.job.to_dict())
+            except Exception as e:
+                job_errors[application.job_id] = str(e)
+
+        # Large batches are scored across processes, the rest in-process below
+        pooled_scores = {}
+        scorable = [app_id for app_id in dict.fromkeys(app_id for app_id in application_ids if isinstance(app_id, int))
+                    if app_id in applications and applications[app_id].candidate_id in candidate_profiles
+                    and applications[app_id].job_id in job_profiles]
+        if self.pool.should_use(len(scorable)):
+            pool_scores = self.pool.score(
+                [(candidate_profiles[applications[app_id].candidate_id], applications[app_id].job_id)
+                 for app_id in scorable],
+                job_profiles
+            )
+            pooled_scores = dict(zip(scorable, pool_scores))
+
+        results = []
+        scores = []
+
+        for app_id in application_ids:
+            try:
+                application = applications.get(app_id) if isinstance(app_id, int) else None
+                if not application:
+                    results.append({
+                        'application_id': app_id,
+                        'error': 'Application not found'
+                    })
+                    continue
+                if application.job_id in job_errors:
+                    results.append({
+                        'application_id': app_id,
+                        'error': job_errors[application.job_id]
+                    })
+                    continue
+                if application.candidate_id not in candidate_profiles:
+                    results.append({
+                        'application_id': app_id,
+                        'error': 'Candidate not found'
+                    })
+                    continue
+
+                # Calculate matching score
+                if app_id in pooled_scores:
+                    matching_score = pooled_scores[app_id]
+                else:
+                    matching_score = self.matcher.calculate_matching_score(
+                        candidate_profiles[application.candidate_id], job_profiles[application.job_id]
+                    )
+                scores.append({'id': application.id, 'matching_score': matching_score})
+
+                results.append({
+                    'application_id': application.id,
+                    'matching_score': matching_score,
+                    'candidate_id': application.candidate_id,
+                    'job_id': application.job_id
+                })
+
+            except Exception as e:
+                results.append({
+                    'application_id': app_id,
+                    'error': str(e)
+                })
+
+        # Write every score back in one executemany UPDATE by primary key
+        if scores:
+            db.session.execute(update(Application), scores)
+
+        return results
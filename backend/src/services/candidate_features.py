@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional, Set
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from src.models.candidate import Candidate, CandidateFeatureRevision, CandidateFeatures, db
+from src.services.ai_matcher import AIMatchingEngine, CandidateProfile
+
+class CandidateFeatureStore:
+    """Stores each candidate's CandidateProfile so matching never reparses CV text"""
+
+    # Keeps IN (...) clauses well below database parameter limits
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, matcher: AIMatchingEngine = None):
+        self.matcher = matcher or AIMatchingEngine()
+
+    def save(self, candidate: Candidate) -> CandidateProfile:
+        """Compute and store the features of a candidate (caller commits)"""
+        profile = self.matcher.build_candidate_profile(candidate.to_dict())
+        revision = self.next_revision()
+
+        features = CandidateFeatures.query.get(candidate.id)
+        if features is None:
+            features = CandidateFeatures(candidate_id=candidate.id)
+            db.session.add(features)
+        features.version = CandidateProfile.VERSION
+        features.data = profile.to_json()
+        features.revision = revision
+
+        return profile
+
+    def add(self, candidate_id: int, profile: CandidateProfile) -> None:
+        """Store the already computed profile of a new candidate (caller commits)"""
+        db.session.add(CandidateFeatures(
+            candidate_id=candidate_id,
+            version=CandidateProfile.VERSION,
+            data=profile.to_json(),
+            revision=self.next_revision()
+        ))
+
+    def get(self, candidate_id: int) -> Optional[CandidateProfile]:
+        """Stored up-to-date profile of a candidate, if any"""
+        features = CandidateFeatures.query.get(candidate_id)
+        if features is None or features.version != CandidateProfile.VERSION:
+            return None
+        return CandidateProfile.from_json(features.data)
+
+    def remove(self, candidate_id: int) -> None:
+        """Drop the stored features of a candidate (caller commits)"""
+        CandidateFeatures.query.filter_by(candidate_id=candidate_id).delete(synchronize_session=False)
+        self.next_revision()
+
+    def next_revision(self) -> int:
+        """
+        Bump the features revision for a write (caller commits)
+        The counter row stays locked until the caller's transaction ends, so
+        concurrent writers commit their revisions in increasing order.
+        """
+        bump = update(CandidateFeatureRevision).where(CandidateFeatureRevision.id == 1).values(
+            revision=CandidateFeatureRevision.revision + 1
+        ).returning(CandidateFeatureRevision.revision).execution_options(synchronize_session=False)
+        revision = db.session.execute(bump).scalar()
+        if revision is not None:
+            return revision
+
+        # First write ever; a concurrent writer may insert the row first
+        try:
+            with db.session.begin_nested():
+                db.session.add(CandidateFeatureRevision(id=1, revision=1))
+            return 1
+        except IntegrityError:
+            return db.session.execute(bump).scalar()
+
+    def revision_query(self):
+        """Query of the latest committed features revision (no row before the first write)"""
+        return db.session.query(CandidateFeatureRevision.revision).filter_by(id=1)
+
+    def load(self, candidate_ids: List[int]) -> Dict[int, CandidateProfile]:
+        """
+        Load the profiles of candidates without touching their CV text
+        Candidates whose features are missing or outdated are profiled and
+        stored on the way (persisted by the caller's next commit).
+        """
+        profiles = {}
+        for start in range(0, len(candidate_ids), self.QUERY_CHUNK_SIZE):
+            chunk = candidate_ids[start:start + self.QUERY_CHUNK_SIZE]
+            rows = db.session.query(CandidateFeatures.candidate_id, CandidateFeatures.data).filter(
+                CandidateFeatures.candidate_id.in_(chunk),
+                CandidateFeatures.version == CandidateProfile.VERSION
+            )
+            for candidate_id, data in rows:
+                profiles[candidate_id] = CandidateProfile.from_json(data)
+
+        missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in profiles]
+        for start in range(0, len(missing), self.QUERY_CHUNK_SIZE):
+            chunk = missing[start:start + self.QUERY_CHUNK_SIZE]
+            for candidate in Candidate.query.filter(Candidate.id.in_(chunk)):
+                profiles[candidate.id] = self.save(candidate)
+
+        return profiles
+
+    def load_all(self) -> Dict[int, CandidateProfile]:
+        """Load every stored, up-to-date candidate profile"""
+        rows = db.session.query(CandidateFeatures.candidate_id, CandidateFeatures.data).filter(
+            CandidateFeatures.version == CandidateProfile.VERSION
+        )
+        return {candidate_id: CandidateProfile.from_json(data) for candidate_id, data in rows}
+
+    def load_since(self, revision: int) -> Dict[int, CandidateProfile]:
+        """Load the up-to-date profiles written after the given revision"""
+        rows = db.session.query(CandidateFeatures.candidate_id, CandidateFeatures.data).filter(
+            CandidateFeatures.version == CandidateProfile.VERSION,
+            CandidateFeatures.revision > revision
+        )
+        return {candidate_id: CandidateProfile.from_json(data) for candidate_id, data in rows}
+
+    def stored_ids(self) -> Set[int]:
+        """Ids of the candidates with stored, up-to-date features"""
+        return {row[0] for row in db.session.query(CandidateFeatures.candidate_id).filter(
+            CandidateFeatures.version == CandidateProfile.VERSION
+        )}
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        """Recompute the stored features of every candidate"""
+        candidate_ids = [row[0] for row in db.session.query(Candidate.id).order_by(Candidate.id)]
+        for start in range(0, len(candidate_ids), batch_size):
+            chunk = candidate_ids[start:start + batch_size]
+            for candidate in Candidate.query.filter(Candidate.id.in_(chunk)):
+                self.save(candidate)
+            db.session.flush()
+
+        db.session.commit()
+        return len(candidate_ids)
+
+    def rebuild_if_empty(self) -> int:
+        """Rebuild when candidates exist but none has up-to-date features, e.g. after create_all() or a VERSION bump"""
+        stored = CandidateFeatures.query.filter(CandidateFeatures.version == CandidateProfile.VERSION)
+        if db.session.query(stored.exists()).scalar():
+            return 0
+        if not db.session.query(Candidate.query.exists()).scalar():
+            return 0
+        return self.rebuild()
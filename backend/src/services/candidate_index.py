@@ -0,0 +1,116 @@
+from typing import Dict, Iterable, List, Set
+from sqlalchemy import func
+from sqlalchemy.orm import defer
+from src.models.candidate import Candidate, CandidateSkill, CandidateTerm, Skill, db
+from src.services.ai_matcher import AIMatchingEngine, CandidateProfile
+
+class CandidateIndex:
+    """Persistent inverted index from normalized skill/keyword terms to candidate ids"""
+
+    # Keeps IN (...) clauses well below database parameter limits
+    QUERY_CHUNK_SIZE = 500
+
+    # Longest term stored in the index (matches CandidateTerm.term)
+    MAX_TERM_LENGTH = 255
+
+    def __init__(self, matcher: AIMatchingEngine = None):
+        self.matcher = matcher or AIMatchingEngine()
+
+    def extract_terms(self, candidate: Candidate, profile: CandidateProfile = None) -> Set[str]:
+        """Collect every term through which a candidate can match a job"""
+        if profile is None:
+            profile = self.matcher.build_candidate_profile(candidate.to_dict())
+        terms = set(profile.token_counts)
+
+        for skill in profile.skills:
+            terms.update(self.matcher.preprocess_text(skill))
+
+        # Technical keywords found in skills (e.g. 'node.js' in 'Node.js developer')
+        terms.update(profile.skill_keywords)
+
+        return {term for term in terms if len(term) <= self.MAX_TERM_LENGTH}
+
+    def extract_job_terms(self, job_data) -> Set[str]:
+        """Collect the terms a job (data or JobProfile) is matched against"""
+        job_profile = self.matcher.get_job_profile(job_data)
+        # Multi-word keywords such as 'machine learning' are not single tokens
+        return set(job_profile.token_set).union(job_profile.technical_keywords)
+
+    def index_candidate(self, candidate: Candidate, profile: CandidateProfile = None) -> None:
+        """Replace the index entries of a candidate (caller commits)"""
+        self.remove_candidate(candidate.id)
+        self.add_candidate(candidate, profile)
+
+    def add_candidate(self, candidate: Candidate, profile: CandidateProfile = None) -> None:
+        """Index a candidate that has no index entries yet (caller commits)"""
+        db.session.add_all([
+            CandidateTerm(term=term, candidate_id=candidate.id)
+            for term in self.extract_terms(candidate, profile)
+        ])
+
+    def remove_candidate(self, candidate_id: int) -> None:
+        """Drop all index entries of a candidate (caller commits)"""
+        CandidateTerm.query.filter_by(candidate_id=candidate_id).delete(synchronize_session=False)
+
+    def find_candidates(self, terms: Iterable[str]) -> List[int]:
+        """Return ids of candidates sharing at least one term, in ascending order"""
+        terms = list(terms)
+        candidate_ids = set()
+
+        for start in range(0, len(terms), self.QUERY_CHUNK_SIZE):
+            chunk = terms[start:start + self.QUERY_CHUNK_SIZE]
+            rows = db.session.query(CandidateTerm.candidate_id).filter(
+                CandidateTerm.term.in_(chunk)
+            ).distinct()
+            candidate_ids.update(row[0] for row in rows)
+
+        return sorted(candidate_ids)
+
+    def skill_filter(self, skills: Iterable[str], match_all: bool = False):
+        """SQL condition selecting candidates that list any (or all) of the skills"""
+        names = Skill.canonical_names(skills)
+        listed = db.session.query(CandidateSkill.candidate_id).join(
+            Skill, Skill.id == CandidateSkill.skill_id
+        ).filter(Skill.name.in_(names))
+        if match_all:
+            listed = listed.group_by(CandidateSkill.candidate_id).having(func.count() == len(names))
+        return Candidate.id.in_(listed)
+
+    def find_candidates_for_job(self, job_data) -> List[int]:
+        """Return ids of candidates sharing at least one term with a job"""
+        return self.find_candidates(self.extract_job_terms(job_data))
+
+    def load_candidates(self, candidate_ids: List[int], with_cv_text: bool = True) -> List[Candidate]:
+        """Load candidates by id in ascending id order"""
+        query = Candidate.query
+        if not with_cv_text:
+            query = query.options(defer(Candidate.parsed_cv_text))
+
+        candidates = []
+        for start in range(0, len(candidate_ids), self.QUERY_CHUNK_SIZE):
+            chunk = candidate_ids[start:start + self.QUERY_CHUNK_SIZE]
+            candidates.extend(
+                query.filter(Candidate.id.in_(chunk)).order_by(Candidate.id).all()
+            )
+        return candidates
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        """Rebuild the whole index from the candidate table"""
+        CandidateTerm.query.delete(synchronize_session=False)
+
+        candidate_ids = [row[0] for row in db.session.query(Candidate.id).order_by(Candidate.id)]
+        for start in range(0, len(candidate_ids), batch_size):
+            for candidate in self.load_candidates(candidate_ids[start:start + batch_size]):
+                self.add_candidate(candidate)
+            db.session.flush()
+
+        db.session.commit()
+        return len(candidate_ids)
+
+    def rebuild_if_empty(self) -> int:
+        """Rebuild when candidates exist but none is indexed, e.g. right after create_all() added the table"""
+        if db.session.query(CandidateTerm.query.exists()).scalar():
+            return 0
+        if not db.session.query(Candidate.query.exists()).scalar():
+            return 0
+        return self.rebuild()
@@ -0,0 +1,48 @@
+from typing import List, Tuple
+from src.models.candidate import Candidate
+from src.services.ai_matcher import AIMatchingEngine, CandidateProfile
+from src.services.candidate_features import CandidateFeatureStore
+from src.services.candidate_index import CandidateIndex
+from src.services.corpus_stats import CorpusStatistics
+from src.services.match_scores import MatchScoreStore
+
+class CandidateSync:
+    """Keeps the data derived from a candidate in step with writes to the candidate row"""
+
+    def __init__(self, matcher: AIMatchingEngine = None):
+        self.matcher = matcher or AIMatchingEngine()
+        self.features = CandidateFeatureStore(self.matcher)
+        self.index = CandidateIndex(self.matcher)
+        self.corpus = CorpusStatistics(self.matcher)
+        self.match_scores = MatchScoreStore(self.matcher, self.features, self.index)
+
+    def candidate_saved(self, candidate: Candidate, created: bool = False) -> None:
+        """Refresh features, term index, corpus statistics and match scores of a created/updated candidate (caller commits)"""
+        old_profile = None if created else self.features.get(candidate.id)
+        profile = self.features.save(candidate)
+        self.index.index_candidate(candidate, profile)
+        if created:
+            self.corpus.add_document(self.corpus.candidate_terms(profile))
+        elif old_profile is not None:
+            self.corpus.update_document(self.corpus.candidate_terms(old_profile), self.corpus.candidate_terms(profile))
+        # Otherwise the candidate is counted with the terms of an older features
+        # VERSION, which are not known any more; rebuild-corpus-statistics recounts them
+        # Edits that leave the matching features alone (name, email...) keep the stored scores
+        if old_profile is None or not old_profile.same_features(profile):
+            self.match_scores.candidate_changed(candidate.id)
+
+    def candidates_created(self, created: List[Tuple[Candidate, CandidateProfile]]) -> None:
+        """Store derived data of freshly inserted candidates in bulk (caller commits)"""
+        for candidate, profile in created:
+            self.features.add(candidate.id, profile)
+            self.index.add_candidate(candidate, profile)
+        self.corpus.add_documents([self.corpus.candidate_terms(profile) for _, profile in created])
+        self.match_scores.candidates_created([candidate.id for candidate, _ in created])
+
+    def candidate_deleted(self, candidate: Candidate) -> None:
+        """Drop everything derived from a candidate about to be deleted (caller commits)"""
+        # Counted since its creation, with unknown terms if its features are outdated
+        self.corpus.remove_document(self.corpus.candidate_terms(self.features.get(candidate.id)))
+        self.index.remove_candidate(candidate.id)
+        self.features.remove(candidate.id)
+        self.match_scores.candidate_deleted(candidate.id)
@@ -0,0 +1,158 @@
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy.exc import IntegrityError
+from src.models.corpus import CorpusStatistic, TermStatistic, db
+from src.services.ai_matcher import AIMatchingEngine, CandidateProfile
+
+class CorpusStatistics:
+    """
+    Document frequencies over candidate CVs and job texts, maintained incrementally
+    Every write applies only the difference between a document's old and new
+    term sets, so IDF weights never require rescanning the corpus.
+    """
+
+    # Keeps IN (...) clauses well below database parameter limits
+    QUERY_CHUNK_SIZE = 500
+
+    # Longest term tracked (matches TermStatistic.term)
+    MAX_TERM_LENGTH = 255
+
+    DOCUMENT_COUNT = 'documents'
+
+    def __init__(self, matcher: AIMatchingEngine = None):
+        self.matcher = matcher or AIMatchingEngine()
+
+    def candidate_terms(self, profile: Optional[CandidateProfile]) -> Set[str]:
+        """Distinct terms of a candidate's CV"""
+        if profile is None:
+            return set()
+        return set(profile.token_counts)
+
+    def job_terms(self, job_data: Dict) -> Set[str]:
+        """Distinct terms of a job's requirements and description"""
+        return set(self.matcher.preprocess_text(self.matcher.build_job_text(job_data)))
+
+    def add_document(self, terms: Set[str]) -> None:
+        """Count a new document (caller commits)"""
+        self._adjust_documents(1)
+        self._adjust_terms(terms, 1)
+
+    def add_documents(self, documents: List[Set[str]]) -> None:
+        """Count several new documents with one update per distinct frequency (caller commits)"""
+        if not documents:
+            return
+        self._adjust_documents(len(documents))
+
+        terms_by_delta = defaultdict(list)
+        for term, frequency in Counter(term for terms in documents for term in terms).items():
+            terms_by_delta[frequency].append(term)
+        for delta, terms in terms_by_delta.items():
+            self._adjust_terms(terms, delta)
+
+    def remove_document(self, terms: Set[str]) -> None:
+        """Stop counting a deleted document (caller commits)"""
+        self._adjust_documents(-1)
+        self._adjust_terms(terms, -1)
+
+    def update_document(self, old_terms: Optional[Set[str]], new_terms: Set[str]) -> None:
+        """Apply the change of an existing document; None means it was not counted yet"""
+        if old_terms is None:
+            self.add_document(new_terms)
+            return
+        self._adjust_terms(new_terms - old_terms, 1)
+        self._adjust_terms(old_terms - new_terms, -1)
+
+    def _adjust_documents(self, delta: int) -> None:
+        self._retry_insert(self._apply_documents, delta)
+
+    def _apply_documents(self, delta: int) -> None:
+        updated = CorpusStatistic.query.filter_by(name=self.DOCUMENT_COUNT).update(
+            {CorpusStatistic.value: CorpusStatistic.value + delta}, synchronize_session=False
+        )
+        if not updated:
+            db.session.add(CorpusStatistic(name=self.DOCUMENT_COUNT, value=max(delta, 0)))
+
+    def _adjust_terms(self, terms: Iterable[str], delta: int) -> None:
+        terms = [term for term in terms if len(term) <= self.MAX_TERM_LENGTH]
+        for start in range(0, len(terms), self.QUERY_CHUNK_SIZE):
+            chunk = terms[start:start + self.QUERY_CHUNK_SIZE]
+            if delta > 0:
+                self._retry_insert(self._apply_terms, chunk, delta)
+            else:
+                TermStatistic.query.filter(TermStatistic.term.in_(chunk)).update(
+                    {TermStatistic.document_frequency: TermStatistic.document_frequency + delta},
+                    synchronize_session=False
+                )
+                TermStatistic.query.filter(
+                    TermStatistic.term.in_(chunk),
+                    TermStatistic.document_frequency <= 0
+                ).delete(synchronize_session=False)
+
+    def _apply_terms(self, chunk: List[str], delta: int) -> None:
+        TermStatistic.query.filter(TermStatistic.term.in_(chunk)).update(
+            {TermStatistic.document_frequency: TermStatistic.document_frequency + delta},
+            synchronize_session=False
+        )
+        existing = {row[0] for row in db.session.query(TermStatistic.term).filter(TermStatistic.term.in_(chunk))}
+        db.session.add_all([
+            TermStatistic(term=term, document_frequency=delta)
+            for term in chunk if term not in existing
+        ])
+
+    def _retry_insert(self, apply, *args) -> None:
+        """Run an update-or-insert in a savepoint, again if a concurrent request inserted the same row first"""
+        try:
+            with db.session.begin_nested():
+                apply(*args)
+        except IntegrityError:
+            # The conflicting row is committed now, so the update counts it this time
+            with db.session.begin_nested():
+                apply(*args)
+
+    def document_count(self) -> int:
+        """Number of documents in the corpus"""
+        row = db.session.query(CorpusStatistic.value).filter_by(name=self.DOCUMENT_COUNT).first()
+        return row[0] if row else 0
+
+    def idf_weights(self, terms: Iterable[str]) -> Dict[str, float]:
+        """
+        Smoothed inverse document frequency of each term
+        idf = ln((1 + N) / (1 + df)) + 1, so unseen terms get the highest
+        weight and a term present in every document still weighs 1.
+        """
+        terms = list(set(terms))
+        total = self.document_count()
+
+        frequencies = {}
+        for start in range(0, len(terms), self.QUERY_CHUNK_SIZE):
+            chunk = terms[start:start + self.QUERY_CHUNK_SIZE]
+            rows = db.session.query(TermStatistic.term, TermStatistic.document_frequency).filter(
+                TermStatistic.term.in_(chunk)
+            )
+            frequencies.update(rows)
+
+        return {
+            term: math.log((1 + total) / (1 + frequencies.get(term, 0))) + 1
+            for term in terms
+        }
+
+    def rebuild(self, documents: Iterable[Set[str]]) -> int:
+        """Recount the corpus from scratch over the given documents' term sets"""
+        frequencies = {}
+        total = 0
+        for terms in documents:
+            total += 1
+            for term in terms:
+                if len(term) <= self.MAX_TERM_LENGTH:
+                    frequencies[term] = frequencies.get(term, 0) + 1
+
+        TermStatistic.query.delete(synchronize_session=False)
+        CorpusStatistic.query.filter_by(name=self.DOCUMENT_COUNT).delete(synchronize_session=False)
+        db.session.add(CorpusStatistic(name=self.DOCUMENT_COUNT, value=total))
+        db.session.add_all([
+            TermStatistic(term=term, document_frequency=frequency)
+            for term, frequency in frequencies.items()
+        ])
+        db.session.commit()
+        return total
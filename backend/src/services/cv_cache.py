@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy.exc import IntegrityError
+from src.models.cv_cache import CVParseResult, db
+from src.services.cv_processor import CVProcessor, iter_normalized_lines, normalize_cv_text
+from src.services.text_stream import TEXT_CHUNK_SIZE, iter_text_chunks
+
+class CVParseCache:
+    """
+    Caches CVProcessor results by content so resubmitted CVs are not reparsed
+    Keys hash the normalized CV text together with CVProcessor.RULES_VERSION,
+    so a CV sent again with other line endings or trailing whitespace still
+    hits, and bumping the rules version retires every cached result. Results
+    are kept in a bounded in-memory LRU and, with CV_CACHE_PERSIST=1, in the
+    cv_parse_results table so they survive restarts.
+    """
+
+    CAPACITY = int(os.getenv('CV_CACHE_SIZE', '1024'))
+
+    PERSIST = os.getenv('CV_CACHE_PERSIST', '0').lower() in ('1', 'true', 'yes')
+
+    # Keeps IN (...) clauses well below database parameter limits
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, cv_processor: CVProcessor = None, capacity: int = None, persist: bool = None):
+        self.cv_processor = cv_processor or CVProcessor()
+        self.capacity = self.CAPACITY if capacity is None else capacity
+        self.persist = self.PERSIST if persist is None else persist
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, cv_text: str) -> str:
+        """Cache key of a CV under the current extraction rules"""
+        if len(cv_text) <= TEXT_CHUNK_SIZE:
+            content = f'{self.cv_processor.RULES_VERSION}\n{normalize_cv_text(cv_text)}'
+            return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+        # Same digest, fed line by line instead of copying the normalized text
+        digest = hashlib.sha256(f'{self.cv_processor.RULES_VERSION}\n'.encode())
+        for position, line in enumerate(iter_normalized_lines(iter_text_chunks(cv_text))):
+            if position:
+                digest.update(b'\n')
+            digest.update(line.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def process_cv(self, cv_text: str) -> Dict:
+        """
+        CVProcessor.process_cv through the cache
+        A newly parsed result is inserted when persisting (caller commits).
+        """
+        key = self.key(cv_text)
+        cached = self.get_many([key])[0]
+        if cached is not None:
+            return self.result(cached, cv_text)
+
+        processed_data = self.cv_processor.process_cv(cv_text)
+        self.put(key, processed_data)
+        return processed_data
+
+    def result(self, cached: Dict, cv_text: str) -> Dict:
+        """process_cv output for a CV from its cached fields"""
+        processed_data = dict(cached, skills=list(cached['skills']))
+        processed_data['parsed_cv_text'] = cv_text
+        return processed_data
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict]]:
+        """Cached fields for each key (None on a miss), with one query per chunk of misses"""
+        results = [None] * len(keys)
+        missing = {}
+        with self._lock:
+            for position, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is None:
+                    missing.setdefault(key, []).append(position)
+                else:
+                    self._entries.move_to_end(key)
+                    results[position] = entry
+
+        if self.persist and missing:
+            stored = {}
+            missing_keys = list(missing)
+            for start in range(0, len(missing_keys), self.QUERY_CHUNK_SIZE):
+                chunk = missing_keys[start:start + self.QUERY_CHUNK_SIZE]
+                rows = db.session.query(CVParseResult.content_hash, CVParseResult.data).filter(
+                    CVParseResult.content_hash.in_(chunk)
+                )
+                stored.update((key, json.loads(data)) for key, data in rows)
+
+            for key, entry in stored.items():
+                self._remember(key, entry)
+                for position in missing[key]:
+                    results[position] = entry
+
+        return results
+
+    def put(self, key: str, processed_data: Dict) -> None:
+        """Cache the fields of a processed CV (inserted in the current transaction when persisting)"""
+        entry = {field: value for field, value in processed_data.items() if field != 'parsed_cv_text'}
+        entry['skills'] = list(entry['skills'])
+        self._remember(key, entry)
+
+        if self.persist:
+            # A savepoint on the connection (no session flush) keeps a row
+            # inserted first by a concurrent request, or earlier in this
+            # transaction, from failing the caller's transaction
+            connection = db.session.connection()
+            try:
+                with connection.begin_nested():
+                    connection.execute(CVParseResult.__table__.insert().values(
+                        content_hash=key,
+                        rules_version=self.cv_processor.RULES_VERSION,
+                        data=json.dumps(entry),
+                        created_at=datetime.utcnow()
+                    ))
+            except IntegrityError:
+                pass
+
+    def _remember(self, key: str, entry: Dict) -> None:
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget the in-memory results"""
+        with self._lock:
+            self._entries.clear()
+
+    def prune(self) -> int:
+        """Delete stored results of older extraction rules (caller commits)"""
+        return CVParseResult.query.filter(
+            CVParseResult.rules_version != self.cv_processor.RULES_VERSION
+        ).delete(synchronize_session=False)
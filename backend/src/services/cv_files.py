@@ -0,0 +1,173 @@
+import io
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from typing import List, Tuple
+
+try:  # PDF and DOCX support are optional; uploads of a missing format are refused
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+try:
+    import docx
+except ImportError:
+    docx = None
+
+# Extensions accepted for upload, by format
+CV_FILE_FORMATS = {
+    '.pdf': 'pdf',
+    '.docx': 'docx',
+    '.txt': 'text'
+}
+
+DOCX_PAGES_PATTERN = re.compile(rb'<Pages>(\d+)</Pages>')
+
+class CVFileError(Exception):
+    """A CV file that cannot be turned into text; status_code is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status_code: int = 422):
+        super().__init__(message)
+        self.status_code = status_code
+
+def _extract_pdf(data: bytes, max_pages: int) -> List[str]:
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted and not reader.decrypt(''):
+        raise CVFileError('PDF is password protected')
+    if len(reader.pages) > max_pages:
+        raise CVFileError(f'PDF has more than {max_pages} pages')
+    return [page.extract_text() or '' for page in reader.pages]
+
+def _extract_docx(data: bytes, max_pages: int, max_bytes: int) -> List[str]:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        # Refuse archives that inflate far beyond the upload limit (zip bombs)
+        if sum(entry.file_size for entry in archive.infolist()) > max_bytes * 20:
+            raise CVFileError('DOCX is too large once decompressed')
+        # Word records the page count when saving; absent in generated files
+        if 'docProps/app.xml' in archive.namelist():
+            pages = DOCX_PAGES_PATTERN.search(archive.read('docProps/app.xml'))
+            if pages and int(pages.group(1)) > max_pages:
+                raise CVFileError(f'DOCX has more than {max_pages} pages')
+
+    document = docx.Document(io.BytesIO(data))
+    texts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            texts.append(' | '.join(cell.text for cell in row.cells))
+    return texts
+
+def _extract_in_child(connection, file_format: str, data: bytes, max_pages: int, max_bytes: int) -> None:
+    """Entry point of the extraction process; sends back ('ok', text) or ('error', message)"""
+    try:
+        if file_format == 'pdf':
+            parts = _extract_pdf(data, max_pages)
+        else:
+            parts = _extract_docx(data, max_pages, max_bytes)
+        connection.send(('ok', '\n'.join(parts)))
+    except CVFileError as e:
+        connection.send(('error', str(e)))
+    except Exception as e:
+        connection.send(('error', f'Could not read {file_format.upper()} file: {e}'))
+    finally:
+        connection.close()
+
+class CVFileExtractor:
+    """
+    Extracts the text of uploaded CV files (PDF, DOCX, plain text)
+    Binary formats are parsed in a separate process per file, at most WORKERS
+    at a time, and a process running longer than TIMEOUT seconds is killed, so
+    a malformed or hostile file cannot stall or crash the web worker. Files
+    over MAX_BYTES or MAX_PAGES are refused before any parsing.
+    """
+
+    MAX_BYTES = int(os.getenv('CV_FILE_MAX_BYTES', str(10 * 1024 * 1024)))
+
+    MAX_PAGES = int(os.getenv('CV_FILE_MAX_PAGES', '30'))
+
+    # Seconds allowed to extract one file
+    TIMEOUT = float(os.getenv('CV_FILE_TIMEOUT', '20'))
+
+    # Files extracted at the same time by this process
+    WORKERS = int(os.getenv('CV_FILE_WORKERS', '2'))
+
+    def __init__(self, max_bytes: int = None, max_pages: int = None, timeout: float = None,
+                 workers: int = None):
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        self.max_pages = self.MAX_PAGES if max_pages is None else max_pages
+        self.timeout = self.TIMEOUT if timeout is None else timeout
+        self.workers = self.WORKERS if workers is None else workers
+        self._slots = threading.BoundedSemaphore(max(1, self.workers))
+
+    def file_format(self, filename: str, data: bytes) -> str:
+        """Format of an upload from its extension, checked against its content"""
+        extension = os.path.splitext(filename or '')[1].lower()
+        file_format = CV_FILE_FORMATS.get(extension)
+        if file_format is None:
+            raise CVFileError(f'Unsupported CV file type. Must be one of: {sorted(CV_FILE_FORMATS)}', 415)
+
+        if file_format == 'pdf' and not data.startswith(b'%PDF-'):
+            raise CVFileError('File is not a PDF')
+        if file_format == 'docx' and not data.startswith(b'PK\x03\x04'):
+            raise CVFileError('File is not a DOCX document')
+        if file_format == 'pdf' and PdfReader is None or file_format == 'docx' and docx is None:
+            raise CVFileError(f'{file_format.upper()} files are not supported on this server (install pypdf / python-docx)', 415)
+        return file_format
+
+    def read_upload(self, upload) -> bytes:
+        """Read an uploaded file, refusing it past max_bytes"""
+        data = upload.stream.read(self.max_bytes + 1)
+        if len(data) > self.max_bytes:
+            raise CVFileError(f'CV file exceeds {self.max_bytes} bytes', 413)
+        if not data:
+            raise CVFileError('CV file is empty', 400)
+        return data
+
+    def extract(self, filename: str, data: bytes) -> Tuple[str, str]:
+        """Text of a CV file and its format; raises CVFileError"""
+        if len(data) > self.max_bytes:
+            raise CVFileError(f'CV file exceeds {self.max_bytes} bytes', 413)
+        file_format = self.file_format(filename, data)
+
+        if file_format == 'text':
+            try:
+                return data.decode('utf-8-sig'), file_format
+            except UnicodeDecodeError:
+                raise CVFileError('Text CV is not UTF-8')
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise CVFileError('Too many CV files are being processed, try again later', 503)
+        try:
+            return self._extract_isolated(file_format, data), file_format
+        finally:
+            self._slots.release()
+
+    def _extract_isolated(self, file_format: str, data: bytes) -> str:
+        # fork hands the file to the child without pickling it
+        context = multiprocessing.get_context('fork')
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_extract_in_child,
+            args=(sender, file_format, data, self.max_pages, self.max_bytes),
+            daemon=True
+        )
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(self.timeout):
+                raise CVFileError(f'Extracting the CV took longer than {self.timeout:g} seconds', 422)
+            try:
+                status, payload = receiver.recv()
+            except EOFError:
+                # The child died without answering (e.g. killed for memory)
+                raise CVFileError(f'Could not read {file_format.upper()} file')
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+        if status == 'error':
+            raise CVFileError(payload)
+        return payload
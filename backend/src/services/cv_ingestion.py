@@ -0,0 +1,264 @@
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.models.candidate import Candidate, Skill, db
+from src.services.ai_matcher import AIMatchingEngine, CandidateProfile
+from src.services.candidate_sync import CandidateSync
+from src.services.cv_cache import CVParseCache
+from src.services.cv_processor import CVProcessor
+
+# Services of the current parsing process (inherited through fork)
+_worker_processor = None
+_worker_matcher = None
+
+def _init_worker(processor: CVProcessor, matcher: AIMatchingEngine) -> None:
+    global _worker_processor, _worker_matcher
+    _worker_processor = processor
+    _worker_matcher = matcher
+
+def _parse_cv(cv_text: str, cached: Optional[Dict] = None) -> Tuple[Optional[Dict], Optional[CandidateProfile], Optional[str]]:
+    """Parse one CV (unless its fields are cached) and profile it for matching; returns (processed data, profile, error)"""
+    try:
+        if cached is not None:
+            processed_data = dict(cached, skills=list(cached['skills']), parsed_cv_text=cv_text)
+        else:
+            processed_data = _worker_processor.process_cv(cv_text)
+        return processed_data, _worker_matcher.build_candidate_profile(processed_data), None
+    except Exception as e:
+        return None, None, str(e)
+
+class CVIngestion:
+    """
+    Creates candidates from a stream of CVs in batches
+    CVs are parsed and profiled (in a process pool if WORKERS > 1) while the
+    previous batch is written; CVs found in the parse cache are only profiled.
+    Each batch costs one duplicate-email query and one flush of multi-row
+    INSERTs, and its results are yielded as soon as it is committed, so memory
+    stays bounded by the batch size whatever the upload size. If a batch fails
+    to save, its candidates are saved one by one so only the failing records
+    are reported.
+    """
+
+    BATCH_SIZE = int(os.getenv('CV_INGEST_BATCH_SIZE', '200'))
+
+    # Parsing processes (parses in-process if 1 or less); each web worker
+    # process forks its own pool, so keep web workers x WORKERS near the CPU count
+    WORKERS = int(os.getenv('CV_INGEST_WORKERS', '1'))
+
+    def __init__(self, cv_cache: CVParseCache = None, candidate_sync: CandidateSync = None,
+                 workers: int = None):
+        self.cv_cache = cv_cache or CVParseCache()
+        self.cv_processor = self.cv_cache.cv_processor
+        self.candidate_sync = candidate_sync or CandidateSync()
+        self.matcher = self.candidate_sync.matcher
+        self.workers = self.WORKERS if workers is None else workers
+        self._executor = None
+        self._owner_pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._owner_pid != os.getpid():
+                # fork hands the parsers to workers without re-importing the app
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_init_worker,
+                    initargs=(self.cv_processor, self.matcher)
+                )
+                self._owner_pid = os.getpid()
+            return self._executor
+
+    def _parse(self, cv_texts: List[str], cached: List[Optional[Dict]]) -> Iterator:
+        """Start parsing a batch; results are consumed later, in order"""
+        if self.workers <= 1 or len(cv_texts) < 2:
+            _init_worker(self.cv_processor, self.matcher)
+            return iter([_parse_cv(cv_text, fields) for cv_text, fields in zip(cv_texts, cached)])
+        chunksize = max(1, len(cv_texts) // (self.workers * 4))
+        return self._get_executor().map(_parse_cv, cv_texts, cached, chunksize=chunksize)
+
+    def ingest(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Create a candidate from each record and yield one result per record
+        Args:
+            records: Dicts with 'cv_text' and optionally 'cv_file_path'; an
+                'error' key marks a record that could not be read
+        """
+        records = iter(records)
+        pending = None
+        while True:
+            batch = list(islice(records, self.BATCH_SIZE))
+            if not batch:
+                break
+
+            valid = [record for record in batch if 'error' not in record and isinstance(record.get('cv_text'), str)]
+            cv_texts = [record['cv_text'] for record in valid]
+            keys = [self.cv_cache.key(cv_text) for cv_text in cv_texts]
+            cached = self.cv_cache.get_many(keys)
+            misses = {id(record): key for record, key, fields in zip(valid, keys, cached) if fields is None}
+            parsed = (batch, valid, misses, self._parse(cv_texts, cached))
+
+            # Write the previous batch while this one is being parsed
+            if pending is not None:
+                yield from self._store(*pending)
+            pending = parsed
+
+        if pending is not None:
+            yield from self._store(*pending)
+
+    def _store(self, batch: List[Dict], valid: List[Dict], misses: Dict[int, str], parsed: Iterator) -> Iterator[Dict]:
+        parsed_by_record = dict(zip(map(id, valid), parsed))
+        for record_id, key in misses.items():
+            processed_data, _, error = parsed_by_record[record_id]
+            if not error:
+                self.cv_cache.put(key, processed_data)
+
+        results = []
+        to_create = []
+        for record in batch:
+            result = {'record': record.get('record')}
+            results.append(result)
+
+            if 'error' in record:
+                result.update(status='error', error=record['error'])
+                continue
+            if not isinstance(record.get('cv_text'), str):
+                result.update(status='error', error='Missing required field: cv_text')
+                continue
+
+            processed_data, profile, error = parsed_by_record[id(record)]
+            if error:
+                result.update(status='error', error=f'Could not process CV: {error}')
+            elif not processed_data.get('email'):
+                result.update(status='error', error='Could not extract email from CV')
+            elif not processed_data.get('first_name') or not processed_data.get('last_name'):
+                result.update(status='error', error='Could not extract name from CV')
+            else:
+                result['email'] = processed_data['email']
+                to_create.append((result, record, processed_data, profile))
+
+        # One query for every email of the batch
+        emails = {processed_data['email'] for _, _, processed_data, _ in to_create}
+        existing = dict(
+            db.session.query(Candidate.email, Candidate.id).filter(Candidate.email.in_(emails))
+        ) if emails else {}
+
+        # Skill rows of the whole batch, looked up (or created) together
+        skills = Skill.resolve(Skill.canonical_names(
+            skill for _, _, processed_data, _ in to_create for skill in processed_data.get('skills') or []
+        ))
+
+        created = []
+        created_by_email = {}
+        repeated = []
+        for result, record, processed_data, profile in to_create:
+            email = processed_data['email']
+            if email in existing:
+                result.update(status='duplicate', candidate_id=existing[email])
+                continue
+            if email in created_by_email:
+                repeated.append((result, email))
+                continue
+
+            candidate = self._new_candidate(record, processed_data, skills)
+            created_by_email[email] = candidate
+            created.append((result, record, processed_data, profile, candidate))
+
+        created_ids = {}
+        candidates = [candidate for *_, candidate in created]
+        try:
+            if candidates:
+                # Flushed as multi-row INSERTs returning the new ids
+                db.session.add_all(candidates)
+                db.session.flush()
+                created_ids = {candidate.email: candidate.id for candidate in candidates}
+                self.candidate_sync.candidates_created([(candidate, profile) for *_, profile, candidate in created])
+            # Also persists newly cached parse results
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            created_ids, candidates = self._store_each(created)
+
+        # Keep the session from growing with every batch
+        for candidate in candidates:
+            if candidate in db.session:
+                db.session.expunge(candidate)
+
+        for result, *_ in created:
+            if 'status' not in result and result['email'] in created_ids:
+                result.update(status='created', candidate_id=created_ids[result['email']])
+        for result, email in repeated:
+            if email in created_ids:
+                result.update(status='duplicate', candidate_id=created_ids[email])
+            else:
+                result.update(status='error', error='Could not save batch')
+
+        yield from results
+
+    def _new_candidate(self, record: Dict, processed_data: Dict, skills: Dict[str, Skill]) -> Candidate:
+        candidate = Candidate(
+            first_name=processed_data['first_name'],
+            last_name=processed_data['last_name'],
+            email=processed_data['email'],
+            phone=processed_data.get('phone'),
+            linkedin_profile=processed_data.get('linkedin_profile'),
+            total_experience_years=processed_data.get('total_experience_years'),
+            education=processed_data.get('education'),
+            parsed_cv_text=processed_data.get('parsed_cv_text'),
+            cv_file_path=record.get('cv_file_path')
+        )
+        if processed_data.get('skills'):
+            candidate.set_skills_list(processed_data['skills'], skills)
+        return candidate
+
+    def _store_each(self, created: List[Tuple]) -> Tuple[Dict[str, int], List[Candidate]]:
+        """
+        Save the candidates of a failed batch one by one, each in a savepoint
+        Records whose candidate still fails get an error result; returns the
+        ids of the saved candidates by email and the saved candidates.
+        """
+        created_ids = {}
+        candidates = []
+        for result, record, processed_data, profile, _ in created:
+            try:
+                with db.session.begin_nested():
+                    skills = Skill.resolve(Skill.canonical_names(processed_data.get('skills') or []))
+                    candidate = self._new_candidate(record, processed_data, skills)
+                    db.session.add(candidate)
+                    db.session.flush()
+                    self.candidate_sync.candidates_created([(candidate, profile)])
+            except Exception as e:
+                result.update(status='error', error=f'Could not save candidate: {e}')
+                continue
+            created_ids[candidate.email] = candidate.id
+            candidates.append(candidate)
+
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for result, *_ in created:
+                result.update(status='error', error=f'Could not save batch: {e}')
+            return {}, []
+        return created_ids, candidates
+
+def read_ndjson(lines: Iterable[bytes], start: int = 0) -> Iterator[Dict]:
+    """Turn NDJSON lines into ingestion records, numbering them from start"""
+    number = start
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                record = {'error': 'Record must be a JSON object'}
+        except ValueError as e:
+            record = {'error': f'Invalid JSON: {e}'}
+        record['record'] = number
+        number += 1
+        yield record
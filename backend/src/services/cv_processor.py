@@ -1,166 +1,325 @@
 import re
 import json
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import os
+from src.services.skill_taxonomy import SKILL_KEYWORDS, skill_matcher
+from src.services.text_stream import TEXT_CHUNK_SIZE, iter_text_chunks
 
-class CVProcessor:
-    """Service for processing and extracting information from CV text"""
+# Compiled once at import, shared by every CV processed
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Phone number formats, in priority order
+PHONE_PATTERNS = [
+    re.compile(r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'),  # US format
+    re.compile(r'\+?([0-9]{1,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})'),  # International
+    re.compile(r'\b\d{10}\b')  # Simple 10-digit
+]
+
+# Every phone format needs at least this many digits
+PHONE_MIN_DIGITS = 10
+
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/([a-zA-Z0-9-]+)', re.IGNORECASE)
+
+# Statements of total experience, in priority order (matched against lowercased lines)
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s*of\s*experience'),
+    re.compile(r'(\d+)\+?\s*years?\s*experience'),
+    re.compile(r'experience:\s*(\d+)\+?\s*years?'),
+    re.compile(r'(\d+)\+?\s*yrs?\s*experience'),
+    re.compile(r'(\d+)\+?\s*year\s*experience')
+]
+
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+
+EDUCATION_KEYWORDS = [
+    'bachelor', 'master', 'phd', 'doctorate', 'mba', 'degree',
+    'university', 'college', 'institute', 'school',
+    'b.s.', 'b.a.', 'm.s.', 'm.a.', 'ph.d.'
+]
+EDUCATION_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in EDUCATION_KEYWORDS))
+
+NAME_PREFIX_PATTERN = re.compile(r'^(mr\.?|ms\.?|mrs\.?|dr\.?)\s+', re.IGNORECASE)
+
+# The name is looked for in this many first lines
+NAME_LINES = 5
+
+# Lines handed to the skill matcher at once; keywords never span lines, so
+# matching a block finds the same skills with far fewer calls
+SKILL_BLOCK_LINES = 256
+
+CURRENT_YEAR = 2025
+
+def normalize_cv_text(cv_text: str) -> str:
+    """Canonical form of a CV: one line ending, no byte order mark, no trailing whitespace"""
+    text = cv_text.lstrip('\ufeff').replace('\r\n', '\n').replace('\r', '\n')
+    return '\n'.join(line.rstrip() for line in text.split('\n')).rstrip('\n')
+
+def iter_normalized_lines(chunks: Iterable[str], max_line_length: Optional[int] = None) -> Iterator[str]:
+    """
+    Lines of normalize_cv_text(text) for a text given in chunks, without joining the chunks
+    Lines cut between chunks, even inside a CRLF pair, are rejoined. With
+    max_line_length, a line growing past it is split at its last space so that
+    a text without line breaks is still read in bounded pieces.
+    """
+    pending = []  # Start of the current line, cut by chunk boundaries
+    pending_length = 0
+    blank_lines = 0  # Held back, as trailing blank lines are dropped
+    started = False
+    carriage_return = False
+
+    def complete(line):
+        nonlocal blank_lines
+        line = line.rstrip()
+        if not line:
+            blank_lines += 1
+            return
+        yield from [''] * blank_lines
+        blank_lines = 0
+        yield line
+
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip('\ufeff')
+            if not chunk:
+                continue
+            started = True
+        if carriage_return:
+            chunk = '\r' + chunk
+        carriage_return = chunk.endswith('\r')
+        if carriage_return:
+            chunk = chunk[:-1]
+
+        lines = chunk.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        for line in lines[:-1]:
+            if pending:
+                pending.append(line)
+                line = ''.join(pending)
+                pending = []
+                pending_length = 0
+            yield from complete(line)
+
+        pending.append(lines[-1])
+        pending_length += len(lines[-1])
+        while max_line_length and pending_length > max_line_length:
+            line = ''.join(pending)
+            cut = line.rfind(' ', 0, max_line_length) + 1 or max_line_length
+            yield from complete(line[:cut])
+            pending = [line[cut:]]
+            pending_length = len(pending[0])
+
+    if carriage_return:
+        yield from complete(''.join(pending))
+        pending = []
+    if pending:
+        yield from complete(''.join(pending))
+
+class CVFieldScanner:
+    """
+    Extracts every CV field in a single pass over the CV's lines
+    Each field stops being searched for once it is settled, and cheap
+    substring/digit checks skip lines that cannot match a field's patterns.
+    Matches do not span lines. fields limits the scan to some of FIELDS, so
+    a caller needing one field does not pay for the others.
+    """
     
-    def __init__(self):
-        self.skills_keywords = [
-            # Programming languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-            'swift', 'kotlin', 'scala', 'r', 'matlab', 'sql', 'html', 'css',
-            
-            # Frameworks and libraries
-            'react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'node.js', 'laravel',
-            'rails', 'asp.net', 'jquery', 'bootstrap', 'tensorflow', 'pytorch', 'pandas', 'numpy',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'oracle', 'sqlite',
-            
-            # Cloud and DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'gitlab', 'github',
-            'terraform', 'ansible', 'linux', 'unix',
-            
-            # Other technical skills
-            'machine learning', 'artificial intelligence', 'data science', 'big data', 'blockchain',
-            'cybersecurity', 'network security', 'project management', 'agile', 'scrum', 'devops'
-        ]
+    FIELDS = ('name', 'contact', 'experience', 'education', 'skills')
     
-    def extract_contact_info(self, cv_text: str) -> Dict[str, Optional[str]]:
-        """Extract contact information from CV text"""
-        contact_info = {
-            'email': None,
-            'phone': None,
-            'linkedin': None
-        }
+    def __init__(self, skill_matcher=skill_matcher, fields: Iterable[str] = FIELDS):
+        self.skill_matcher = skill_matcher
+        fields = set(fields)
+        # Fields not asked for are never searched
+        self.name_lines = NAME_LINES if 'name' in fields else 0
+        self.want_contact = 'contact' in fields
+        self.want_experience = 'experience' in fields
+        self.want_education = 'education' in fields
+        self.want_skills = 'skills' in fields
+        self.line_count = 0
+        self.email = None
+        self.phone = None
+        self.phone_priority = len(PHONE_PATTERNS)  # Index of the best phone pattern matched so far
+        self.linkedin = None
+        self.name = None
+        self.experience = None
+        self.experience_priority = len(EXPERIENCE_PATTERNS)
+        # Work history years, only needed while no experience is stated
+        self.year_count = 0
+        self.min_year = None
+        self.max_year = None
+        self.education_lines = []
+        self.skills = set()
+        self._skill_lines = []
+    
+    def feed(self, line: str) -> None:
+        """Process the next line of the CV"""
+        index = self.line_count
+        self.line_count += 1
+        line_lower = line.lower()
         
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, cv_text)
-        if email_match:
-            contact_info['email'] = email_match.group()
+        if self.name is None and index < self.name_lines:
+            self.name = self._match_name(line)
         
-        # Extract phone number (various formats)
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',  # US format
-            r'\+?([0-9]{1,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})',  # International
-            r'\b\d{10}\b'  # Simple 10-digit
-        ]
+        if self.want_contact:
+            self._feed_contact(line, line_lower)
         
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, cv_text)
-            if phone_match:
-                contact_info['phone'] = phone_match.group()
-                break
+        if self.want_experience:
+            self._feed_experience(line, line_lower)
         
-        # Extract LinkedIn profile
-        linkedin_pattern = r'linkedin\.com/in/([a-zA-Z0-9-]+)'
-        linkedin_match = re.search(linkedin_pattern, cv_text, re.IGNORECASE)
-        if linkedin_match:
-            contact_info['linkedin'] = f"https://linkedin.com/in/{linkedin_match.group(1)}"
+        if self.want_education and EDUCATION_PATTERN.search(line_lower):
+            self.education_lines.append(line.strip())
         
-        return contact_info
+        if self.want_skills:
+            self._skill_lines.append(line)
+            if len(self._skill_lines) >= SKILL_BLOCK_LINES:
+                self._collect_skills()
     
-    def extract_skills(self, cv_text: str) -> List[str]:
-        """Extract skills from CV text"""
-        cv_lower = cv_text.lower()
-        found_skills = []
+    def _feed_contact(self, line: str, line_lower: str) -> None:
+        if self.email is None and '@' in line:
+            email_match = EMAIL_PATTERN.search(line)
+            if email_match:
+                self.email = email_match.group()
         
-        for skill in self.skills_keywords:
-            if skill.lower() in cv_lower:
-                found_skills.append(skill.title())
+        # A later line can still hold a higher-priority phone format
+        if self.phone_priority > 0 and sum(map(line.count, '0123456789')) >= PHONE_MIN_DIGITS:
+            for priority in range(self.phone_priority):
+                phone_match = PHONE_PATTERNS[priority].search(line)
+                if phone_match:
+                    self.phone = phone_match.group()
+                    self.phone_priority = priority
+                    break
         
-        # Remove duplicates while preserving order
-        return list(dict.fromkeys(found_skills))
+        if self.linkedin is None and 'linkedin' in line_lower:
+            linkedin_match = LINKEDIN_PATTERN.search(line)
+            if linkedin_match:
+                self.linkedin = f"https://linkedin.com/in/{linkedin_match.group(1)}"
     
-    def extract_experience_years(self, cv_text: str) -> Optional[float]:
-        """Extract total years of experience from CV text"""
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*of\s*experience',
-            r'(\d+)\+?\s*years?\s*experience',
-            r'experience:\s*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*yrs?\s*experience',
-            r'(\d+)\+?\s*year\s*experience'
-        ]
+    def _feed_experience(self, line: str, line_lower: str) -> None:
+        if self.experience_priority > 0 and ('year' in line_lower or 'yr' in line_lower):
+            for priority in range(self.experience_priority):
+                experience_match = EXPERIENCE_PATTERNS[priority].search(line_lower)
+                if experience_match:
+                    self.experience = float(experience_match.group(1))
+                    self.experience_priority = priority
+                    break
         
-        for pattern in experience_patterns:
-            match = re.search(pattern, cv_text, re.IGNORECASE)
-            if match:
-                return float(match.group(1))
-        
-        # Try to infer from work history dates
-        year_pattern = r'\b(19|20)\d{2}\b'
-        years = re.findall(year_pattern, cv_text)
-        if len(years) >= 2:
-            years = [int(year) for year in years]
-            min_year = min(years)
-            max_year = max(years)
-            current_year = 2025  # Current year
+        if self.experience is None and ('19' in line or '20' in line):
+            years = [int(year) for year in YEAR_PATTERN.findall(line)]
+            if years:
+                self.year_count += len(years)
+                self.min_year = min(years) if self.min_year is None else min(self.min_year, *years)
+                self.max_year = max(years) if self.max_year is None else max(self.max_year, *years)
+    
+    def _collect_skills(self) -> None:
+        self.skill_matcher.collect('\n'.join(self._skill_lines), self.skills)
+        self._skill_lines = []
+    
+    def feed_lines(self, lines: Iterable[str]) -> 'CVFieldScanner':
+        for line in lines:
+            self.feed(line)
+        return self
+    
+    def _match_name(self, line: str) -> Optional[Dict[str, str]]:
+        line = line.strip()
+        if line and not any(char.isdigit() for char in line) and '@' not in line:
+            # Remove common prefixes
+            line = NAME_PREFIX_PATTERN.sub('', line)
             
+            # Split into words and take first two as first and last name
+            words = line.split()
+            if 2 <= len(words) <= 4:  # Reasonable name length
+                return {
+                    'first_name': words[0],
+                    'last_name': words[-1]
+                }
+        return None
+    
+    def experience_years(self) -> Optional[float]:
+        """Stated experience, or an estimate from work history dates"""
+        if self.experience is not None:
+            return self.experience
+        
+        if self.year_count >= 2:
             # Estimate experience as difference between earliest and current year
-            if max_year >= current_year - 1:  # Recent work
-                return float(current_year - min_year)
+            if self.max_year >= CURRENT_YEAR - 1:  # Recent work
+                return float(CURRENT_YEAR - self.min_year)
         
         return None
     
+    def skills_list(self) -> List[str]:
+        """Skills found, in taxonomy order"""
+        self._collect_skills()
+        return [skill.title() for skill in self.skill_matcher.in_order(self.skills)]
+
+class CVProcessor:
+    """Service for processing and extracting information from CV text"""
+    
+    # Bump whenever a change to the extraction rules changes process_cv output,
+    # so that cached results of the old rules are no longer used
+    RULES_VERSION = 1
+    
+    def __init__(self):
+        self.skills_keywords = SKILL_KEYWORDS
+        self.skill_matcher = skill_matcher
+    
+    def scan(self, cv_text: str, fields: Iterable[str] = CVFieldScanner.FIELDS) -> CVFieldScanner:
+        """Run the single-pass field scanner over a CV, for the given fields only"""
+        return CVFieldScanner(self.skill_matcher, fields).feed_lines(cv_text.split('\n'))
+    
+    def scan_chunks(self, chunks: Iterable[str]) -> CVFieldScanner:
+        """Run the scanner over the normalized lines of a CV given in chunks, with bounded memory"""
+        lines = iter_normalized_lines(chunks, max_line_length=TEXT_CHUNK_SIZE)
+        return CVFieldScanner(self.skill_matcher).feed_lines(lines)
+    
+    def extract_contact_info(self, cv_text: str) -> Dict[str, Optional[str]]:
+        """Extract contact information from CV text"""
+        scanner = self.scan(cv_text, ['contact'])
+        return {
+            'email': scanner.email,
+            'phone': scanner.phone,
+            'linkedin': scanner.linkedin
+        }
+    
+    def extract_skills(self, cv_text: str) -> List[str]:
+        """Extract skills from CV text"""
+        # One pass over the CV for the whole taxonomy, on word boundaries
+        return [skill.title() for skill in self.skill_matcher.find(cv_text)]
+    
+    def extract_experience_years(self, cv_text: str) -> Optional[float]:
+        """Extract total years of experience from CV text"""
+        return self.scan(cv_text, ['experience']).experience_years()
+    
     def extract_education(self, cv_text: str) -> Optional[str]:
         """Extract education information from CV text"""
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'doctorate', 'mba', 'degree',
-            'university', 'college', 'institute', 'school',
-            'b.s.', 'b.a.', 'm.s.', 'm.a.', 'ph.d.'
-        ]
-        
-        lines = cv_text.split('\n')
-        education_lines = []
-        
-        for line in lines:
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in education_keywords):
-                education_lines.append(line.strip())
-        
+        education_lines = self.scan(cv_text, ['education']).education_lines
         return '\n'.join(education_lines) if education_lines else None
     
     def extract_name(self, cv_text: str) -> Dict[str, Optional[str]]:
         """Extract first and last name from CV text"""
-        lines = cv_text.split('\n')
-        
-        # Usually the name is in the first few lines
-        for line in lines[:5]:
-            line = line.strip()
-            if line and not any(char.isdigit() for char in line) and '@' not in line:
-                # Remove common prefixes
-                line = re.sub(r'^(mr\.?|ms\.?|mrs\.?|dr\.?)\s+', '', line, flags=re.IGNORECASE)
-                
-                # Split into words and take first two as first and last name
-                words = line.split()
-                if 2 <= len(words) <= 4:  # Reasonable name length
-                    return {
-                        'first_name': words[0],
-                        'last_name': words[-1]
-                    }
-        
-        return {'first_name': None, 'last_name': None}
+        return self.scan(cv_text, ['name']).name or {'first_name': None, 'last_name': None}
     
     def process_cv(self, cv_text: str) -> Dict:
-        """Process CV text and extract all relevant information"""
-        contact_info = self.extract_contact_info(cv_text)
-        name_info = self.extract_name(cv_text)
-        skills = self.extract_skills(cv_text)
-        experience_years = self.extract_experience_years(cv_text)
-        education = self.extract_education(cv_text)
+        """Process CV text and extract all relevant information in one pass"""
+        # Extraction only sees the normalized text, so equivalent CVs give equal results
+        if len(cv_text) > TEXT_CHUNK_SIZE:
+            # Large texts are read in chunks rather than copied line by line
+            scanner = self.scan_chunks(iter_text_chunks(cv_text))
+        else:
+            scanner = self.scan(normalize_cv_text(cv_text))
+        
+        processed_data = self.fields(scanner)
+        processed_data['parsed_cv_text'] = cv_text
+        return processed_data
+    
+    def fields(self, scanner: CVFieldScanner) -> Dict:
+        """Structured CV data from a finished scan"""
+        name_info = scanner.name or {'first_name': None, 'last_name': None}
         
         return {
             'first_name': name_info['first_name'],
             'last_name': name_info['last_name'],
-            'email': contact_info['email'],
-            'phone': contact_info['phone'],
-            'linkedin_profile': contact_info['linkedin'],
-            'skills': skills,
-            'total_experience_years': experience_years,
-            'education': education,
-            'parsed_cv_text': cv_text
+            'email': scanner.email,
+            'phone': scanner.phone,
+            'linkedin_profile': scanner.linkedin,
+            'skills': scanner.skills_list(),
+            'total_experience_years': scanner.experience_years(),
+            'education': '\n'.join(scanner.education_lines) if scanner.education_lines else None
         }
-
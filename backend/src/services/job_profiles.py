@@ -0,0 +1,38 @@
+from typing import List
+from src.models.job import Job, db
+from src.services.ai_matcher import AIMatchingEngine, JobProfile
+
+class OpenJobProfiles:
+    """
+    Matching profiles of every open job
+    Open jobs are listed by id and updated_at only; the text of a job is read
+    and profiled just when the matching engine holds no profile for that
+    version of it, so repeated rankings over thousands of open jobs reuse the
+    profiles built the first time.
+    """
+
+    # Jobs whose text is loaded together when their profiles are missing
+    CHUNK_SIZE = 500
+
+    def __init__(self, matcher: AIMatchingEngine = None):
+        self.matcher = matcher or AIMatchingEngine()
+
+    def load(self) -> List[JobProfile]:
+        """Profiles of the open jobs, ordered by job id"""
+        versions = db.session.query(Job.id, Job.updated_at).filter_by(status='open').order_by(Job.id).all()
+
+        profiles = {}
+        missing = []
+        for job_id, updated_at in versions:
+            profile = self.matcher.cached_job_profile(job_id, updated_at.isoformat() if updated_at else None)
+            if profile is None:
+                missing.append(job_id)
+            else:
+                profiles[job_id] = profile
+
+        for start in range(0, len(missing), self.CHUNK_SIZE):
+            for job in Job.query.filter(Job.id.in_(missing[start:start + self.CHUNK_SIZE]), Job.status == 'open'):
+                profiles[job.id] = self.matcher.get_job_profile(job.to_dict())
+
+        # A job closed or deleted between the two queries is left out
+        return [profiles[job_id] for job_id, _ in versions if job_id in profiles]
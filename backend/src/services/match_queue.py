@@ -0,0 +1,161 @@
+import multiprocessing
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from src.models.match_job import MatchJob, MatchJobResult, db
+from src.services.application_scoring import ApplicationScorer
+
+class MatchJobQueue:
+    """
+    Database-backed queue of batch matching jobs
+    Requests only enqueue a MatchJob; worker processes claim queued jobs,
+    score their applications chunk by chunk and commit scores, results and
+    progress after every chunk so that status polls see partial results and
+    an interrupted job resumes where it stopped.
+    """
+
+    CHUNK_SIZE = int(os.getenv('MATCH_QUEUE_CHUNK_SIZE', '100'))
+
+    # Seconds an idle worker waits before looking for new jobs
+    POLL_INTERVAL = float(os.getenv('MATCH_QUEUE_POLL_INTERVAL', '1.0'))
+
+    # Running jobs without progress for this long are assumed orphaned by a dead worker
+    STALE_AFTER = int(os.getenv('MATCH_QUEUE_STALE_AFTER', '600'))
+
+    def __init__(self, scorer: ApplicationScorer = None):
+        self.scorer = scorer or ApplicationScorer()
+
+    def enqueue(self, application_ids: List[int]) -> MatchJob:
+        """Queue a batch of applications for scoring (committed immediately)"""
+        job = MatchJob(status='queued')
+        job.set_application_ids(application_ids)
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def claim_next(self, worker_name: str) -> Optional[MatchJob]:
+        """Atomically take the oldest queued job, or return None if there is none"""
+        while True:
+            row = db.session.query(MatchJob.id).filter_by(status='queued').order_by(MatchJob.id).first()
+            if row is None:
+                return None
+
+            # Only one worker can move the job out of 'queued'
+            claimed = MatchJob.query.filter_by(id=row[0], status='queued').update({
+                MatchJob.status: 'running',
+                MatchJob.worker: worker_name,
+                MatchJob.started_at: datetime.utcnow(),
+                MatchJob.updated_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                return MatchJob.query.get(row[0])
+
+    def requeue_stale(self) -> int:
+        """Put running jobs whose worker stopped reporting progress back in the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.STALE_AFTER)
+        requeued = MatchJob.query.filter(
+            MatchJob.status == 'running',
+            MatchJob.updated_at < cutoff
+        ).update({MatchJob.status: 'queued', MatchJob.worker: None}, synchronize_session=False)
+        db.session.commit()
+        return requeued
+
+    def process(self, job: MatchJob) -> None:
+        """Score a claimed job, committing after every chunk"""
+        try:
+            application_ids = job.get_application_ids()
+
+            # Resume after the last committed chunk
+            for start in range(job.processed, len(application_ids), self.CHUNK_SIZE):
+                chunk = application_ids[start:start + self.CHUNK_SIZE]
+                results = self.scorer.score(chunk)
+
+                db.session.add_all([
+                    MatchJobResult(
+                        match_job_id=job.id,
+                        application_id=result['application_id'],
+                        candidate_id=result.get('candidate_id'),
+                        job_id=result.get('job_id'),
+                        matching_score=result.get('matching_score'),
+                        error=result['error'][:500] if 'error' in result else None
+                    )
+                    for result in results
+                ])
+                job.processed = start + len(chunk)
+                db.session.commit()
+
+            job.status = 'completed'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            job = MatchJob.query.get(job.id)
+            job.status = 'failed'
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+    def run_worker(self, worker_name: str = None, max_idle: float = None) -> int:
+        """
+        Process queued jobs until stopped
+        Args:
+            worker_name: Name recorded on claimed jobs
+            max_idle: Return after this many idle seconds (run forever if None)
+        Returns the number of jobs processed
+        """
+        worker_name = worker_name or f'{socket.gethostname()}:{os.getpid()}'
+        processed = 0
+        idle_since = time.monotonic()
+
+        while True:
+            job = self.claim_next(worker_name)
+            if job is None:
+                if max_idle is not None and time.monotonic() - idle_since >= max_idle:
+                    return processed
+                time.sleep(self.POLL_INTERVAL)
+                continue
+
+            self.process(job)
+            processed += 1
+            idle_since = time.monotonic()
+
+    def run_pool(self, app, processes: int) -> None:
+        """Run worker processes against the app's database until interrupted"""
+        if processes <= 1:
+            _worker_main(app, self)
+            return
+
+        # fork shares the app and loaded models with the workers
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_worker_main, args=(app, self)) for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+
+    def job_status(self, job: MatchJob, after: int = 0) -> dict:
+        """Progress of a job and the results committed so far"""
+        results = MatchJobResult.query.filter(
+            MatchJobResult.match_job_id == job.id,
+            MatchJobResult.id > after
+        ).order_by(MatchJobResult.id).all()
+
+        status = job.to_dict()
+        status['results'] = [result.to_dict() for result in results]
+        status['next_after'] = results[-1].id if results else after
+        return status
+
+def _worker_main(app, queue: MatchJobQueue) -> None:
+    """Entry point of a worker process"""
+    with app.app_context():
+        # Connections inherited from the parent must not be shared
+        db.engine.dispose()
+        queue.run_worker()
@@ -0,0 +1,297 @@
+import json
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import insert
+from src.models.candidate import CandidateTerm
+from src.models.job import Job
+from src.models.match_score import MatchScore, MatchScoreRefresh, db
+from src.services.ai_matcher import AIMatchingEngine, CandidateProfile, JobProfile
+from src.services.candidate_features import CandidateFeatureStore
+from src.services.candidate_index import CandidateIndex
+from src.services.job_profiles import OpenJobProfiles
+
+class MatchScoreStore:
+    """
+    Materialized matching scores of candidates for open jobs
+    Writes to a job or candidate only mark it for refresh, in the same
+    transaction. The match score worker then recomputes just the affected
+    rows: every candidate sharing a term with a changed job, or every open job
+    sharing a term with a changed candidate (the pairs the candidate index
+    would score). Rankings read the best rows through the (job_id, score DESC)
+    index instead of scoring every candidate.
+    """
+
+    # Seconds an idle worker waits before looking for new refreshes
+    POLL_INTERVAL = float(os.getenv('MATCH_SCORE_POLL_INTERVAL', '1.0'))
+
+    # Running refreshes older than this are assumed orphaned by a dead worker
+    STALE_AFTER = int(os.getenv('MATCH_SCORE_STALE_AFTER', '600'))
+
+    # Candidates scored and inserted together when refreshing a job
+    CHUNK_SIZE = 500
+
+    def __init__(self, matcher: AIMatchingEngine = None, features: CandidateFeatureStore = None,
+                 index: CandidateIndex = None):
+        self.matcher = matcher or AIMatchingEngine()
+        self.features = features or CandidateFeatureStore(self.matcher)
+        self.index = index or CandidateIndex(self.matcher)
+        self.job_profiles = OpenJobProfiles(self.matcher)
+
+    def request_refresh(self, entity: str, entity_id: int) -> None:
+        """Mark the scores of a job or candidate for recomputation (caller commits)"""
+        now = datetime.utcnow()
+        updated = MatchScoreRefresh.query.filter_by(entity=entity, entity_id=entity_id).update({
+            MatchScoreRefresh.status: 'pending',
+            MatchScoreRefresh.requested_at: now,
+            MatchScoreRefresh.error: None
+        }, synchronize_session=False)
+        if not updated:
+            db.session.add(MatchScoreRefresh(entity=entity, entity_id=entity_id, status='pending', requested_at=now))
+
+    def job_changed(self, job_id: int) -> None:
+        """A job was created, or its text or status changed (caller commits)"""
+        self.request_refresh('job', job_id)
+
+    def candidate_changed(self, candidate_id: int) -> None:
+        """A candidate was created, or its matching features changed (caller commits)"""
+        self.request_refresh('candidate', candidate_id)
+
+    def candidates_created(self, candidate_ids: List[int]) -> None:
+        """Mark freshly inserted candidates for scoring in bulk (caller commits)"""
+        now = datetime.utcnow()
+        db.session.add_all([
+            MatchScoreRefresh(entity='candidate', entity_id=candidate_id, status='pending', requested_at=now)
+            for candidate_id in candidate_ids
+        ])
+
+    def job_deleted(self, job_id: int) -> None:
+        """Drop the stored scores of a job about to be deleted (caller commits)"""
+        MatchScore.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+        MatchScoreRefresh.query.filter_by(entity='job', entity_id=job_id).delete(synchronize_session=False)
+
+    def candidate_deleted(self, candidate_id: int) -> None:
+        """Drop the stored scores of a candidate about to be deleted (caller commits)"""
+        MatchScore.query.filter_by(candidate_id=candidate_id).delete(synchronize_session=False)
+        MatchScoreRefresh.query.filter_by(entity='candidate', entity_id=candidate_id).delete(synchronize_session=False)
+
+    def candidates_current(self) -> bool:
+        """Whether no candidate is waiting for (or failed) its score refresh"""
+        return not db.session.query(
+            MatchScoreRefresh.query.filter(
+                MatchScoreRefresh.entity == 'candidate',
+                MatchScoreRefresh.status.in_(('pending', 'running', 'failed'))
+            ).exists()
+        ).scalar()
+
+    def current_jobs(self, job_ids: Iterable[int], check_candidates: bool = True) -> Set[int]:
+        """
+        Open jobs whose stored scores are complete and computed by the current engine
+        A job that is not open has no stored scores (its refresh deletes them),
+        so it is never current and callers score it live. While a candidate
+        refresh is outstanding, a job's stored ranking may miss a new candidate
+        or hold an edited one's old score, so no job is current.
+        check_candidates=False skips that check, for callers reading the scores
+        of one candidate whose own refresh they checked.
+        """
+        if check_candidates and not self.candidates_current():
+            return set()
+        job_ids = list(job_ids)
+        current = set()
+        for start in range(0, len(job_ids), self.CHUNK_SIZE):
+            rows = db.session.query(MatchScoreRefresh.entity_id).join(
+                Job, Job.id == MatchScoreRefresh.entity_id
+            ).filter(
+                MatchScoreRefresh.entity == 'job',
+                MatchScoreRefresh.entity_id.in_(job_ids[start:start + self.CHUNK_SIZE]),
+                Job.status == 'open',
+                MatchScoreRefresh.status == 'done',
+                MatchScoreRefresh.engine_version == self.matcher.SCORING_VERSION
+            )
+            current.update(row[0] for row in rows)
+        return current
+
+    def candidate_current(self, candidate_id: int) -> bool:
+        """Whether the stored scores of a candidate reflect its current features"""
+        status = db.session.query(MatchScoreRefresh.status).filter_by(
+            entity='candidate', entity_id=candidate_id
+        ).scalar()
+        # Candidates never refreshed on their own are scored by job refreshes
+        return status is None or status == 'done'
+
+    def top_candidates(self, job_id: int, limit: Optional[int] = None,
+                       threshold: float = 0.0) -> List[Tuple[int, float]]:
+        """Stored (candidate id, score) pairs of a job, best first, ties by candidate id"""
+        query = db.session.query(MatchScore.candidate_id, MatchScore.score).filter(
+            MatchScore.job_id == job_id,
+            MatchScore.score >= threshold
+        ).order_by(MatchScore.score.desc(), MatchScore.candidate_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return [(candidate_id, score) for candidate_id, score in query]
+
+    def top_jobs(self, candidate_id: int, limit: Optional[int] = None,
+                 threshold: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        Stored (job id, score) pairs of a candidate, best first, ties by job id
+        Only open jobs whose stored scores are current are included.
+        """
+        query = db.session.query(MatchScore.job_id, MatchScore.score).join(
+            Job, Job.id == MatchScore.job_id
+        ).join(
+            MatchScoreRefresh,
+            (MatchScoreRefresh.entity == 'job') & (MatchScoreRefresh.entity_id == MatchScore.job_id)
+        ).filter(
+            MatchScore.candidate_id == candidate_id,
+            MatchScore.score >= threshold,
+            Job.status == 'open',
+            MatchScoreRefresh.status == 'done',
+            MatchScoreRefresh.engine_version == self.matcher.SCORING_VERSION
+        ).order_by(MatchScore.score.desc(), MatchScore.job_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return [(job_id, score) for job_id, score in query]
+
+    def candidate_terms(self, candidate_id: int) -> Set[str]:
+        """The terms the candidate index matches jobs to a candidate through"""
+        return {row[0] for row in db.session.query(CandidateTerm.term).filter_by(candidate_id=candidate_id)}
+
+    def count_for_job(self, job_id: int) -> int:
+        """Number of candidates with a stored score for a job"""
+        return MatchScore.query.filter_by(job_id=job_id).count()
+
+    def refresh_job(self, job_id: int) -> int:
+        """Recompute the stored scores of a job (caller commits); returns the rows written"""
+        MatchScore.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+        job = Job.query.get(job_id)
+        if job is None or job.status != 'open':
+            return 0
+
+        job_profile = self.matcher.get_job_profile(job.to_dict())
+        candidate_ids = self.index.find_candidates_for_job(job_profile)
+        written = 0
+        for start in range(0, len(candidate_ids), self.CHUNK_SIZE):
+            profiles = self.features.load(candidate_ids[start:start + self.CHUNK_SIZE])
+            written += self._write([(job_id, candidate_id, profile, job_profile)
+                                    for candidate_id, profile in profiles.items()])
+        return written
+
+    def refresh_candidate(self, candidate_id: int) -> int:
+        """Recompute the stored scores of a candidate (caller commits); returns the rows written"""
+        MatchScore.query.filter_by(candidate_id=candidate_id).delete(synchronize_session=False)
+        profile = self.features.load([candidate_id]).get(candidate_id)
+        if profile is None:
+            return 0
+
+        terms = self.candidate_terms(candidate_id)
+        pairs = [
+            (job_profile.job_id, candidate_id, profile, job_profile)
+            for job_profile in self.job_profiles.load()
+            if not terms.isdisjoint(self.index.extract_job_terms(job_profile))
+        ]
+        return self._write(pairs)
+
+    def _write(self, pairs: List[Tuple[int, int, CandidateProfile, JobProfile]]) -> int:
+        now = datetime.utcnow()
+        rows = []
+        for job_id, candidate_id, profile, job_profile in pairs:
+            details = self.matcher.get_match_details(profile, job_profile)
+            rows.append({
+                'job_id': job_id,
+                'candidate_id': candidate_id,
+                'score': details['overall_score'],
+                'breakdown': json.dumps(details['breakdown']),
+                'engine_version': self.matcher.SCORING_VERSION,
+                'computed_at': now
+            })
+        if rows:
+            db.session.execute(insert(MatchScore), rows)
+        return len(rows)
+
+    def refresh_all(self) -> int:
+        """Mark every open job, and every job with stored scores, for recomputation (caller commits)"""
+        job_ids = {row[0] for row in db.session.query(Job.id).filter_by(status='open')}
+        job_ids.update(row[0] for row in db.session.query(MatchScore.job_id).distinct())
+        for job_id in sorted(job_ids):
+            self.request_refresh('job', job_id)
+        return len(job_ids)
+
+    def claim_next(self, worker_name: str) -> Optional[MatchScoreRefresh]:
+        """Atomically take the oldest pending refresh, or return None if there is none"""
+        while True:
+            row = db.session.query(MatchScoreRefresh.entity, MatchScoreRefresh.entity_id).filter_by(
+                status='pending'
+            ).order_by(MatchScoreRefresh.requested_at).first()
+            if row is None:
+                return None
+
+            # Only one worker can move the refresh out of 'pending'
+            claimed = MatchScoreRefresh.query.filter_by(entity=row[0], entity_id=row[1], status='pending').update({
+                MatchScoreRefresh.status: 'running',
+                MatchScoreRefresh.worker: worker_name,
+                MatchScoreRefresh.started_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                return MatchScoreRefresh.query.get(tuple(row))
+
+    def requeue_stale(self) -> int:
+        """Put running refreshes whose worker died back in the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.STALE_AFTER)
+        requeued = MatchScoreRefresh.query.filter(
+            MatchScoreRefresh.status == 'running',
+            MatchScoreRefresh.started_at < cutoff
+        ).update({MatchScoreRefresh.status: 'pending', MatchScoreRefresh.worker: None}, synchronize_session=False)
+        db.session.commit()
+        return requeued
+
+    def process(self, refresh: MatchScoreRefresh) -> None:
+        """Recompute the scores of a claimed refresh and commit them"""
+        entity, entity_id = refresh.entity, refresh.entity_id
+        try:
+            if entity == 'job':
+                self.refresh_job(entity_id)
+            else:
+                self.refresh_candidate(entity_id)
+
+            # A change made while running set the refresh back to 'pending'; it is then run again
+            MatchScoreRefresh.query.filter_by(entity=entity, entity_id=entity_id, status='running').update({
+                MatchScoreRefresh.status: 'done',
+                MatchScoreRefresh.engine_version: self.matcher.SCORING_VERSION,
+                MatchScoreRefresh.computed_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            MatchScoreRefresh.query.filter_by(entity=entity, entity_id=entity_id, status='running').update({
+                MatchScoreRefresh.status: 'failed',
+                MatchScoreRefresh.error: str(e)
+            }, synchronize_session=False)
+            db.session.commit()
+
+    def run_worker(self, worker_name: str = None, max_idle: float = None) -> int:
+        """
+        Process pending refreshes until stopped
+        Args:
+            worker_name: Name recorded on claimed refreshes
+            max_idle: Return after this many idle seconds (run forever if None)
+        Returns the number of refreshes processed
+        """
+        worker_name = worker_name or f'{socket.gethostname()}:{os.getpid()}'
+        processed = 0
+        idle_since = time.monotonic()
+
+        while True:
+            refresh = self.claim_next(worker_name)
+            if refresh is None:
+                if max_idle is not None and time.monotonic() - idle_since >= max_idle:
+                    return processed
+                time.sleep(self.POLL_INTERVAL)
+                continue
+
+            self.process(refresh)
+            processed += 1
+            idle_since = time.monotonic()
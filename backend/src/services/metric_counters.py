@@ -0,0 +1,193 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+from sqlalchemy import event, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import PASSIVE_NO_INITIALIZE, get_history
+from src.models.agency import Commission
+from src.models.application import Application, db
+from src.models.candidate import Candidate
+from src.models.job import Job
+from src.models.metrics import MetricCounter
+
+# Counted models: counter prefix, status column (or None) and summed amount column (or None)
+TRACKED_MODELS = {
+    Job: ('jobs', 'status', None),
+    Candidate: ('candidates', None, None),
+    Application: ('applications', 'status', None),
+    Commission: ('commissions', 'status', 'amount')
+}
+
+# Stands for a column value that is not loaded and cannot be read during a flush
+UNKNOWN = object()
+
+def counter_names(prefix: str, status) -> List[str]:
+    """Counters a row of an entity with the given status contributes to"""
+    names = [f'{prefix}.total']
+    if status is not UNKNOWN:
+        names.append(f'{prefix}.status.{status if status is not None else "none"}')
+    return names
+
+def column_change(instance, column: str):
+    """Value of a column before and after the pending changes of an instance"""
+    history = get_history(instance, column, passive=PASSIVE_NO_INITIALIZE)
+    if history.added or history.deleted:
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        return old, new
+    if history.unchanged:
+        return history.unchanged[0], history.unchanged[0]
+    return UNKNOWN, UNKNOWN
+
+class MetricCounters:
+    """
+    Pipeline and financial counters maintained incrementally
+    Every flush that inserts or deletes a job, candidate, application or
+    commission, or changes the status (or a commission's amount) of one, adds
+    the matching deltas to metric_counters in the same transaction, so counts
+    are read in O(1) rather than by scanning the tables. This covers every
+    write path, including status changes, bulk CV ingestion and deletes.
+    Bulk Query.update()/delete() statements and writes made outside the
+    application bypass the flush; run the reconcile-metrics command afterwards
+    to rebuild the counters and report drift. An empty metric_counters table
+    (just added by db.create_all()) is seeded from the tables at startup or
+    on the first read.
+    """
+
+    def __init__(self, session=None):
+        session = session or db.session
+        # Registered once per process however many instances exist, so
+        # deltas are never applied twice
+        if not event.contains(session, 'after_flush', record_flush):
+            event.listen(session, 'after_flush', record_flush)
+
+    def read(self) -> Dict[str, Tuple[int, float]]:
+        """(count, amount) of every counter, seeded first if there are none"""
+        counters = self._stored()
+        if not counters and self.seed():
+            counters = self._stored()
+        return counters
+
+    def _stored(self) -> Dict[str, Tuple[int, float]]:
+        return {
+            name: (count, amount)
+            for name, count, amount in db.session.query(MetricCounter.name, MetricCounter.count, MetricCounter.amount)
+        }
+
+    def seed(self) -> bool:
+        """Count the counters from the tables if metric_counters is empty; returns whether it was"""
+        if db.session.query(MetricCounter.query.exists()).scalar():
+            return False
+        try:
+            self.reconcile(fix=True)
+        except IntegrityError:
+            # Another process seeded the counters first
+            db.session.rollback()
+        return True
+
+    def compute(self) -> Dict[str, Tuple[int, float]]:
+        """(count, amount) of every counter, counted from the tables"""
+        actual = {}
+        for model, (prefix, status_column, amount_column) in TRACKED_MODELS.items():
+            status = getattr(model, status_column) if status_column else None
+            amount = func.coalesce(func.sum(getattr(model, amount_column)), 0) if amount_column else None
+
+            columns = [func.count()]
+            if amount is not None:
+                columns.append(amount)
+            if status is None:
+                rows = [(UNKNOWN, *db.session.query(*columns).select_from(model).one())]
+            else:
+                rows = db.session.query(status, *columns).group_by(status).all()
+
+            total_count, total_amount = 0, 0.0
+            for row in rows:
+                count, row_amount = row[1], (row[2] if amount is not None else 0.0)
+                total_count += count
+                total_amount += row_amount
+                if row[0] is not UNKNOWN:
+                    actual[counter_names(prefix, row[0])[1]] = (count, float(row_amount))
+            actual[f'{prefix}.total'] = (total_count, float(total_amount))
+        return actual
+
+    def reconcile(self, fix: bool = True) -> List[Tuple[str, Tuple[int, float], Tuple[int, float]]]:
+        """
+        Compare the counters with the tables and optionally rewrite them
+        Returns (name, stored, actual) for every counter that drifted.
+        """
+        stored = self._stored()
+        actual = self.compute()
+        drift = []
+        for name in sorted(set(stored) | set(actual)):
+            stored_value = stored.get(name, (0, 0.0))
+            actual_value = actual.get(name, (0, 0.0))
+            if stored_value[0] != actual_value[0] or abs(stored_value[1] - actual_value[1]) > 1e-6:
+                drift.append((name, stored_value, actual_value))
+
+        if fix:
+            MetricCounter.query.delete(synchronize_session=False)
+            now = datetime.utcnow()
+            db.session.add_all([
+                MetricCounter(name=name, count=count, amount=amount, updated_at=now)
+                for name, (count, amount) in actual.items()
+            ])
+            db.session.commit()
+        return drift
+
+def record_flush(session, flush_context) -> None:
+    """Apply the counter deltas of a flush through the flushing connection"""
+    deltas = defaultdict(lambda: [0, 0.0])
+
+    def add(prefix, status, count, amount):
+        for name in counter_names(prefix, status):
+            deltas[name][0] += count
+            deltas[name][1] += amount
+
+    for instance in session.new:
+        tracked = TRACKED_MODELS.get(type(instance))
+        if tracked:
+            prefix, status_column, amount_column = tracked
+            status = getattr(instance, status_column) if status_column else UNKNOWN
+            add(prefix, status, 1, (getattr(instance, amount_column) or 0.0) if amount_column else 0.0)
+
+    for instance in session.deleted:
+        tracked = TRACKED_MODELS.get(type(instance))
+        if tracked:
+            prefix, status_column, amount_column = tracked
+            status = column_change(instance, status_column)[0] if status_column else UNKNOWN
+            amount = column_change(instance, amount_column)[0] if amount_column else 0.0
+            add(prefix, status, -1, -(amount or 0.0) if amount is not UNKNOWN else 0.0)
+
+    for instance in session.dirty:
+        tracked = TRACKED_MODELS.get(type(instance))
+        if not tracked or instance in session.deleted or not tracked[1]:
+            continue
+        prefix, status_column, amount_column = tracked
+        old_status, new_status = column_change(instance, status_column)
+        old_amount, new_amount = column_change(instance, amount_column) if amount_column else (0.0, 0.0)
+        if UNKNOWN in (old_status, new_status, old_amount, new_amount):
+            continue
+        if old_status == new_status and old_amount == new_amount:
+            continue
+        # Move the row from its old status bucket to the new one
+        add(prefix, old_status, -1, -(old_amount or 0.0))
+        add(prefix, new_status, 1, new_amount or 0.0)
+
+    now = datetime.utcnow()
+    for name, (count, amount) in sorted(deltas.items()):
+        if count or amount:
+            increment(session.connection(), MetricCounter.__table__, {'name': name}, {'count': count, 'amount': amount}, updated_at=now)
+
+def increment(connection, table, key: Dict, deltas: Dict, **values) -> None:
+    """Add deltas to the columns of the row of table with the given key, creating it if needed"""
+    update = table.update().where(*[table.c[column] == value for column, value in key.items()]).values(
+        **{column: table.c[column] + delta for column, delta in deltas.items()}, **values
+    )
+    if connection.execute(update).rowcount:
+        return
+    # First write to this row; another transaction may create it first
+    try:
+        with connection.begin_nested():
+            connection.execute(table.insert().values(**key, **deltas, **values))
+    except IntegrityError:
+        connection.execute(update)
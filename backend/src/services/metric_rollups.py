@@ -0,0 +1,161 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import case, event, func, insert, null, select
+from sqlalchemy.exc import IntegrityError
+from src.models.application import Application, db
+from src.models.candidate import Candidate
+from src.models.job import Job
+from src.models.metrics import ApplicationStatusEvent, DailyMetric
+from src.services.metric_counters import UNKNOWN, column_change, increment
+
+# Daily metrics counting the rows created each day
+CREATED_METRICS = {
+    'applications': Application,
+    'candidates': Candidate,
+    'jobs': Job
+}
+
+# Applications entering this status count as hires
+HIRED_STATUS = 'hired'
+
+def as_date(value) -> Optional[date]:
+    """A DATE() result as a date (SQLite returns 'YYYY-MM-DD' strings)"""
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+class MetricRollups:
+    """
+    Daily counts of new applications, candidates and jobs, and of hires
+    Every flush that creates one of these rows, or moves an application into
+    the hired status, adds to its day in daily_metrics in the same
+    transaction. Status changes of applications are also appended to
+    application_status_events. Window totals then sum at most a quarter of
+    daily rows instead of scanning the tables by timestamp. An empty
+    daily_metrics table (just added by db.create_all()) is seeded from the
+    tables at startup or on the first read.
+    """
+
+    # Trailing windows reported, in days (today included)
+    TIME_RANGES = {
+        'week': 7,
+        'month': 30,
+        'quarter': 90
+    }
+
+    METRICS = [*CREATED_METRICS, 'hires']
+
+    def __init__(self, session=None):
+        session = session or db.session
+        # Registered once per process however many instances exist
+        if not event.contains(session, 'after_flush', record_flush):
+            event.listen(session, 'after_flush', record_flush)
+        self._seeded = False
+
+    def windows(self, now: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """Count of every metric in every window, e.g. {'hires': {'week': 3, ...}, ...}"""
+        if not self._seeded:
+            self.seed()
+        today = (now or datetime.utcnow()).date()
+        starts = {window: today - timedelta(days=days - 1) for window, days in self.TIME_RANGES.items()}
+
+        totals = {metric: dict.fromkeys(starts, 0) for metric in self.METRICS}
+        rows = db.session.query(
+            DailyMetric.metric,
+            *[func.coalesce(func.sum(case((DailyMetric.day >= start, DailyMetric.count), else_=0)), 0)
+              for start in starts.values()]
+        ).filter(DailyMetric.day >= min(starts.values())).group_by(DailyMetric.metric)
+        for metric, *counts in rows:
+            if metric in totals:
+                totals[metric] = dict(zip(starts, counts))
+        return totals
+
+    def rebuild(self) -> int:
+        """
+        Recount every day from the tables and the status events
+        Hires come from application_status_events, so only hires recorded
+        since the events were introduced are counted. Returns the number of
+        daily rows.
+        """
+        counts = defaultdict(int)
+        for metric, model in CREATED_METRICS.items():
+            day = func.date(model.created_at)
+            for value, count in db.session.query(day, func.count()).group_by(day):
+                if value is not None:
+                    counts[(metric, as_date(value))] += count
+
+        day = func.date(ApplicationStatusEvent.created_at)
+        hires = db.session.query(day, func.count()).filter(
+            ApplicationStatusEvent.to_status == HIRED_STATUS
+        ).group_by(day)
+        for value, count in hires:
+            counts[('hires', as_date(value))] += count
+
+        DailyMetric.query.delete(synchronize_session=False)
+        db.session.add_all([
+            DailyMetric(metric=metric, day=day, count=count)
+            for (metric, day), count in counts.items()
+        ])
+        db.session.commit()
+        return len(counts)
+
+    def seed(self) -> bool:
+        """
+        Rebuild the daily rows if daily_metrics is empty; returns whether it was
+        Applications already hired without a 'hired' event first get one at
+        their updated_at, the best estimate of the hire date, as the
+        migration does.
+        """
+        self._seeded = True
+        if db.session.query(DailyMetric.query.exists()).scalar():
+            return False
+
+        hired_event = ApplicationStatusEvent.query.filter(
+            ApplicationStatusEvent.application_id == Application.id,
+            ApplicationStatusEvent.to_status == HIRED_STATUS
+        ).exists()
+        db.session.execute(insert(ApplicationStatusEvent).from_select(
+            ['application_id', 'from_status', 'to_status', 'created_at'],
+            select(
+                Application.id, null(), Application.status,
+                func.coalesce(Application.updated_at, Application.created_at, func.current_timestamp())
+            ).where(Application.status == HIRED_STATUS, ~hired_event)
+        ))
+        try:
+            self.rebuild()
+        except IntegrityError:
+            # Another process seeded the rollups first
+            db.session.rollback()
+        return True
+
+def record_flush(session, flush_context) -> None:
+    """Append the status events and daily counts of a flush"""
+    now = datetime.utcnow()
+    events = []
+    deltas = defaultdict(int)
+
+    for instance in session.new:
+        for metric, model in CREATED_METRICS.items():
+            if type(instance) is model:
+                deltas[(metric, (instance.created_at or now).date())] += 1
+        if type(instance) is Application:
+            events.append({'application_id': instance.id, 'from_status': None, 'to_status': instance.status, 'created_at': now})
+            if instance.status == HIRED_STATUS:
+                deltas[('hires', now.date())] += 1
+
+    for instance in session.dirty:
+        if type(instance) is not Application or instance in session.deleted:
+            continue
+        old_status, new_status = column_change(instance, 'status')
+        if UNKNOWN in (old_status, new_status) or old_status == new_status:
+            continue
+        events.append({'application_id': instance.id, 'from_status': old_status, 'to_status': new_status, 'created_at': now})
+        if new_status == HIRED_STATUS:
+            deltas[('hires', now.date())] += 1
+
+    connection = session.connection() if events or deltas else None
+    if events:
+        connection.execute(ApplicationStatusEvent.__table__.insert(), events)
+    for (metric, day), count in sorted(deltas.items()):
+        increment(connection, DailyMetric.__table__, {'metric': metric, 'day': day}, {'count': count})
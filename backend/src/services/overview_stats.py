@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy import event, func
+from src.models.agency import Commission
+from src.models.application import Application, db
+from src.models.candidate import Candidate
+from src.models.job import Job
+from src.services.metric_counters import MetricCounters
+from src.services.metric_rollups import MetricRollups
+
+class OverviewStats:
+    """
+    Dashboard summary statistics, cached briefly
+    Totals and per-status figures are read from the metric counters and the
+    week/month/quarter figures from the daily rollups (see
+    src.services.metric_counters and src.services.metric_rollups). The result
+    is kept for TTL seconds and dropped once a transaction that wrote
+    applications, commissions, jobs or candidates commits. The cache is per
+    process, so a write made by another process shows after at most TTL
+    seconds.
+    """
+
+    # Seconds the statistics are served from memory (0 disables the cache)
+    TTL = float(os.getenv('OVERVIEW_STATS_TTL', '30'))
+
+    # Statuses reported in applications.by_status
+    APPLICATION_STATUSES = ['applied', 'reviewed', 'interviewed', 'hired', 'rejected']
+
+    # Writes to these models invalidate the cache
+    WATCHED_MODELS = (Application, Commission, Job, Candidate)
+
+    def __init__(self, counters: Optional[MetricCounters] = None, rollups: Optional[MetricRollups] = None,
+                 ttl: Optional[float] = None, session=None):
+        self.counters = counters or MetricCounters(session)
+        self.rollups = rollups or MetricRollups(session)
+        self.ttl = self.TTL if ttl is None else ttl
+        self._cached = None
+        self._expires = 0.0
+        # Bumped by every invalidation, so a result computed meanwhile is not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._changed_key = f'overview_stats_changed_{id(self)}'
+
+        session = session or db.session
+        event.listen(session, 'after_flush', self._after_flush)
+        event.listen(session, 'do_orm_execute', self._on_execute)
+        event.listen(session, 'after_commit', self._after_commit)
+
+    def get(self) -> Dict:
+        """The statistics, from the cache while it is fresh"""
+        with self._lock:
+            if self._cached is not None and time.monotonic() < self._expires:
+                return self._cached
+            generation = self._generation
+
+        stats = self.compute()
+        with self._lock:
+            if self.ttl > 0 and generation == self._generation:
+                self._cached = stats
+                self._expires = time.monotonic() + self.ttl
+        return stats
+
+    def invalidate(self) -> None:
+        """Drop the cached statistics"""
+        with self._lock:
+            self._cached = None
+            self._generation += 1
+
+    def compute(self) -> Dict:
+        """Read the counters and daily rollups"""
+        counters = self.counters.read()
+        trends = self.rollups.windows()
+
+        def count(name):
+            return counters.get(name, (0, 0.0))[0]
+
+        candidates_active = db.session.query(func.count(func.distinct(Application.candidate_id))).scalar()
+
+        return {
+            'jobs': {
+                'total': count('jobs.total'),
+                'active': count('jobs.status.open'),
+                'new_last_week': trends['jobs']['week']
+            },
+            'candidates': {
+                'total': count('candidates.total'),
+                'new_last_week': trends['candidates']['week'],
+                'active': candidates_active
+            },
+            'applications': {
+                'total': count('applications.total'),
+                'by_status': {
+                    status: count(f'applications.status.{status}')
+                    for status in self.APPLICATION_STATUSES
+                },
+                'hires': trends['hires']
+            },
+            'financials': {
+                'pending_commissions': count('commissions.status.pending'),
+                'total_payouts': counters.get('commissions.status.paid', (0, 0.0))[1]
+            },
+            'trends': trends
+        }
+
+    def _after_flush(self, session, flush_context) -> None:
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(instance, self.WATCHED_MODELS):
+                session.info[self._changed_key] = True
+                return
+
+    def _on_execute(self, orm_execute_state) -> None:
+        # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+        if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, self.WATCHED_MODELS):
+            orm_execute_state.session.info[self._changed_key] = True
+
+    def _after_commit(self, session) -> None:
+        if session.info.pop(self._changed_key, False):
+            self.invalidate()
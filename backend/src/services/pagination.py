@@ -0,0 +1,54 @@
+from typing import Iterable, List, Optional, Tuple
+from flask import url_for
+
+# Rows per page when paging without an explicit limit, and the largest limit
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def read_page_args(args) -> Tuple[Optional[int], Optional[int]]:
+    """after_id and limit of a list request; raises ValueError"""
+    after_id = args.get('after_id', type=int)
+    limit = args.get('limit', type=int)
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    return after_id, limit
+
+def read_names(args, name: str, allowed: Iterable[str]) -> Optional[List[str]]:
+    """Comma-separated names of a request argument, checked against allowed; None if absent"""
+    value = args.get(name)
+    if value is None:
+        return None
+    allowed = list(allowed)
+    names = [part.strip() for part in value.split(',') if part.strip()]
+    if any(part not in allowed for part in names):
+        raise ValueError(f'Invalid {name}. Must be among: {allowed}')
+    return names
+
+def fetch_page(query, id_column, after_id: Optional[int], limit: Optional[int]) -> Tuple[list, Optional[int]]:
+    """
+    Rows of a query in id order, a single page when after_id or limit is given
+    Returns the rows and the after_id of the next page (None on the last page).
+    """
+    query = query.order_by(id_column)
+    if after_id is None and limit is None:
+        return query.all(), None
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    # One extra row tells whether there is a next page
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+def add_next_page_headers(response, next_cursor, endpoint: str, args, cursor: str = 'after_id', **values):
+    """Point the X-Next-After-Id (X-Next-<Cursor>) and Link headers of a page at the next one"""
+    if next_cursor is not None:
+        header = '-'.join(part.capitalize() for part in cursor.split('_'))
+        response.headers[f'X-Next-{header}'] = str(next_cursor)
+        # Route values win over a query argument of the same name (?job_id= on /jobs/<job_id>/...)
+        next_args = {name: value for name, value in args.to_dict().items() if name not in values}
+        next_args[cursor] = next_cursor
+        response.headers['Link'] = f'<{url_for(endpoint, **next_args, **values)}>; rel="next"'
+    return response
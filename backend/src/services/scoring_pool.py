@@ -0,0 +1,102 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from src.services.ai_matcher import AIMatchingEngine, CandidateProfile, JobProfile
+
+# Matcher of the current worker process, set by _init_worker
+_worker_matcher = None
+
+def _init_worker(matcher: AIMatchingEngine) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+def _rank_shard(job_profile: JobProfile, candidates: List[Tuple[Any, CandidateProfile]],
+                limit: Optional[int], threshold: float) -> List[Tuple[Any, float]]:
+    return _worker_matcher.rank_candidates(candidates, job_profile, limit=limit, threshold=threshold)
+
+def _score_shard(job_profiles: Dict[Hashable, JobProfile],
+                 pairs: List[Tuple[CandidateProfile, Hashable]]) -> List[float]:
+    return [_worker_matcher.calculate_matching_score(profile, job_profiles[job_key]) for profile, job_key in pairs]
+
+class ScoringPool:
+    """
+    Optional process pool spreading AIMatchingEngine scoring across CPU cores
+    Candidate profiles are split into one contiguous shard per worker and each
+    shard travels with the job profiles it is scored against, so workers never
+    touch the database or reparse a job. Results are merged in the parent and
+    are identical to in-process scoring. Disabled unless MATCH_POOL_WORKERS > 1.
+    """
+
+    WORKERS = int(os.getenv('MATCH_POOL_WORKERS', '0'))
+
+    # Below this many candidates the pickling overhead outweighs the extra cores
+    MIN_BATCH = int(os.getenv('MATCH_POOL_MIN_BATCH', '5000'))
+
+    def __init__(self, matcher: AIMatchingEngine = None, workers: int = None, min_batch: int = None):
+        self.matcher = matcher or AIMatchingEngine()
+        self.workers = self.WORKERS if workers is None else workers
+        self.min_batch = self.MIN_BATCH if min_batch is None else min_batch
+        self._executor = None
+        self._owner_pid = None
+        self._lock = threading.Lock()
+
+    def should_use(self, count: int) -> bool:
+        """Whether a batch of this many candidates is worth sending to the pool"""
+        return self.workers > 1 and count >= self.min_batch
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            # A pool inherited through fork (e.g. by a match worker) is not usable
+            if self._executor is None or self._owner_pid != os.getpid():
+                # fork hands the matcher to workers without re-importing the app
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_init_worker,
+                    initargs=(self.matcher,)
+                )
+                self._owner_pid = os.getpid()
+            return self._executor
+
+    def _shards(self, items: Sequence) -> List[Sequence]:
+        """Split items into at most one contiguous shard per worker"""
+        size = -(-len(items) // self.workers)
+        return [items[start:start + size] for start in range(0, len(items), size)]
+
+    def rank(self, job_profile: JobProfile, candidates: Sequence[Tuple[Any, CandidateProfile]],
+             limit: Optional[int] = None, threshold: float = 0.0) -> List[Tuple[Any, float]]:
+        """Rank candidates like AIMatchingEngine.rank_candidates, one shard per worker"""
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_rank_shard, job_profile, list(shard), limit, threshold)
+            for shard in self._shards(candidates)
+        ]
+
+        # Shards are contiguous, so a stable merge keeps ties in input order
+        merged = heapq.merge(*(future.result() for future in futures), key=lambda item: -item[1])
+        return list(itertools.islice(merged, limit))
+
+    def score(self, pairs: Sequence[Tuple[CandidateProfile, Hashable]],
+              job_profiles: Dict[Hashable, JobProfile]) -> List[float]:
+        """Matching scores of (candidate profile, job key) pairs, in order"""
+        executor = self._get_executor()
+        futures = []
+        for shard in self._shards(pairs):
+            shard_jobs = {job_key: job_profiles[job_key] for job_key in {job_key for _, job_key in shard}}
+            futures.append(executor.submit(_score_shard, shard_jobs, list(shard)))
+
+        scores = []
+        for future in futures:
+            scores.extend(future.result())
+        return scores
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None and self._owner_pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,158 @@
+import re
+from typing import Dict, Iterable, List
+
+# Technical skills recognised in CVs, candidate skill lists and job texts
+SKILL_KEYWORDS = [
+    # Programming languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+    'swift', 'kotlin', 'scala', 'r', 'matlab', 'sql', 'html', 'css',
+
+    # Frameworks and libraries
+    'react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'node.js', 'laravel',
+    'rails', 'asp.net', 'jquery', 'bootstrap', 'tensorflow', 'pytorch', 'pandas', 'numpy',
+
+    # Databases
+    'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'oracle', 'sqlite',
+
+    # Cloud and DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'gitlab', 'github',
+    'terraform', 'ansible', 'linux', 'unix',
+
+    # Other technical skills
+    'machine learning', 'artificial intelligence', 'ai', 'data science', 'big data', 'blockchain',
+    'cybersecurity', 'network security', 'project management', 'agile', 'scrum', 'devops'
+]
+
+# Keywords that are also everyday words; in free text they only count when written like this
+EXACT_CASE_KEYWORDS = {
+    'go': 'Go',
+    'r': 'R'
+}
+
+class SkillMatcher:
+    """
+    Finds every keyword of a skill taxonomy in a text in a single pass
+    The keywords are compiled into one trie-shaped regular expression (a
+    prefix automaton), so the text is scanned once instead of once per keyword. Matches must stand on
+    word boundaries: 'java' is not found in 'javascript' nor 'sql' in 'mysql'.
+    """
+
+    def __init__(self, keywords: Iterable[str] = None, exact_case: Dict[str, str] = None):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in (keywords or SKILL_KEYWORDS)))
+        self.exact_case = EXACT_CASE_KEYWORDS if exact_case is None else exact_case
+        self._positions = {keyword: position for position, keyword in enumerate(self.keywords)}
+
+        trie = self._trie_pattern(self.keywords)
+        self._pattern = re.compile(r'(?<!\w)(' + trie + r')(?!\w)')
+        # Zero-width variant reporting every start position, so that overlapping
+        # keywords ('big data' and 'data science' in 'big data science') are all found
+        self._overlap_pattern = re.compile(r'(?<!\w)(?=(' + trie + r')(?!\w))')
+        # For the rare texts whose lowercase form has a different length
+        self._ignorecase_pattern = re.compile(self._overlap_pattern.pattern, re.IGNORECASE)
+
+        self._exact_case_patterns = {
+            keyword: re.compile(r'(?<!\w)' + re.escape(written) + r'(?!\w)')
+            for keyword, written in self.exact_case.items()
+        }
+
+        # Only the longest keyword starting at a position is reported, so remember
+        # the shorter keywords it contains at that position ('node' in 'node.js')
+        self._implied = {
+            keyword: [other for other in self.keywords
+                      if other != keyword and keyword.startswith(other) and not _is_word_char(keyword[len(other)])]
+            for keyword in self.keywords
+        }
+
+        # Keywords inside which another keyword may start
+        self._overlapping = {
+            keyword for keyword in self.keywords
+            if any(
+                not _is_word_char(keyword[index - 1]) and _is_word_char(keyword[index]) and
+                any(other.startswith(keyword[index:]) or keyword[index:].startswith(other) for other in self.keywords)
+                for index in range(1, len(keyword))
+            )
+        }
+
+    def _trie_pattern(self, keywords: List[str]) -> str:
+        """Alternation of keywords sharing prefixes, trying longer keywords first"""
+        branches = {}
+        ends_here = False
+        for keyword in keywords:
+            if keyword:
+                branches.setdefault(keyword[0], []).append(keyword[1:])
+            else:
+                ends_here = True
+
+        if not branches:
+            return ''
+
+        alternatives = [re.escape(char) + self._trie_pattern(suffixes) for char, suffixes in sorted(branches.items())]
+        pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        if ends_here:
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+
+    def find(self, text: str, exact_case: bool = True) -> List[str]:
+        """
+        Keywords occurring in a text, in taxonomy order
+        Args:
+            text: Text to search
+            exact_case: Require EXACT_CASE_KEYWORDS to be written in their
+                exact form; disable for texts that are lists of skills
+        """
+        found = set()
+        self.collect(text, found, exact_case)
+        return self.in_order(found)
+
+    def collect(self, text: str, found: set, exact_case: bool = True) -> None:
+        """Add the keywords occurring in a text to found, for texts read piece by piece"""
+        if not text:
+            return
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            matched = self._find_folded(text, exact_case)
+        else:
+            matched = set(self._pattern.findall(lowered))
+            if not matched:
+                return
+            if not matched.isdisjoint(self._overlapping):
+                matched.update(self._overlap_pattern.findall(lowered))
+
+            if exact_case:
+                for keyword, pattern in self._exact_case_patterns.items():
+                    if keyword in matched and not pattern.search(text):
+                        matched.discard(keyword)
+
+        for keyword in matched:
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._implied[keyword])
+
+    def _find_folded(self, text: str, exact_case: bool) -> set:
+        """Slower case-insensitive scan of the original text"""
+        found = set()
+        for match in self._ignorecase_pattern.finditer(text):
+            matched = match.group(1)
+            keyword = matched.lower()
+            if keyword not in self._positions:
+                continue  # Case-folded lookalike such as the Kelvin sign for 'k'
+            if exact_case and keyword in self.exact_case and matched != self.exact_case[keyword]:
+                continue
+            found.add(keyword)
+        return found
+
+    def in_order(self, keywords: Iterable[str]) -> List[str]:
+        """Sort found keywords in taxonomy order"""
+        return sorted(keywords, key=self._positions.__getitem__)
+
+    def find_in_skills(self, skills: Iterable[str]) -> List[str]:
+        """Keywords occurring in any of a candidate's skills, in taxonomy order"""
+        # Newlines keep multi-word keywords from spanning two skills
+        return self.find('\n'.join(skills), exact_case=False)
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+# Built once and shared by CVProcessor and AIMatchingEngine
+skill_matcher = SkillMatcher()
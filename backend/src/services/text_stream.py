@@ -0,0 +1,10 @@
+from typing import Iterator
+
+# Characters handled at a time when a text is processed in chunks; texts
+# longer than this are never copied whole by CV parsing or tokenization
+TEXT_CHUNK_SIZE = 1024 * 1024
+
+def iter_text_chunks(text: str, chunk_size: int = TEXT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield a text in pieces of at most chunk_size characters"""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
@@ -0,0 +1,75 @@
+import hashlib
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, List, Optional
+
+# Words of three or more word characters; shorter words are never kept, so
+# they are skipped by the regex engine instead of filtered afterwards
+TOKEN_PATTERN = re.compile(r'\w{3,}')
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before', 'after',
+    'above', 'below', 'between', 'among', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
+})
+
+class Tokenizer:
+    """
+    Splits text into the lowercase keyword tokens used for matching
+    A token is a run of word characters at least three long that is not a
+    stop word, found in a single regex pass over the lowercased text. With
+    intern_tokens, equal tokens share one string, which keeps large sets of
+    token counts small. tokenize_cached memoizes the tokens of recently seen
+    texts, for texts such as job descriptions that are tokenized repeatedly.
+    """
+
+    # Texts remembered by tokenize_cached
+    MEMO_SIZE = 256
+
+    # Longer texts are tokenized without being memoized
+    MEMO_MAX_LENGTH = 64 * 1024
+
+    def __init__(self, stop_words: FrozenSet[str] = STOP_WORDS, intern_tokens: bool = False,
+                 memo_size: Optional[int] = None):
+        self.stop_words = frozenset(stop_words)
+        self.intern_tokens = intern_tokens
+        self.memo_size = self.MEMO_SIZE if memo_size is None else memo_size
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    def tokenize(self, text: Optional[str]) -> List[str]:
+        """Tokens of a text, in order"""
+        if not text:
+            return []
+
+        stop_words = self.stop_words
+        tokens = [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in stop_words]
+        if self.intern_tokens:
+            tokens = list(map(sys.intern, tokens))
+        return tokens
+
+    def tokenize_cached(self, text: Optional[str]) -> List[str]:
+        """tokenize, reusing the result for a text seen recently"""
+        if not text or self.memo_size <= 0 or len(text) > self.MEMO_MAX_LENGTH:
+            return self.tokenize(text)
+
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._memo_lock:
+            tokens = self._memo.get(key)
+            if tokens is not None:
+                self._memo.move_to_end(key)
+                return list(tokens)
+
+        tokens = self.tokenize(text)
+        with self._memo_lock:
+            self._memo[key] = tuple(tokens)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return tokens
+
+# Shared by AIMatchingEngine instances
+tokenizer = Tokenizer()
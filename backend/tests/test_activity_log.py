@@ -0,0 +1,74 @@
+import json
+from src.models.activity import ActivityEvent
+from src.models.agency import RecruitmentAgency
+from src.models.application import db
+from src.services.activity_log import ActivityLog
+
+def test_application_writes_append_events(client, make_job, make_candidate, make_application):
+    application_id = make_application(make_job(title='Data Engineer'), make_candidate('c@example.com'))
+    client.put(f'/api/applications/{application_id}/status', json={'status': 'reviewed'})
+    client.delete(f'/api/applications/{application_id}')
+
+    events = ActivityEvent.query.order_by(ActivityEvent.id).all()
+    assert [(event.type, event.action, event.status) for event in events] == [
+        ('application', 'created', 'applied'),
+        ('application', 'status_changed', 'reviewed'),
+        ('application', 'deleted', 'reviewed')
+    ]
+    assert events[0].get_details() == {'candidate': 'Ann Lee', 'job': 'Data Engineer'}
+    assert events[1].get_details()['from_status'] == 'applied'
+
+def test_commission_writes_append_events(client, make_job, make_candidate, make_application):
+    application_id = make_application(make_job(), make_candidate('c@example.com'))
+    agency = RecruitmentAgency(name='Acme', contact_person='Bo', email='bo@acme.com', commission_rate=15.0)
+    db.session.add(agency)
+    db.session.commit()
+    commission_id = client.post('/api/commissions', json={
+        'application_id': application_id, 'agency_id': agency.id, 'amount': 500.0
+    }).json['id']
+
+    event = ActivityEvent.query.filter_by(type='commission').one()
+    assert (event.entity_id, event.application_id, event.status) == (commission_id, application_id, 'pending')
+    assert event.get_details() == {'amount': 500.0, 'agency': 'Acme'}
+
+def test_feed_pages_newest_first(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    applications = [make_application(job_id, make_candidate(f'c{i}@example.com')) for i in range(5)]
+
+    response = client.get('/api/activity?limit=2')
+    assert response.status_code == 200
+    assert [event['id'] for event in response.json['activities']] == applications[:-3:-1]
+
+    pages = [response.json['activities']]
+    while 'X-Next-Before' in response.headers:
+        response = client.get('/api/activity', query_string={'limit': 2, 'before': response.headers['X-Next-Before']})
+        pages.append(response.json['activities'])
+    assert [event['id'] for page in pages for event in page] == applications[::-1]
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+def test_feed_filters_types_and_refuses_bad_arguments(client, make_job, make_candidate, make_application):
+    make_application(make_job(), make_candidate('c@example.com'))
+
+    assert len(client.get('/api/activity?type=application').json['activities']) == 1
+    assert client.get('/api/activity?type=commission').json['activities'] == []
+    assert client.get('/api/activity?type=unknown').status_code == 400
+    assert client.get('/api/activity?before=not-a-cursor').status_code == 400
+    assert client.get('/api/activity?limit=0').status_code == 400
+
+def test_stream_sends_events_after_the_last_event_id(make_job, make_candidate, make_application, monkeypatch):
+    job_id = make_job()
+    make_application(job_id, make_candidate('a@example.com'))
+    make_application(job_id, make_candidate('b@example.com'))
+    first_id = ActivityEvent.query.order_by(ActivityEvent.id).first().id
+    monkeypatch.setattr(ActivityLog, 'STREAM_SECONDS', 0.2)
+    monkeypatch.setattr(ActivityLog, 'POLL_INTERVAL', 0.05)
+
+    messages = list(ActivityLog().stream(first_id))
+
+    assert messages[0].startswith('retry: ')
+    events = [message for message in messages if message.startswith('id: ')]
+    assert len(events) == 1
+    event_id, event_type, data = events[0].strip().split('\n')
+    assert event_id == f'id: {first_id + 1}'
+    assert event_type == 'event: activity'
+    assert json.loads(data[len('data: '):])['action'] == 'created'
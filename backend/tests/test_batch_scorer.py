@@ -0,0 +1,89 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+from src.models.candidate import CandidateFeatures, db
+from src.services.ai_matcher import AIMatchingEngine
+from src.services.batch_scorer import BatchScorer
+
+pytestmark = pytest.mark.skipif(not BatchScorer.is_available(), reason='NumPy/SciPy not installed')
+
+SKILLS = ['Python', 'Java', 'Docker', 'AWS', 'React', 'SQL', 'machine learning', 'Node.js developer']
+WORDS = ['python', 'java', 'docker', 'aws', 'react', 'sql', 'backend', 'api', 'cloud', 'testing', 'design']
+EDUCATION = [None, 'Diploma', 'Associate degree', 'Bachelor of Science', 'Master of Engineering', 'PhD']
+
+JOB_TEXTS = [
+    'Python Docker AWS, 5 years of experience, bachelor degree. Backend services',
+    'Senior Java engineer with SQL and a master degree',
+    'React and Node.js for the cloud team',
+    'Entry level machine learning role',
+    '0 years of experience required, python or java',
+    'Accounting assistant'
+]
+
+def random_profiles(matcher, seed, count=80):
+    rng = random.Random(seed)
+    return {
+        candidate_id: matcher.build_candidate_profile({
+            'skills': rng.sample(SKILLS, rng.randint(0, 4)),
+            'total_experience_years': rng.choice([None, 0, 0.5, 1, 3, 5, 8, 12]),
+            'education': rng.choice(EDUCATION),
+            'parsed_cv_text': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 30)))
+        })
+        for candidate_id in range(1, count + 1)
+    }
+
+@pytest.mark.parametrize('seed', range(5))
+def test_vectorized_scores_equal_scalar_scores(seed):
+    matcher = AIMatchingEngine()
+    profiles = random_profiles(matcher, seed)
+    scorer = BatchScorer(matcher)
+    matrix = scorer.build(profiles)
+    job_profiles = [matcher.build_job_profile_from_text(text) for text in JOB_TEXTS]
+    # IDF keyword weighting takes the other keyword branch
+    job_profiles.append(matcher.with_idf_weights(job_profiles[0], {'python': 2.5, 'docker': 1.5, 'backend': 1.0}))
+
+    scores = scorer.score_many(job_profiles, matrix.candidate_ids)
+
+    for row, job_profile in enumerate(job_profiles):
+        expected = [matcher.calculate_matching_score(profiles[candidate_id], job_profile)
+                    for candidate_id in matrix.candidate_ids]
+        assert scores[row].tolist() == pytest.approx(expected, abs=1e-9)
+
+def test_zero_years_required_is_met_by_any_experience():
+    matcher = AIMatchingEngine()
+    job_profile = matcher.build_job_profile_from_text(JOB_TEXTS[4])
+    assert job_profile.required_experience == 0
+
+    assert matcher.calculate_experience_match(0, job_profile) == 1.0
+    assert matcher.calculate_experience_match(3, job_profile) == 1.0
+    assert matcher.calculate_experience_match(None, job_profile) == 0.5
+
+def test_rank_matches_scalar_ranking():
+    matcher = AIMatchingEngine()
+    profiles = random_profiles(matcher, 11)
+    scorer = BatchScorer(matcher)
+    scorer.build(profiles)
+    job_profile = matcher.build_job_profile_from_text(JOB_TEXTS[0])
+
+    for limit, threshold in [(None, 0.0), (10, 0.0), (5, 0.6)]:
+        assert scorer.rank(job_profile, limit=limit, threshold=threshold) == \
+            matcher.rank_candidates(sorted(profiles.items()), job_profile, limit, threshold)
+
+def test_refresh_reloads_writes_committed_with_an_older_timestamp(client, make_candidate):
+    scorer = BatchScorer()
+    first_id = make_candidate('a@example.com')
+    assert scorer.refresh().candidate_ids == [first_id]
+
+    second_id = make_candidate('b@example.com')
+    # As if its transaction flushed before the matrix was built but committed after
+    CandidateFeatures.query.filter_by(candidate_id=second_id).update({'computed_at': datetime.utcnow() - timedelta(hours=1)})
+    db.session.commit()
+    assert scorer.refresh().candidate_ids == [first_id, second_id]
+
+    assert client.put(f'/api/candidates/{first_id}', json={'skills': ['Java']}).status_code == 200
+    assert scorer.refresh().profiles[first_id].skills == ['java']
+
+    assert client.delete(f'/api/candidates/{second_id}').status_code == 204
+    matrix = scorer.refresh()
+    assert matrix.candidate_ids == [first_id]
+    assert scorer.refresh() is matrix
@@ -0,0 +1,40 @@
+from src.models.candidate import CandidateFeatures, CandidateTerm, db
+from src.services.candidate_features import CandidateFeatureStore
+from src.services.candidate_index import CandidateIndex
+
+def test_job_finds_candidates_sharing_a_term(client, make_job, make_candidate):
+    job_id = make_job(requirements='Python and Docker')
+    python_id = make_candidate('a@example.com', skills=('Python',), parsed_cv_text='Python developer')
+    make_candidate('b@example.com', skills=('Accounting',), parsed_cv_text='Bookkeeping')
+    job = client.get(f'/api/jobs/{job_id}').json
+
+    assert CandidateIndex().find_candidates_for_job(job) == [python_id]
+
+def test_edits_reindex_the_candidate(client, make_candidate):
+    candidate_id = make_candidate('a@example.com', skills=('Python',), parsed_cv_text='Python developer')
+
+    assert client.put(f'/api/candidates/{candidate_id}', json={'skills': ['Kubernetes']}).status_code == 200
+
+    assert CandidateIndex().find_candidates(['kubernetes']) == [candidate_id]
+
+def test_empty_index_is_rebuilt(make_candidate):
+    candidate_ids = [make_candidate(f'c{i}@example.com') for i in range(2)]
+    terms = sorted((row.term, row.candidate_id) for row in CandidateTerm.query)
+    # As db.create_all() leaves it on a database that already has candidates
+    CandidateTerm.query.delete()
+    db.session.commit()
+
+    assert CandidateIndex().rebuild_if_empty() == 2
+    assert sorted((row.term, row.candidate_id) for row in CandidateTerm.query) == terms
+    assert CandidateIndex().find_candidates(['python']) == candidate_ids
+    assert CandidateIndex().rebuild_if_empty() == 0
+
+def test_outdated_features_are_rebuilt(make_candidate):
+    candidate_id = make_candidate('a@example.com')
+    CandidateFeatures.query.update({'version': 0})
+    db.session.commit()
+    assert CandidateFeatureStore().get(candidate_id) is None
+
+    assert CandidateFeatureStore().rebuild_if_empty() == 1
+    assert CandidateFeatureStore().get(candidate_id).skills == ['python', 'docker']
+    assert CandidateFeatureStore().rebuild_if_empty() == 0
@@ -0,0 +1,61 @@
+from src.models.candidate import CandidateFeatures
+from src.models.corpus import TermStatistic, db
+from src.services.corpus_stats import CorpusStatistics
+
+def frequency(term):
+    row = TermStatistic.query.get(term)
+    return row.document_frequency if row else 0
+
+def test_candidate_writes_count_each_document_once(client, make_candidate):
+    corpus = CorpusStatistics()
+    first_id = make_candidate('a@example.com', parsed_cv_text='python docker')
+    make_candidate('b@example.com', parsed_cv_text='python kubernetes')
+    assert corpus.document_count() == 2
+    assert (frequency('python'), frequency('docker'), frequency('kubernetes')) == (2, 1, 1)
+
+    assert client.put(f'/api/candidates/{first_id}', json={'parsed_cv_text': 'python rust'}).status_code == 200
+    assert corpus.document_count() == 2
+    assert (frequency('python'), frequency('docker'), frequency('rust')) == (2, 0, 1)
+
+    assert client.delete(f'/api/candidates/{first_id}').status_code == 204
+    assert corpus.document_count() == 1
+    assert (frequency('python'), frequency('rust'), frequency('kubernetes')) == (1, 0, 1)
+
+def test_candidates_with_outdated_features_are_not_counted_again(client, make_candidate):
+    corpus = CorpusStatistics()
+    candidate_id = make_candidate('a@example.com', parsed_cv_text='python docker')
+    # As after a CandidateProfile.VERSION bump
+    CandidateFeatures.query.update({'version': 0})
+    db.session.commit()
+
+    assert client.put(f'/api/candidates/{candidate_id}', json={'first_name': 'Anna'}).status_code == 200
+    assert corpus.document_count() == 1
+    assert frequency('python') == 1
+
+    CandidateFeatures.query.update({'version': 0})
+    db.session.commit()
+    assert client.delete(f'/api/candidates/{candidate_id}').status_code == 204
+    assert corpus.document_count() == 0
+
+def test_insert_conflicts_are_retried_without_counting_twice(app, monkeypatch):
+    corpus = CorpusStatistics()
+    corpus.add_document({'python'})
+    db.session.commit()
+
+    apply_terms = CorpusStatistics._apply_terms
+    attempts = []
+
+    def racing_apply_terms(self, chunk, delta):
+        apply_terms(self, chunk, delta)
+        if not attempts:
+            attempts.append(chunk)
+            # A concurrent request inserted a new term between the existence check and the insert
+            db.session.add(TermStatistic(term='python', document_frequency=1))
+
+    monkeypatch.setattr(CorpusStatistics, '_apply_terms', racing_apply_terms)
+    corpus.add_document({'python', 'rust'})
+    db.session.commit()
+
+    assert attempts
+    assert corpus.document_count() == 2
+    assert (frequency('python'), frequency('rust')) == (2, 1)
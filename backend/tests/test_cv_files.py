@@ -0,0 +1,135 @@
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+import pytest
+from src.models.application import Application, db
+from src.routes import application as application_routes
+from src.services import cv_files
+from src.services.cv_files import CVFileError, CVFileExtractor
+
+def make_pdf(pages):
+    pypdf = pytest.importorskip('pypdf')
+    writer = pypdf.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def make_docx(paragraphs, pages=None):
+    docx = pytest.importorskip('docx')
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    output = io.BytesIO()
+    document.save(output)
+    if pages is None:
+        return output.getvalue()
+
+    # Rewrite the page count Word stores on saving
+    patched = io.BytesIO()
+    with zipfile.ZipFile(output) as source, zipfile.ZipFile(patched, 'w') as target:
+        for entry in source.infolist():
+            content = source.read(entry)
+            if entry.filename == 'docProps/app.xml':
+                content = cv_files.DOCX_PAGES_PATTERN.sub(f'<Pages>{pages}</Pages>'.encode(), content)
+            target.writestr(entry, content)
+    return patched.getvalue()
+
+def sleep_forever(data, max_pages):
+    time.sleep(60)
+
+def test_extracts_text_pdf_and_docx():
+    extractor = CVFileExtractor()
+
+    assert extractor.extract('cv.txt', 'Ann Lee\nPython'.encode('utf-8-sig')) == ('Ann Lee\nPython', 'text')
+    assert extractor.extract('CV.PDF', make_pdf(2)) == ('\n', 'pdf')
+    assert extractor.extract('cv.docx', make_docx(['Ann Lee', 'Python'])) == ('Ann Lee\nPython', 'docx')
+
+def test_refuses_files_over_the_size_and_page_limits():
+    extractor = CVFileExtractor(max_bytes=64 * 1024, max_pages=3)
+
+    with pytest.raises(CVFileError) as error:
+        extractor.extract('cv.txt', b'x' * (64 * 1024 + 1))
+    assert error.value.status_code == 413
+    with pytest.raises(CVFileError, match='more than 3 pages'):
+        extractor.extract('cv.pdf', make_pdf(4))
+    with pytest.raises(CVFileError, match='more than 3 pages'):
+        extractor.extract('cv.docx', make_docx(['Ann Lee'], pages=4))
+    assert extractor.extract('cv.docx', make_docx(['Ann Lee'], pages=3)) == ('Ann Lee', 'docx')
+
+def test_refuses_content_that_does_not_match_the_extension():
+    extractor = CVFileExtractor()
+
+    with pytest.raises(CVFileError) as error:
+        extractor.extract('cv.exe', b'MZ')
+    assert error.value.status_code == 415
+    with pytest.raises(CVFileError, match='not a PDF'):
+        extractor.extract('cv.pdf', make_docx(['Ann Lee']))
+    with pytest.raises(CVFileError, match='not a DOCX'):
+        extractor.extract('cv.docx', make_pdf(1))
+    with pytest.raises(CVFileError, match='not UTF-8'):
+        extractor.extract('cv.txt', b'\xff\xfeA\x00')
+
+def test_extraction_past_the_timeout_is_killed(monkeypatch):
+    # The child process is forked, so it runs the patched parser
+    monkeypatch.setattr(cv_files, '_extract_pdf', sleep_forever)
+    extractor = CVFileExtractor(timeout=0.5)
+
+    started = time.monotonic()
+    with pytest.raises(CVFileError, match='longer than 0.5 seconds') as error:
+        extractor.extract('cv.pdf', b'%PDF-1.4 stalls the parser')
+    assert error.value.status_code == 422
+    assert time.monotonic() - started < 10
+    assert multiprocessing.active_children() == []
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    upload_dir = tmp_path / 'cvs'
+    monkeypatch.setattr(application_routes, 'CV_UPLOAD_DIR', str(upload_dir))
+    return upload_dir
+
+def upload(client, application_id, content, filename='cv.txt'):
+    return client.post(f'/api/applications/{application_id}/cv', data={'cv': (io.BytesIO(content), filename)},
+                       content_type='multipart/form-data')
+
+def test_upload_replaces_the_stored_file(client, make_job, make_candidate, make_application, upload_dir):
+    application_id = make_application(make_job(), make_candidate('a@example.com'))
+
+    response = upload(client, application_id, b'Ann Lee\nann@example.com\nPython and Docker')
+    assert response.status_code == 200, response.json
+    first_path = Application.query.get(application_id).cv_data['storage_path']
+    assert os.listdir(upload_dir) == [os.path.basename(first_path)]
+
+    assert upload(client, application_id, b'Ann Lee\nPython, Docker and AWS').status_code == 200
+    cv_data = Application.query.get(application_id).cv_data
+    assert cv_data['parsed_data']['skills'] == ['Python', 'Aws', 'Docker']
+    assert os.listdir(upload_dir) == [os.path.basename(cv_data['storage_path'])]
+
+def test_upload_removes_the_new_file_when_the_commit_fails(client, make_job, make_candidate, make_application,
+                                                            upload_dir, monkeypatch):
+    application_id = make_application(make_job(), make_candidate('a@example.com'))
+    assert upload(client, application_id, b'Ann Lee\nPython').status_code == 200
+    stored = os.listdir(upload_dir)
+
+    def failing_commit():
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(db.session, 'commit', failing_commit)
+    with pytest.raises(RuntimeError):
+        upload(client, application_id, b'Ann Lee\nPython and AWS')
+
+    # The previous file is still the one the application points to
+    assert os.listdir(upload_dir) == stored
+    monkeypatch.undo()
+    assert Application.query.get(application_id).cv_data['storage_path'].endswith(stored[0])
+
+def test_upload_refuses_unsupported_files_without_storing_them(client, make_job, make_candidate, make_application,
+                                                               upload_dir):
+    application_id = make_application(make_job(), make_candidate('a@example.com'))
+
+    assert upload(client, application_id, b'MZ', filename='cv.exe').status_code == 415
+    assert upload(client, application_id, b'', filename='cv.txt').status_code == 400
+    assert not upload_dir.exists()
@@ -0,0 +1,103 @@
+import random
+import pytest
+from benchmarks.cv_processing import (legacy_extract_contact_info, legacy_extract_education,
+                                      legacy_extract_experience_years, legacy_extract_name, make_cv)
+from src.services.ai_matcher import AIMatchingEngine
+from src.services.cv_processor import CVProcessor, normalize_cv_text, skill_matcher
+from src.services.text_stream import TEXT_CHUNK_SIZE, iter_text_chunks
+
+# Every line starts and ends with a letter or '.', so no match of the previous
+# extractors runs from one line into the next
+LINES = [
+    'Ann Lee', 'Dr. Maria del Carmen Ruiz', 'Mr Bob', 'Curriculum Vitae', 'Senior Engineer at Acme Corp',
+    'Email: ann.lee@example.com.', 'Contact ann@mail.example.org or bob@example.co.uk today',
+    'Phone: +44 20 7946 0958.', 'Mobile 555-123-4567 evenings', 'Call 5551234567 anytime', 'Tel. +1 (555) 987 6543.',
+    'Reference no 12 3456 7890 1234 only', 'Fax 020 7946 095 only',
+    'Profile: linkedin.com/in/ann-lee.', 'see LinkedIn.com/in/Bob99 too',
+    'Over 8 years of experience in backend development.', 'I have 3 years experience with Python.',
+    'Experience: 12 years.', 'About 4+ yrs experience abroad.', 'Total 1 year experience.', 'Years of practice.',
+    'Software Engineer, Acme Corp, 2016 - 2019.', 'Consultant from 2019 to 2024.', 'Trainee in 1998.',
+    'Bachelor of Science, University of Leeds.', 'Master degree in data science.', 'PhD. at the institute.',
+    'M.S. in physics.', 'Python, Docker, AWS and machine learning.', 'Go and R on Linux.', 'Worked on React.'
+]
+
+def random_cv(rng):
+    return '\n'.join(rng.choice(LINES + ['']) for _ in range(rng.randint(0, 20)))
+
+def legacy_fields(cv_text):
+    contact = legacy_extract_contact_info(cv_text)
+    name = legacy_extract_name(cv_text)
+    return {
+        'first_name': name['first_name'],
+        'last_name': name['last_name'],
+        'email': contact['email'],
+        'phone': contact['phone'],
+        'linkedin_profile': contact['linkedin'],
+        'skills': [skill.title() for skill in skill_matcher.find(cv_text)],
+        'total_experience_years': legacy_extract_experience_years(cv_text),
+        'education': legacy_extract_education(cv_text),
+        'parsed_cv_text': cv_text
+    }
+
+@pytest.mark.parametrize('seed', range(20))
+def test_single_pass_equals_per_field_extractors(seed):
+    rng = random.Random(seed)
+    processor = CVProcessor()
+
+    for _ in range(50):
+        cv_text = random_cv(rng)
+        assert processor.extract_contact_info(cv_text) == legacy_extract_contact_info(cv_text), cv_text
+        assert processor.extract_experience_years(cv_text) == legacy_extract_experience_years(cv_text), cv_text
+        assert processor.extract_education(cv_text) == legacy_extract_education(cv_text), cv_text
+        assert processor.extract_name(cv_text) == legacy_extract_name(cv_text), cv_text
+        assert processor.process_cv(cv_text) == legacy_fields(cv_text), cv_text
+
+def test_chunked_scan_of_a_large_cv_equals_per_field_extractors():
+    cv_text = make_cv(TEXT_CHUNK_SIZE * 2 + 1000, seed=3)
+
+    assert CVProcessor().process_cv(cv_text) == legacy_fields(cv_text)
+
+def test_matches_no_longer_span_lines():
+    processor = CVProcessor()
+
+    assert legacy_extract_experience_years('8 years of\nexperience') == 8.0
+    assert processor.extract_experience_years('8 years of\nexperience') is None
+    assert legacy_extract_contact_info('Phone: 555 123\n4567')['phone'] == ' 555 123\n4567'
+    assert processor.extract_contact_info('Phone: 555 123\n4567')['phone'] is None
+    # A phone number starting a line no longer takes the line break before it
+    assert legacy_extract_contact_info('Phone:\n555 123 4567')['phone'] == '\n555 123 4567'
+    assert processor.extract_contact_info('Phone:\n555 123 4567')['phone'] == '555 123 4567'
+
+STRADDLING_CV = '\ufeffAnn Lee  \r\nann.lee@example.com\r\nPhone: +44 20 7946 0958\r\n\r\n8 years of experience in Python\rBachelor, University of Leeds \n\n'
+
+def test_fields_straddling_chunk_boundaries_are_read_whole():
+    processor = CVProcessor()
+    expected = processor.fields(processor.scan(normalize_cv_text(STRADDLING_CV)))
+    assert expected['email'] == 'ann.lee@example.com' and expected['total_experience_years'] == 8.0
+
+    # Every cut, including inside the email, the phone number and a CRLF pair
+    for cut in range(len(STRADDLING_CV) + 1):
+        chunks = [STRADDLING_CV[:cut], STRADDLING_CV[cut:]]
+        assert processor.fields(processor.scan_chunks(chunks)) == expected, cut
+    for chunk_size in range(1, 12):
+        assert processor.fields(processor.scan_chunks(iter_text_chunks(STRADDLING_CV, chunk_size))) == expected
+
+def test_words_straddling_chunk_boundaries_are_tokenized_whole():
+    matcher = AIMatchingEngine()
+    text = 'Senior Python developer, Kubernetes and PostgreSQL;  machine-learning pipelines'
+    expected = matcher.preprocess_text(text)
+
+    for cut in range(len(text) + 1):
+        assert list(matcher.preprocess_chunks([text[:cut], text[cut:]])) == expected, cut
+    for chunk_size in range(1, 12):
+        assert list(matcher.preprocess_chunks(iter_text_chunks(text, chunk_size))) == expected
+
+def test_large_cv_with_an_email_across_the_chunk_boundary():
+    filler = 'Worked on internal tooling.\n' * (TEXT_CHUNK_SIZE // 28)
+    cv_text = 'Ann Lee\n' + filler[:TEXT_CHUNK_SIZE - 18] + ' ann.lee@example.com\nPython'
+
+    processed_data = CVProcessor().process_cv(cv_text)
+
+    assert cv_text.index('@') < TEXT_CHUNK_SIZE < cv_text.index('.com')
+    assert processed_data['email'] == 'ann.lee@example.com'
+    assert processed_data['skills'] == ['Python']
@@ -0,0 +1,58 @@
+import pytest
+from src.models.candidate import Candidate, CandidateFeatures, db
+from src.models.match_job import MatchJob
+from src.services.match_queue import MatchJobQueue
+
+@pytest.mark.parametrize('application_ids', [[True], ['1'], [1.5], [1, None]])
+def test_batch_refuses_ids_that_are_not_integers(client, application_ids):
+    response = client.post('/api/match/batch', json={'application_ids': application_ids})
+
+    assert response.status_code == 400
+    assert response.json['error'] == 'Invalid field: application_ids (must be a list of integers)'
+    assert MatchJob.query.count() == 0
+
+def test_batch_refuses_a_missing_list(client):
+    response = client.post('/api/match/batch', json={'application_ids': 1})
+
+    assert response.status_code == 400
+    assert response.json['error'] == 'Missing or invalid field: application_ids (must be a list)'
+
+def test_batch_queues_a_job(client):
+    response = client.post('/api/match/batch', json={'application_ids': [3, 1, 2]})
+
+    assert response.status_code == 202
+    assert response.json['status'] == 'queued'
+    assert response.json['total'] == 3
+    job_id = response.json['job_id']
+    assert response.json['status_url'] == f'/api/match/batch/{job_id}'
+    assert client.get(response.json['status_url']).json['status'] == 'queued'
+
+def test_worker_scores_a_queued_job(client, make_job, make_candidate, make_application):
+    application_id = make_application(make_job(), make_candidate('c@example.com'))
+    status_url = client.post('/api/match/batch', json={'application_ids': [application_id, 999]}).json['status_url']
+
+    assert MatchJobQueue().run_worker(max_idle=0) == 1
+
+    status = client.get(status_url).json
+    assert (status['status'], status['processed'], status['total']) == ('completed', 2, 2)
+    scored, missing = status['results']
+    assert scored['application_id'] == application_id and 0 < scored['matching_score'] <= 1
+    assert (missing['application_id'], missing['error']) == (999, 'Application not found')
+    assert client.get(f'/api/applications/{application_id}').json['matching_score'] == scored['matching_score']
+
+def test_worker_reports_missing_candidates_per_application(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    kept_id = make_application(job_id, make_candidate('a@example.com'))
+    orphaned_id = make_application(job_id, make_candidate('b@example.com'))
+    # Deleted behind the API's back, with the cascade PostgreSQL applies to its features
+    candidate_id = Candidate.query.filter_by(email='b@example.com').one().id
+    CandidateFeatures.query.filter_by(candidate_id=candidate_id).delete()
+    Candidate.query.filter_by(id=candidate_id).delete()
+    db.session.commit()
+    status_url = client.post('/api/match/batch', json={'application_ids': [orphaned_id, kept_id]}).json['status_url']
+
+    MatchJobQueue().run_worker(max_idle=0)
+
+    orphaned, kept = client.get(status_url).json['results']
+    assert (orphaned['application_id'], orphaned['error']) == (orphaned_id, 'Candidate not found')
+    assert kept['application_id'] == kept_id and kept['matching_score'] is not None
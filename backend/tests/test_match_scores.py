@@ -0,0 +1,68 @@
+from src.models.match_score import MatchScoreRefresh
+from src.models.application import db
+from src.services.match_scores import MatchScoreStore
+
+def match_job(client, job_id):
+    response = client.post(f'/api/match/job/{job_id}?threshold=0')
+    assert response.status_code == 200
+    return response.json
+
+def test_stored_scores_are_read_once_refreshed(client, make_job, make_candidate):
+    job_id = make_job()
+    make_candidate('a@example.com')
+    assert match_job(client, job_id)['stored_scores'] is False
+
+    MatchScoreStore().run_worker(max_idle=0)
+
+    result = match_job(client, job_id)
+    assert result['stored_scores'] is True
+    assert result['candidates_scored'] == 1
+
+def test_candidate_changes_fall_back_to_live_scoring(client, make_job, make_candidate):
+    job_id = make_job()
+    candidate_id = make_candidate('a@example.com')
+    MatchScoreStore().run_worker(max_idle=0)
+
+    # A new candidate is missing from the stored ranking until it is scored
+    new_candidate_id = make_candidate('b@example.com', skills=('Python', 'AWS'))
+    result = match_job(client, job_id)
+    assert result['stored_scores'] is False
+    assert new_candidate_id in [match['candidate_id'] for match in result['matches']]
+
+    MatchScoreStore().run_worker(max_idle=0)
+    assert match_job(client, job_id)['stored_scores'] is True
+
+    # An edited candidate's stored score is outdated until it is scored again
+    assert client.put(f'/api/candidates/{candidate_id}', json={'skills': ['Java']}).status_code == 200
+    assert match_job(client, job_id)['stored_scores'] is False
+
+    MatchScoreStore().run_worker(max_idle=0)
+    assert match_job(client, job_id)['stored_scores'] is True
+
+def test_failed_candidate_refresh_keeps_live_scoring(client, make_job, make_candidate):
+    job_id = make_job()
+    candidate_id = make_candidate('a@example.com')
+    MatchScoreStore().run_worker(max_idle=0)
+
+    MatchScoreRefresh.query.filter_by(entity='candidate', entity_id=candidate_id).update({
+        MatchScoreRefresh.status: 'failed', MatchScoreRefresh.error: 'boom'
+    })
+    db.session.commit()
+
+    assert match_job(client, job_id)['stored_scores'] is False
+    assert MatchScoreStore().current_jobs([job_id], check_candidates=False) == {job_id}
+
+def test_jobs_that_are_not_open_are_scored_live(client, make_job, make_candidate):
+    job_id = make_job()
+    candidate_id = make_candidate('a@example.com')
+    MatchScoreStore().run_worker(max_idle=0)
+    assert match_job(client, job_id)['stored_scores'] is True
+
+    # Closing the job drops its stored scores
+    assert client.put(f'/api/jobs/{job_id}', json={'status': 'closed'}).status_code == 200
+    MatchScoreStore().run_worker(max_idle=0)
+    assert MatchScoreStore().count_for_job(job_id) == 0
+
+    result = match_job(client, job_id)
+    assert result['stored_scores'] is False
+    assert [match['candidate_id'] for match in result['matches']] == [candidate_id]
@@ -0,0 +1,79 @@
+from src.models.agency import Commission, RecruitmentAgency
+from src.models.application import Application, db
+from src.models.metrics import MetricCounter
+from src.services.metric_counters import MetricCounters
+
+def add_agency():
+    agency = RecruitmentAgency(name='Acme', contact_person='Bo', email='bo@acme.com', commission_rate=15.0)
+    db.session.add(agency)
+    db.session.commit()
+    return agency.id
+
+def test_counters_follow_creates_status_changes_and_deletes(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    applications = [make_application(job_id, make_candidate(f'c{i}@example.com')) for i in range(3)]
+
+    assert client.put(f'/api/applications/{applications[0]}/status', json={'status': 'hired'}).status_code == 200
+    assert client.delete(f'/api/applications/{applications[2]}').status_code == 204
+
+    counters = MetricCounters().read()
+    assert counters['jobs.total'][0] == 1
+    assert counters['candidates.total'][0] == 3
+    assert counters['applications.total'][0] == 2
+    assert counters['applications.status.hired'][0] == 1
+    assert counters['applications.status.applied'][0] == 1
+    assert MetricCounters().reconcile(fix=False) == []
+
+def test_commission_amounts_follow_status_and_amount_changes(client, make_job, make_candidate, make_application):
+    application_id = make_application(make_job(), make_candidate('c@example.com'))
+    agency_id = add_agency()
+    for amount in (100.0, 250.0):
+        response = client.post('/api/commissions', json={'application_id': application_id, 'agency_id': agency_id, 'amount': amount})
+        assert response.status_code == 201
+    commission_id = response.json['id']
+
+    assert client.put(f'/api/commissions/{commission_id}', json={'amount': 300.0, 'status': 'paid'}).status_code == 200
+
+    counters = MetricCounters().read()
+    assert counters['commissions.total'] == (2, 400.0)
+    assert counters['commissions.status.pending'] == (1, 100.0)
+    assert counters['commissions.status.paid'] == (1, 300.0)
+    assert MetricCounters().reconcile(fix=False) == []
+
+def test_reconcile_reports_and_fixes_drift(make_job):
+    make_job()
+    MetricCounter.query.filter_by(name='jobs.total').update({'count': 5})
+    db.session.commit()
+
+    drift = MetricCounters().reconcile(fix=True)
+
+    assert drift == [('jobs.total', (5, 0.0), (1, 0.0))]
+    assert MetricCounters().read()['jobs.total'] == (1, 0.0)
+
+def test_empty_table_is_seeded_on_first_read(make_job, make_candidate, make_application):
+    make_application(make_job(), make_candidate('c@example.com'), status='hired')
+    # As db.create_all() leaves it on a database that already has rows
+    MetricCounter.query.delete()
+    db.session.commit()
+
+    counters = MetricCounters().read()
+
+    assert counters['applications.total'][0] == 1
+    assert counters['applications.status.hired'][0] == 1
+    assert MetricCounter.query.count() > 0
+    assert MetricCounters().seed() is False
+
+def test_stats_read_the_counters(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    make_application(job_id, make_candidate('a@example.com'), status='hired')
+    make_application(job_id, make_candidate('b@example.com'))
+    Application.query.filter_by(status='applied').update({'status': 'reviewed'}, synchronize_session=False)
+    db.session.commit()
+
+    # Bulk updates bypass the flush hooks until the counters are reconciled
+    assert client.get('/api/stats').json['applications']['by_status']['applied'] == 1
+    MetricCounters().reconcile(fix=True)
+    stats = client.get('/api/stats').json
+    assert stats['applications']['total'] == 2
+    assert stats['applications']['by_status']['reviewed'] == 1
+    assert stats['applications']['by_status']['applied'] == 0
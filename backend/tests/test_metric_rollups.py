@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from src.models.application import Application, db
+from src.models.metrics import ApplicationStatusEvent, DailyMetric
+from src.services.metric_rollups import MetricRollups
+
+def test_status_changes_are_recorded_as_events(client, make_job, make_candidate, make_application):
+    application_id = make_application(make_job(), make_candidate('c@example.com'))
+    client.put(f'/api/applications/{application_id}/status', json={'status': 'interviewed'})
+    client.put(f'/api/applications/{application_id}/status', json={'status': 'hired'})
+    # Saving the same status again is not a change
+    client.put(f'/api/applications/{application_id}/status', json={'status': 'hired'})
+
+    events = ApplicationStatusEvent.query.filter_by(application_id=application_id).order_by(ApplicationStatusEvent.id)
+    assert [(event.from_status, event.to_status) for event in events] == [
+        (None, 'applied'), ('applied', 'interviewed'), ('interviewed', 'hired')
+    ]
+
+def test_windows_count_creations_and_hires(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    applications = [make_application(job_id, make_candidate(f'c{i}@example.com')) for i in range(3)]
+    client.put(f'/api/applications/{applications[0]}/status', json={'status': 'hired'})
+
+    windows = MetricRollups().windows()
+
+    assert windows['jobs'] == {'week': 1, 'month': 1, 'quarter': 1}
+    assert windows['candidates']['week'] == 3
+    assert windows['applications']['week'] == 3
+    assert windows['hires'] == {'week': 1, 'month': 1, 'quarter': 1}
+
+def test_windows_leave_out_older_days(make_job):
+    make_job()
+    old_day = (datetime.utcnow() - timedelta(days=40)).date()
+    db.session.add(DailyMetric(metric='jobs', day=old_day, count=4))
+    db.session.commit()
+
+    assert MetricRollups().windows()['jobs'] == {'week': 1, 'month': 1, 'quarter': 5}
+
+def test_rebuild_matches_incremental_counts(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    for i in range(4):
+        application_id = make_application(job_id, make_candidate(f'c{i}@example.com'))
+        if i % 2:
+            client.put(f'/api/applications/{application_id}/status', json={'status': 'hired'})
+    incremental = sorted((row.metric, row.day, row.count) for row in DailyMetric.query)
+
+    MetricRollups().rebuild()
+
+    assert sorted((row.metric, row.day, row.count) for row in DailyMetric.query) == incremental
+
+def test_empty_table_is_seeded_with_existing_hires(make_job, make_candidate, make_application):
+    make_application(make_job(), make_candidate('a@example.com'), status='hired')
+    make_application(1, make_candidate('b@example.com'))
+    # As db.create_all() leaves both tables on a database that already has rows
+    DailyMetric.query.delete()
+    ApplicationStatusEvent.query.delete()
+    db.session.commit()
+
+    windows = MetricRollups().windows()
+
+    assert windows['applications']['week'] == 2
+    assert windows['hires']['week'] == 1
+    hired = Application.query.filter_by(status='hired').one()
+    assert ApplicationStatusEvent.query.filter_by(application_id=hired.id, to_status='hired').count() == 1
+    assert MetricRollups().seed() is False
@@ -0,0 +1,35 @@
+from urllib.parse import parse_qs, urlsplit
+
+def next_link(response):
+    link = response.headers['Link']
+    assert link.endswith('>; rel="next"')
+    return urlsplit(link[1:-len('>; rel="next"')])
+
+def test_link_header_keeps_query_arguments(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    applications = [make_application(job_id, make_candidate(f'c{i}@example.com')) for i in range(3)]
+
+    response = client.get('/api/applications?limit=2&status=applied')
+
+    assert response.status_code == 200
+    assert response.headers['X-Next-After-Id'] == str(applications[1])
+    link = next_link(response)
+    assert link.path == '/api/applications'
+    assert parse_qs(link.query) == {'limit': ['2'], 'status': ['applied'], 'after_id': [str(applications[1])]}
+
+    last_page = client.get(f'{link.path}?{link.query}')
+    assert [application['id'] for application in last_page.json] == applications[2:]
+    assert 'Link' not in last_page.headers
+    assert 'X-Next-After-Id' not in last_page.headers
+
+def test_link_header_drops_arguments_repeating_a_route_value(client, make_job, make_candidate, make_application):
+    job_id = make_job()
+    applications = [make_application(job_id, make_candidate(f'c{i}@example.com')) for i in range(2)]
+
+    response = client.get(f'/api/jobs/{job_id}/applications?limit=1&job_id={job_id}')
+
+    assert response.status_code == 200
+    assert response.headers['X-Next-After-Id'] == str(applications[0])
+    link = next_link(response)
+    assert link.path == f'/api/jobs/{job_id}/applications'
+    assert parse_qs(link.query) == {'limit': ['1'], 'after_id': [str(applications[0])]}
@@ -0,0 +1,63 @@
+import random
+import pytest
+from src.services.ai_matcher import AIMatchingEngine
+
+SKILLS = ['Python', 'Java', 'Docker', 'AWS', 'React', 'SQL', 'Kubernetes', 'Go']
+WORDS = SKILLS + ['backend', 'services', 'teams', 'api', 'design', 'testing', 'cloud']
+EDUCATION = [None, 'Diploma', 'Bachelor of Science', 'Master of Engineering', 'PhD']
+
+JOBS = [
+    {'requirements': 'Python Docker AWS, 5 years of experience, bachelor degree', 'description': 'Backend services'},
+    {'requirements': 'Senior Java engineer with SQL', 'description': 'Design api and testing'},
+    {'requirements': 'React and cloud', 'description': ''}
+]
+
+def random_candidates(seed, count=60):
+    rng = random.Random(seed)
+    candidates = []
+    for candidate_id in range(1, count + 1):
+        if candidates and rng.random() < 0.2:
+            # Repeat an earlier candidate to get tied scores
+            candidates.append((candidate_id, rng.choice(candidates)[1]))
+            continue
+        candidates.append((candidate_id, {
+            'skills': rng.sample(SKILLS, rng.randint(0, 4)),
+            'total_experience_years': rng.choice([None, 0, 1, 3, 5, 8, 12]),
+            'education': rng.choice(EDUCATION),
+            'parsed_cv_text': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 40)))
+        }))
+    return candidates
+
+def exhaustive_rank(matcher, candidates, job, limit, threshold):
+    """Score everyone and sort by score, ties in input order"""
+    scored = [(key, matcher.calculate_matching_score(data, job)) for key, data in candidates]
+    ranked = sorted((pair for pair in scored if pair[1] >= threshold), key=lambda pair: -pair[1])
+    return ranked if limit is None else ranked[:limit]
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('limit,threshold', [(None, 0.0), (5, 0.0), (1, 0.0), (10, 0.5), (None, 0.6), (3, 0.95)])
+def test_rank_candidates_matches_exhaustive_sort(seed, limit, threshold):
+    matcher = AIMatchingEngine()
+    candidates = random_candidates(seed)
+
+    for job in JOBS:
+        assert matcher.rank_candidates(candidates, job, limit, threshold) == \
+            exhaustive_rank(matcher, candidates, job, limit, threshold)
+
+def test_rank_candidates_keeps_ties_in_input_order():
+    matcher = AIMatchingEngine()
+    data = {'skills': ['Python'], 'total_experience_years': 5, 'parsed_cv_text': 'Python backend'}
+    candidates = [(candidate_id, data) for candidate_id in (3, 1, 2)]
+
+    assert [key for key, _ in matcher.rank_candidates(candidates, JOBS[0])] == [3, 1, 2]
+    assert [key for key, _ in matcher.rank_candidates(candidates, JOBS[0], limit=2)] == [3, 1]
+
+def test_rank_candidates_with_profiles_matches_raw_data():
+    matcher = AIMatchingEngine()
+    candidates = random_candidates(7)
+    profiles = [(key, matcher.build_candidate_profile(data)) for key, data in candidates]
+
+    assert matcher.rank_candidates(profiles, JOBS[0], limit=10) == matcher.rank_candidates(candidates, JOBS[0], limit=10)
+
+def test_rank_candidates_returns_nothing_for_a_zero_limit():
+    assert AIMatchingEngine().rank_candidates(random_candidates(0), JOBS[0], limit=0) == []
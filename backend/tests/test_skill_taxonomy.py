@@ -0,0 +1,79 @@
+import random
+import re
+import pytest
+from src.services.cv_processor import CVProcessor
+from src.services.skill_taxonomy import EXACT_CASE_KEYWORDS, SKILL_KEYWORDS, SkillMatcher
+
+FILLERS = ['javascript', 'mysql', 'gopher', 'program', 'r&d', 'node.jsx', 'data', 'big', 'science', 'Go',
+           'GO', 'go', 'R', 'scrummaster', 'ai-driven', 'c++17', 'c#.net', 'aws_lambda', 'ïntl', 'İstanbul']
+SEPARATORS = [' ', ', ', '/', '\n', '. ', '-', ' (', ') ', ': ']
+
+def per_keyword_find(text, exact_case=True):
+    """The previous loop over SKILL_KEYWORDS, one scan each, with the word-boundary rule"""
+    found = []
+    for keyword in SKILL_KEYWORDS:
+        if not re.search(r'(?<!\w)' + re.escape(keyword) + r'(?!\w)', text, re.IGNORECASE):
+            continue
+        written = EXACT_CASE_KEYWORDS.get(keyword)
+        if exact_case and written and not re.search(r'(?<!\w)' + re.escape(written) + r'(?!\w)', text):
+            continue
+        found.append(keyword)
+    return found
+
+def substring_extract_skills(cv_text):
+    """CVProcessor.extract_skills before the shared matcher: bare substrings of the old list"""
+    cv_lower = cv_text.lower()
+    return [skill.title() for skill in SKILL_KEYWORDS if skill != 'ai' and skill in cv_lower]
+
+def random_text(rng):
+    words = []
+    for _ in range(rng.randint(0, 25)):
+        word = rng.choice(SKILL_KEYWORDS) if rng.random() < 0.5 else rng.choice(FILLERS)
+        words.append(rng.choice([word, word.upper(), word.title()]))
+    return ''.join(word + rng.choice(SEPARATORS) for word in words)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_single_pass_equals_per_keyword_scans(seed):
+    rng = random.Random(seed)
+    matcher = SkillMatcher()
+
+    for _ in range(50):
+        text = random_text(rng)
+        assert matcher.find(text) == per_keyword_find(text), text
+        assert matcher.find(text, exact_case=False) == per_keyword_find(text, exact_case=False), text
+
+def test_keywords_match_on_word_boundaries_only():
+    matcher = SkillMatcher()
+
+    assert matcher.find('JavaScript and MySQL') == ['javascript', 'mysql']
+    assert matcher.find('Java, SQL') == ['java', 'sql']
+    assert matcher.find('node.jsx') == []
+    assert matcher.find('C++ and C#') == ['c++', 'c#']
+    # Overlapping multi-word keywords are all found
+    assert matcher.find('big data science') == ['data science', 'big data']
+
+def test_go_and_r_count_in_free_text_only_in_exact_case():
+    matcher = SkillMatcher()
+
+    assert matcher.find('We go further with Go') == ['go']
+    assert matcher.find('we go further') == []
+    assert matcher.find('Statistics in R') == ['r']
+    assert matcher.find('r&d') == []
+    # Skill lists name the language however it is written
+    assert matcher.find_in_skills(['go', 'r']) == ['go', 'r']
+
+def test_extract_skills_matches_the_substring_scan_without_substring_hits():
+    processor = CVProcessor()
+    # No keyword is a substring of another word here ('r' is in most words)
+    cv_text = 'Python with Flask, Pandas and NumPy on AWS and Linux; Vue, Scala, Swift and Kotlin.'
+
+    assert processor.extract_skills(cv_text) == substring_extract_skills(cv_text)
+
+def test_extract_skills_differences_from_the_substring_scan():
+    processor = CVProcessor()
+
+    # Substrings no longer count: 'java' in 'javascript', 'r' in 'react'
+    assert substring_extract_skills('JavaScript and React') == ['Java', 'Javascript', 'R', 'React']
+    assert processor.extract_skills('JavaScript and React') == ['Javascript', 'React']
+    # 'ai' joined the shared taxonomy from the matching engine's list
+    assert processor.extract_skills('Applied AI with Python') == ['Python', 'Ai']
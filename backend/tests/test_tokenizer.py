@@ -0,0 +1,42 @@
+import random
+import pytest
+from benchmarks.cv_processing import make_cv
+from benchmarks.tokenizer import JOB_TEXT, legacy_preprocess_text
+from src.services.ai_matcher import AIMatchingEngine
+from src.services.tokenizer import Tokenizer
+
+WORDS = ['Python', 'the', 'AND', 'go', 'C++', 'node.js', 'e-mail', 'don\'t', 'über', 'İstanbul', 'naïve', '3D',
+         '2024', 'ml_ops', 'résumé', 'ÆSIR', 'x', 'ab', 'abc', 'ΣΟΦΙΑ', '数据库', 'ǅemal']
+SEPARATORS = [' ', '  ', '\n', '\t', ', ', '. ', '; ', '/', '-', '(', ')', ' ', ' ', '\x1c', '…', '•']
+
+def random_text(rng):
+    return ''.join(rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(rng.randint(0, 40)))
+
+@pytest.mark.parametrize('seed', range(20))
+def test_single_pass_equals_previous_preprocess_text(seed):
+    rng = random.Random(seed)
+    tokenizer = Tokenizer()
+
+    for _ in range(100):
+        text = random_text(rng)
+        assert tokenizer.tokenize(text) == legacy_preprocess_text(text), text
+
+def test_matching_engine_tokens_equal_previous_preprocess_text():
+    matcher = AIMatchingEngine()
+
+    for text in [JOB_TEXT, make_cv(20000, seed=1), '', None]:
+        assert matcher.preprocess_text(text) == legacy_preprocess_text(text)
+
+def test_memoized_and_interned_tokens_equal_plain_tokens():
+    plain = Tokenizer()
+    interned = Tokenizer(intern_tokens=True, memo_size=2)
+    texts = [JOB_TEXT, 'Python and Docker', JOB_TEXT, 'Kubernetes on AWS', JOB_TEXT]
+
+    for text in texts:
+        assert interned.tokenize_cached(text) == plain.tokenize(text)
+    assert len(interned._memo) == 2
+
+    # Callers get their own list, so changing it leaves the memo intact
+    tokens = interned.tokenize_cached(JOB_TEXT)
+    tokens.clear()
+    assert interned.tokenize_cached(JOB_TEXT) == plain.tokenize(JOB_TEXT)